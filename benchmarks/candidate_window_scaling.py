@@ -0,0 +1,68 @@
+"""Measure candidate generation throughput with a posting-lag window.
+
+Run from the repository root:
+
+    python -m benchmarks.candidate_window_scaling --sizes 1000 10000 100000
+"""
+
+import argparse
+from time import perf_counter
+
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticSpec, synthesize_pairs
+from src.intelligence.candidates import build_candidates
+from src.intelligence.merchant_names import canonicalize_names
+from src.intelligence.validator import Validator
+
+
+def _keyed(frame: pd.DataFrame) -> pd.DataFrame:
+    """Add the ``name_key`` and ``date_key`` columns candidate generation reads."""
+    frame["name_key"] = canonicalize_names(frame["business_name"])
+    frame["date_key"] = Validator._date_keys(frame["date"])
+    return frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--window", type=int, default=3)
+    parser.add_argument("--date-lag", type=int, default=2)
+    parser.add_argument("--rows-per-day", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows/side':>10} {'candidates':>12} {'scorer calls':>13} "
+        f"{'seconds':>9} {'us/row':>8}"
+    )
+    for size in args.sizes:
+        transactions, proofs = synthesize_pairs(
+            SyntheticSpec(
+                size=size, date_lag=args.date_lag, rows_per_day=args.rows_per_day
+            )
+        )
+        transactions, proofs = _keyed(transactions), _keyed(proofs)
+
+        stats: dict = {}
+        start = perf_counter()
+        candidates = build_candidates(
+            transactions,
+            proofs,
+            transactions["total"],
+            proofs["total"],
+            date_window_days=args.window,
+            stats=stats,
+            workers=args.workers,
+        )
+        elapsed = perf_counter() - start
+
+        print(
+            f"{size:>10} {len(candidates):>12} {stats['scorerCalls']:>13} "
+            f"{elapsed:>9.2f} "
+            f"{elapsed / size * 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
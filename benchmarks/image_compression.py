@@ -0,0 +1,172 @@
+"""Compare receipt photo compression before and after the quality search rewrite.
+
+Synthetic 12 MP phone photos of receipts are written as high-quality JPEGs
+and compressed with both ``compress_image`` and the previous linear
+quality/resize loop. Each grain level stands for a kind of shot, from clean
+daylight (6) to noisy low light (30). Run from the repository root:
+
+    python -m benchmarks.image_compression
+    python -m benchmarks.image_compression --images 3 --grains 10 20 --max-mb 2
+"""
+
+import argparse
+import io
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from src.utils.images import compress_image
+
+
+def synthesize_photo(
+    path: str,
+    seed: int,
+    size: tuple[int, int] = (4000, 3000),
+    quality: int = 95,
+    grain: float = 6.0,
+):
+    """
+    Write a phone-camera-like receipt photo.
+
+    A white receipt with rows of dark "text" blocks lies on a noisy, shaded
+    table, blurred slightly and saved at camera quality.
+
+    Args:
+        path: Output JPEG path.
+        seed: Random seed for the layout and sensor noise.
+        size: ``(width, height)`` in pixels; the default is 12 MP.
+        quality: JPEG quality of the saved photo.
+        grain: Standard deviation of the sensor noise; higher values make
+            photos harder to compress, like low-light shots.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    shade = np.linspace(90, 150, width, dtype=np.float32)[None, :, None]
+    table = np.broadcast_to(shade, (height, width, 3)).copy()
+    table += rng.normal(0, 12, (height, width, 3)).astype(np.float32)
+    img = Image.fromarray(np.clip(table, 0, 255).astype(np.uint8))
+
+    draw = ImageDraw.Draw(img)
+    left, top = width // 4, height // 12
+    right, bottom = width - width // 4, height - height // 12
+    draw.rectangle((left, top, right, bottom), fill=(245, 243, 238))
+    line = top + 60
+    while line < bottom - 60:
+        x = left + 60
+        while x < right - 200:
+            word = int(rng.integers(40, 220))
+            draw.rectangle((x, line, x + word, line + 28), fill=(30, 30, 35))
+            x += word + int(rng.integers(20, 60))
+        line += int(rng.integers(50, 90))
+
+    img = img.filter(ImageFilter.GaussianBlur(1.2))
+    grain = rng.normal(0, grain, (height, width, 3)).astype(np.float32)
+    noisy = np.asarray(img, dtype=np.float32) + grain
+    Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(
+        path, format="JPEG", quality=quality
+    )
+
+
+def legacy_compress(image_path: str, max_bytes: int) -> tuple[io.BytesIO, int]:
+    """The previous loop: quality 90 down in steps of 5, then 5% resizes."""
+    img = Image.open(image_path)
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+
+    img_bytes = io.BytesIO()
+    encodes = 0
+    quality = 90
+    while True:
+        img_bytes.seek(0)
+        img_bytes.truncate(0)
+        img.save(img_bytes, format="JPEG", quality=quality)
+        encodes += 1
+        if img_bytes.tell() <= max_bytes or quality <= 10:
+            break
+        quality -= 5
+
+    while img_bytes.tell() > max_bytes:
+        width, height = img.size
+        img = img.resize((int(width * 0.95), int(height * 0.95)), Image.LANCZOS)
+        img_bytes.seek(0)
+        img_bytes.truncate(0)
+        img.save(img_bytes, format="JPEG", quality=quality)
+        encodes += 1
+
+    img_bytes.seek(0)
+    return img_bytes, encodes
+
+
+def measure(compress, path: str, max_bytes: int) -> dict:
+    """
+    Time one compression and describe its output.
+
+    Args:
+        compress: ``compress_image`` or ``legacy_compress``.
+        path: Source image.
+        max_bytes: Byte budget.
+
+    Returns:
+        Seconds, encode count, output bytes and output dimensions.
+    """
+    start = perf_counter()
+    buffer, encodes = compress(path, max_bytes)
+    seconds = perf_counter() - start
+    output = buffer.getvalue()
+    return {
+        "seconds": seconds,
+        "encodes": encodes,
+        "bytes": len(output),
+        "size": Image.open(io.BytesIO(output)).size,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=2, help="Photos per grain")
+    parser.add_argument("--grains", type=float, nargs="+", default=[6, 15, 30])
+    parser.add_argument("--max-mb", type=float, default=2.0)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--quality", type=int, default=95)
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_mb * 1024 * 1024)
+    print(
+        f"{'image':>6} {'grain':>6} {'source MB':>10} {'method':>8} {'seconds':>8} "
+        f"{'encodes':>8} {'out MB':>7} {'out size':>11}"
+    )
+    totals = {"legacy": 0.0, "search": 0.0}
+    with tempfile.TemporaryDirectory() as workdir:
+        shots = [grain for grain in args.grains for _ in range(args.images)]
+        for index, grain in enumerate(shots):
+            path = os.path.join(workdir, f"receipt_{index}.jpg")
+            synthesize_photo(
+                path, index, (args.width, args.height), args.quality, grain
+            )
+            source_mb = os.path.getsize(path) / 1024 / 1024
+            for name, compress in (
+                ("legacy", legacy_compress),
+                ("search", compress_image),
+            ):
+                result = measure(compress, path, max_bytes)
+                totals[name] += result["seconds"]
+                width, height = result["size"]
+                print(
+                    f"{index:>6} {grain:>6g} {source_mb:>10.2f} {name:>8} "
+                    f"{result['seconds']:>8.2f} {result['encodes']:>8} "
+                    f"{result['bytes'] / 1024 / 1024:>7.2f} "
+                    f"{f'{width}x{height}':>11}"
+                )
+
+    print(
+        f"\ntotal legacy {totals['legacy']:.2f}s, search {totals['search']:.2f}s "
+        f"({totals['search'] / max(totals['legacy'], 1e-9):.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Synthesize paired statement and receipt frames for benchmarks."""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import pandas as pd
+
+from tests.conftest import BUSINESSES
+
+
+@dataclass
+class SyntheticSpec:
+    """
+    Shape of a synthetic statement/receipt set.
+
+    Attributes:
+        size: Rows per side.
+        name_noise: Probability that a receipt name is perturbed (processor
+            prefix, store number, city suffix, casing or a dropped letter).
+        date_lag: Largest posting lag in days; each statement line posts
+            ``0``-``date_lag`` days after its receipt.
+        unmatched_ratio: Fraction of rows on each side without a counterpart.
+        rows_per_day: Average statement lines per day, which sets how many
+            rows share a date block as *size* grows.
+        seed: Random seed; equal specs produce equal frames.
+    """
+
+    size: int
+    name_noise: float = 0.3
+    date_lag: int = 2
+    unmatched_ratio: float = 0.1
+    rows_per_day: int = 40
+    seed: int = 7
+
+
+def _noisy_name(name: str, rng: random.Random) -> str:
+    """Apply one perturbation the merchant-name canonicaliser or scorer absorbs."""
+    noise = rng.randrange(5)
+    if noise == 0:
+        return f"SQ *{name}"
+    if noise == 1:
+        return f"{name} #{rng.randint(100, 9999)}"
+    if noise == 2:
+        return f"{name} SAN FRANCISCO CA"
+    if noise == 3:
+        return name.upper()
+    if len(name) > 4:
+        drop = rng.randrange(1, len(name) - 1)
+        return name[:drop] + name[drop + 1 :]
+    return name
+
+
+def synthesize_pairs(spec: SyntheticSpec) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Build statement transactions and receipts that pair up row for row.
+
+    The first ``size * (1 - unmatched_ratio)`` rows of each side are
+    counterparts of each other; the rest are independent rows on each side.
+    Receipts are then shuffled so matching cannot rely on row order.
+
+    Args:
+        spec: Size and noise settings.
+
+    Returns:
+        A tuple ``(transactions, proofs)`` with ``business_name``, ``total``,
+        ``date`` and ``currency`` columns.
+    """
+    rng = random.Random(spec.seed)
+    start = date(2024, 1, 1)
+    days = max(1, spec.size // max(1, spec.rows_per_day))
+    paired = round(spec.size * (1 - spec.unmatched_ratio))
+
+    def row() -> tuple[str, float, date]:
+        name = rng.choice(BUSINESSES)[0]
+        total = round(rng.uniform(3.5, 250.0), 2)
+        return name, total, start + timedelta(days=rng.randrange(days))
+
+    transactions, proofs = [], []
+    for _ in range(paired):
+        name, total, receipt_date = row()
+        posted = receipt_date + timedelta(days=rng.randint(0, spec.date_lag))
+        proof_name = _noisy_name(name, rng) if rng.random() < spec.name_noise else name
+        transactions.append((name, total, posted.isoformat()))
+        proofs.append((proof_name, total, receipt_date.isoformat()))
+    for side in (transactions, proofs):
+        for _ in range(spec.size - paired):
+            name, total, row_date = row()
+            side.append((name, total, row_date.isoformat()))
+    rng.shuffle(proofs)
+
+    columns = ["business_name", "total", "date"]
+    transactions_df = pd.DataFrame(transactions, columns=columns)
+    proofs_df = pd.DataFrame(proofs, columns=columns)
+    transactions_df["currency"] = "USD"
+    proofs_df["currency"] = "USD"
+    return transactions_df, proofs_df
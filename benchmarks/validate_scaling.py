@@ -0,0 +1,183 @@
+"""Measure Validator.validate and recommendation analysis on synthetic data.
+
+Each size runs in a fresh process so peak RSS is attributed to that size.
+Categorization is skipped; only matching is measured. Run from the
+repository root:
+
+    python -m benchmarks.validate_scaling --sizes 1000 10000 100000
+    python -m benchmarks.validate_scaling --baseline benchmarks/results/<commit>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from time import perf_counter
+
+from benchmarks.synthetic import SyntheticSpec, synthesize_pairs
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(spec: SyntheticSpec, strategy: str, workers: int) -> dict:
+    """
+    Validate one synthetic set and time each stage.
+
+    Args:
+        spec: Synthetic data settings.
+        strategy: ``matching.strategy`` to run.
+        workers: ``matching.workers`` to run with.
+
+    Returns:
+        Timings in seconds, peak RSS in MiB and the matching summary counters.
+    """
+    from pyhocon import ConfigFactory
+
+    from src.intelligence.validator import Validator
+
+    config = ConfigFactory.parse_file("config/config.conf")
+    config.put("categorize.enabled", False)
+    config.put("matching.strategy", strategy)
+    config.put("matching.workers", workers)
+
+    start = perf_counter()
+    transactions, proofs = synthesize_pairs(spec)
+    generate_seconds = perf_counter() - start
+
+    validator = Validator(transactions, proofs, parsed_config=config)
+    start = perf_counter()
+    results = validator.validate(date_window_days=spec.date_lag, categorize=False)
+    validate_seconds = perf_counter() - start
+
+    start = perf_counter()
+    recommendations = validator.analyze_unmatched_results(
+        results.unmatched_transactions, results.unmatched_proofs
+    )
+    analyze_seconds = perf_counter() - start
+
+    summary = validator.matching_summary
+    return {
+        "spec": asdict(spec),
+        "generateSeconds": round(generate_seconds, 4),
+        "validateSeconds": round(validate_seconds, 4),
+        "analyzeSeconds": round(analyze_seconds, 4),
+        "peakRssMb": round(_peak_rss_mb(), 1),
+        "scorerCalls": summary["scorerCalls"],
+        "candidatePairs": summary["candidatePairs"],
+        "matchedPairs": summary["matchedPairs"],
+        "unmatchedTransactions": len(results.unmatched_transactions),
+        "unmatchedProofs": len(results.unmatched_proofs),
+        "recommendations": len(recommendations),
+    }
+
+
+def _commit() -> str:
+    """Short hash of the checked-out commit, or ``"unknown"`` outside git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(cases: list[dict], baseline_path: str) -> None:
+    """Print time, memory and scorer-call ratios against a saved run."""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    previous = {case["spec"]["size"]: case for case in baseline["cases"]}
+
+    print(f"\nvs {baseline['commit']} ({baseline_path})")
+    print(f"{'rows/side':>10} {'validate':>9} {'analyze':>9} {'rss':>7} {'calls':>7}")
+    for case in cases:
+        old = previous.get(case["spec"]["size"])
+        if old is None:
+            continue
+        ratios = [
+            case[key] / old[key] if old[key] else float("nan")
+            for key in ("validateSeconds", "analyzeSeconds", "peakRssMb", "scorerCalls")
+        ]
+        print(f"{case['spec']['size']:>10} " + " ".join(f"{r:>8.2f}x" for r in ratios))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--name-noise", type=float, default=0.3)
+    parser.add_argument("--date-lag", type=int, default=2)
+    parser.add_argument("--unmatched-ratio", type=float, default=0.1)
+    parser.add_argument("--rows-per-day", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--strategy", default="greedy")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", help="JSON path; defaults to results/<commit>.json")
+    parser.add_argument("--baseline", help="Earlier JSON output to compare against")
+    args = parser.parse_args()
+
+    commit = _commit()
+    print(
+        f"{'rows/side':>10} {'validate s':>11} {'analyze s':>10} {'peak MiB':>9} "
+        f"{'scorer calls':>13} {'matched':>8}"
+    )
+    cases = []
+    for size in args.sizes:
+        spec = SyntheticSpec(
+            size=size,
+            name_noise=args.name_noise,
+            date_lag=args.date_lag,
+            unmatched_ratio=args.unmatched_ratio,
+            rows_per_day=args.rows_per_day,
+            seed=args.seed,
+        )
+        # A fresh process per size keeps ru_maxrss specific to that size
+        with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+            case = executor.submit(run_case, spec, args.strategy, args.workers)
+            case = case.result()
+        cases.append(case)
+        print(
+            f"{size:>10} {case['validateSeconds']:>11.2f} "
+            f"{case['analyzeSeconds']:>10.2f} {case['peakRssMb']:>9.1f} "
+            f"{case['scorerCalls']:>13} {case['matchedPairs']:>8}"
+        )
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(
+            {
+                "commit": commit,
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "strategy": args.strategy,
+                "workers": args.workers,
+                "cases": cases,
+            },
+            handle,
+            indent=2,
+        )
+    print(f"\nSaved {output}")
+
+    if args.baseline:
+        _compare(cases, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ import pandas as pd
 from time import time
 import mimetypes
 from PIL import Image
-import io
 import re
 import ast
 import json
@@ -17,19 +16,87 @@ from google.genai import types
 from langchain_community.document_loaders import PyPDFLoader
 from pyhocon import ConfigFactory
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
 
+from src.data.extraction_cache import (
+    DEFAULT_CACHE_MB,
+    DEFAULT_CACHE_PATH,
+    ExtractionCache,
+    extraction_key,
+)
+from src.data.packing import (
+    estimate_text_tokens,
+    pack_by_tokens,
+    parse_packed_response,
+)
+from src.data.receipt_ocr import ReceiptOcr
 from src.intelligence.llm_base import LLMBase
-from prompts.data_reader_prompts import RECEIPT_PROMPT, STATEMENT_PROMPT
+from src.intelligence.merchant_names import canonicalize_merchant_name
+from src.prompts.data_reader_prompts import (
+    MULTI_RECEIPT_PROMPT,
+    RECEIPT_PROMPT,
+    STATEMENT_PROMPT,
+)
 from src.utils.currency_conversion_agent import convert_currency_to_usd
+from src.utils.images import DEFAULT_MAX_BYTES, MAX_ENCODE_ATTEMPTS, compress_image
+from src.utils.preprocess import (
+    GEMINI_TILE_TOKENS,
+    PreprocessSettings,
+    estimate_image_tokens,
+    preprocess_image,
+)
 from src.data.database import DataBase
 
 
+# Cached responses and stored proof names scanned for merchant names that
+# corroborate OCR reads
+KNOWN_MERCHANT_RESPONSES = 5000
+
+# Output allowance per image in a packed request; one receipt row is ~40 tokens
+PACKED_OUTPUT_TOKENS_PER_IMAGE = 150
+# Token estimate for legacy image_url payloads, which carry no dimensions
+_UNSIZED_IMAGE_TOKENS = 4 * GEMINI_TILE_TOKENS
+
+
 class DataType(Enum):
     TRANSACTIONS = "transactions"
     PROOFS = "proofs"
 
 
+@dataclass(frozen=True)
+class ImagePayload:
+    """
+    A compressed image handed to Gemini as raw bytes.
+
+    Attributes:
+        data: Compressed image bytes, or a view of the buffer holding them.
+        mime_type: MIME type of *data*.
+        size: ``(width, height)`` of the encoded image, when known.
+    """
+
+    data: bytes | memoryview
+    mime_type: str = "image/jpeg"
+    size: tuple[int, int] | None = None
+
+    def as_bytes(self) -> bytes:
+        """Return the image bytes, copying only when *data* is a view."""
+        return self.data if isinstance(self.data, bytes) else bytes(self.data)
+
+    def to_openai(self) -> dict:
+        """
+        Return the legacy OpenAI-style ``image_url`` message item.
+
+        Returns:
+            ``{"type": "image_url", "image_url": {"url": "data:..."}}``.
+        """
+        encoded = base64.b64encode(self.data).decode("utf-8")
+        return {
+            "type": "image_url",
+            "image_url": {"url": f"data:{self.mime_type};base64,{encoded}"},
+        }
+
+
 class DataReader(LLMBase):
     """
     Ingest transaction statements and proof images prior to the validation pipeline.
@@ -88,6 +155,29 @@ class DataReader(LLMBase):
         )
         self.batch_poll_seconds = int(config.get("llm.batch_poll_seconds", 2))
         self.batch_max_wait_seconds = int(config.get("llm.batch_max_wait_seconds", 10))
+        # Re-uploaded files reuse their stored extraction instead of a new LLM call
+        self.extraction_cache = None
+        if str(config.get("extraction_cache.enabled", True)).lower() == "true":
+            self.extraction_cache = ExtractionCache(
+                str(config.get("extraction_cache.path", DEFAULT_CACHE_PATH)),
+                int(
+                    float(config.get("extraction_cache.max_mb", DEFAULT_CACHE_MB))
+                    * 1024
+                    * 1024
+                ),
+            )
+        self.preprocess = PreprocessSettings.from_config(config)
+        # Clean printed receipts are read locally; the rest escalate to the LLM
+        self.receipt_ocr = ReceiptOcr.from_config(config)
+        # Built on the first OCR pass, then grown by each stored LLM answer
+        self.known_merchants: set[str] | None = None
+        # Several receipts share one request and prompt; 1 sends each alone
+        self.images_per_request = 1
+        if str(config.get("multi_image.enabled", False)).lower() == "true":
+            self.images_per_request = max(
+                1, int(config.get("multi_image.max_images", 8))
+            )
+        self.packed_input_tokens = int(config.get("multi_image.max_input_tokens", 8000))
 
         super().__init__(
             llm_config_path=llm_config_path,
@@ -118,6 +208,21 @@ class DataReader(LLMBase):
             "standard_runs": 0,
             "fx_calls": 0,
             "fallback_calls": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "images_sent": 0,
+            "image_source_bytes": 0,
+            "image_upload_bytes": 0,
+            "image_source_tokens": 0,
+            "image_upload_tokens": 0,
+            "ocr_attempts": 0,
+            "ocr_accepted": 0,
+            "ocr_seconds": 0.0,
+            "llm_images": 0,
+            "llm_seconds": 0.0,
+            "packed_requests": 0,
+            "packed_images": 0,
+            "packed_retries": 0,
             "estimated_total_cost_usd": 0.0,
         }
 
@@ -317,16 +422,56 @@ class DataReader(LLMBase):
         output_cost = (
             output_tokens / 1_000_000
         ) * DataReader._output_token_rate_per_million(model_name)
+        cache_hits = int(self.ingestion_usage["cache_hits"])
+        cache_lookups = cache_hits + int(self.ingestion_usage["cache_misses"])
+        ocr_attempts = int(self.ingestion_usage["ocr_attempts"])
+        ocr_accepted = int(self.ingestion_usage["ocr_accepted"])
+        ocr_seconds = float(self.ingestion_usage["ocr_seconds"])
+        llm_images = int(self.ingestion_usage["llm_images"])
+        llm_calls = int(self.ingestion_usage["llm_calls"])
+        llm_seconds = float(self.ingestion_usage["llm_seconds"])
 
         return {
             "model": model_name,
             "inputTokens": input_tokens,
             "outputTokens": output_tokens,
-            "llmCalls": int(self.ingestion_usage["llm_calls"]),
+            "llmCalls": llm_calls,
             "batchCalls": int(self.ingestion_usage["batch_runs"]),
             "standardCalls": int(self.ingestion_usage["standard_runs"]),
             "fxCalls": int(self.ingestion_usage["fx_calls"]),
             "fallbackCalls": int(self.ingestion_usage["fallback_calls"]),
+            "cacheHits": cache_hits,
+            "cacheMisses": int(self.ingestion_usage["cache_misses"]),
+            "cacheHitRate": round(cache_hits / max(1, cache_lookups), 4),
+            "ocrAttempts": ocr_attempts,
+            "ocrAccepted": ocr_accepted,
+            "ocrHitRate": round(ocr_accepted / max(1, ocr_attempts), 4),
+            "ocrSeconds": round(ocr_seconds, 3),
+            "ocrAvgLatencySeconds": round(ocr_seconds / max(1, ocr_attempts), 3),
+            "llmImages": llm_images,
+            "llmSeconds": round(llm_seconds, 3),
+            "llmAvgLatencySeconds": round(llm_seconds / max(1, llm_calls), 3),
+            "packedRequests": int(self.ingestion_usage["packed_requests"]),
+            "packedImages": int(self.ingestion_usage["packed_images"]),
+            "packedRetries": int(self.ingestion_usage["packed_retries"]),
+            "preprocessed": self.preprocess.enabled,
+            "imagesSent": int(self.ingestion_usage["images_sent"]),
+            "imageSourceBytes": int(self.ingestion_usage["image_source_bytes"]),
+            "imageUploadBytes": int(self.ingestion_usage["image_upload_bytes"]),
+            "imageBytesSaved": int(
+                self.ingestion_usage["image_source_bytes"]
+                - self.ingestion_usage["image_upload_bytes"]
+            ),
+            "estimatedImageSourceTokens": int(
+                self.ingestion_usage["image_source_tokens"]
+            ),
+            "estimatedImageUploadTokens": int(
+                self.ingestion_usage["image_upload_tokens"]
+            ),
+            "estimatedImageTokensSaved": int(
+                self.ingestion_usage["image_source_tokens"]
+                - self.ingestion_usage["image_upload_tokens"]
+            ),
             "estimatedInputCostUsd": round(input_cost, 2),
             "estimatedOutputCostUsd": round(output_cost, 2),
             "estimatedTotalCostUsd": round(
@@ -359,6 +504,196 @@ class DataReader(LLMBase):
         print(f"\nIngestion usage: {json.dumps(log_entry)}\n")
         return summary
 
+    def _cache_key(self, file_path: str, prompt: str, variant: str = "") -> str | None:
+        """
+        Return the extraction cache key of a file, or ``None`` when caching is off.
+
+        Args:
+            file_path: Source file of the extraction.
+            prompt: Prompt the file is extracted with.
+            variant: Tag of any preprocessing or packing applied before
+                sending; see ``_proof_cache_variant``.
+
+        Returns:
+            Key for ``_cached_extraction`` and ``_store_extraction``.
+        """
+        if self.extraction_cache is None:
+            return None
+        return extraction_key(file_path, prompt, self.primary_model, variant)
+
+    def _proof_cache_variant(self) -> str:
+        """
+        Tag proof cache keys with everything besides the file that shapes an answer.
+
+        Packed answers come from ``MULTI_RECEIPT_PROMPT``, so with
+        ``multi_image`` enabled the mode and that prompt (hashed in full by
+        ``extraction_key``) are part of the key as well.
+
+        Returns:
+            Variant for ``_cache_key``; empty with no preprocessing or packing.
+        """
+        tags = [self.preprocess.cache_tag()]
+        if self.images_per_request > 1:
+            tags.append(f"multi_image:{MULTI_RECEIPT_PROMPT}")
+        return ";".join(tag for tag in tags if tag)
+
+    def _cached_extraction(self, key: str | None) -> str | None:
+        """
+        Look up a stored extraction and count the hit or miss.
+
+        Args:
+            key: Key from ``_cache_key``; ``None`` always misses uncounted.
+
+        Returns:
+            The stored raw response, or ``None``.
+        """
+        if key is None:
+            return None
+        cached = self.extraction_cache.get(key)
+        self.ingestion_usage["cache_hits" if cached else "cache_misses"] += 1
+        return cached
+
+    def _store_extraction(self, key: str | None, response: str):
+        """
+        Store a raw response that parsed successfully.
+
+        Its merchants also join ``known_merchants`` once that set is built.
+
+        Args:
+            key: Key from ``_cache_key``; ``None`` stores nothing.
+            response: Raw LLM response string.
+        """
+        if self.known_merchants is not None:
+            self.known_merchants.update(DataReader._response_merchants(response))
+        if key is not None:
+            self.extraction_cache.put(key, response)
+
+    @staticmethod
+    def _response_merchants(response: str) -> set[str]:
+        """
+        Return the canonical merchant names of a raw LLM response.
+
+        Args:
+            response: Raw response, a list of row tuples.
+
+        Returns:
+            Names of its rows; empty when the response does not parse.
+        """
+        try:
+            rows = ast.literal_eval(response)
+        except (ValueError, SyntaxError):
+            return set()
+        return {
+            canonicalize_merchant_name(row[0])
+            for row in (rows if isinstance(rows, list) else [])
+            if isinstance(row, tuple) and row and isinstance(row[0], str)
+        }
+
+    def _known_merchants(self) -> frozenset[str]:
+        """
+        Collect canonical merchant names that corroborate OCR header reads.
+
+        The set is built once per reader from recent cached LLM extractions,
+        stored proof names and learned merchant aliases, then kept current by
+        ``_store_extraction``.
+
+        Returns:
+            Names from up to ``KNOWN_MERCHANT_RESPONSES`` cached responses and
+            as many stored proofs, plus every aliased proof name.
+        """
+        if self.known_merchants is None:
+            names = set()
+            if self.extraction_cache is not None:
+                for response in self.extraction_cache.recent_responses(
+                    KNOWN_MERCHANT_RESPONSES
+                ):
+                    names.update(DataReader._response_merchants(response))
+            if self.database is not None:
+                stored = self.database.load_proof_merchant_names(
+                    KNOWN_MERCHANT_RESPONSES
+                )
+                for proof_names in self.database.load_merchant_aliases().values():
+                    stored.extend(proof_names)
+                names.update(canonicalize_merchant_name(name) for name in stored)
+            if self.extraction_cache is None and self.database is None:
+                print(
+                    "[Ingestion] OCR is enabled without an extraction cache or "
+                    "database, so no merchant is corroborated and every receipt "
+                    "escalates to the LLM"
+                )
+            self.known_merchants = names
+        return frozenset(self.known_merchants)
+
+    def _read_with_ocr(
+        self, image_files: list[str], positions: list[int], data: list[str | None]
+    ) -> list[int]:
+        """
+        Run the local OCR tier over the images at *positions*.
+
+        Accepted results are written into *data* as LLM-style responses. They
+        are not stored in the extraction cache, which holds LLM answers only.
+
+        Args:
+            image_files: All proof image paths.
+            positions: Indices into *image_files* still without a response.
+            data: Responses aligned to *image_files*; updated in place.
+
+        Returns:
+            The positions OCR answered.
+        """
+        if self.receipt_ocr is None or not positions:
+            return []
+
+        known_merchants = self._known_merchants()
+        with ThreadPoolExecutor(
+            max_workers=min(self.io_max_workers, len(positions))
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda path: self.receipt_ocr.extract(path, known_merchants),
+                    [image_files[position] for position in positions],
+                )
+            )
+
+        accepted = []
+        for position, fields in zip(positions, results):
+            if fields is None:
+                continue
+            self.ingestion_usage["ocr_attempts"] += 1
+            self.ingestion_usage["ocr_seconds"] += fields.seconds
+            if self.receipt_ocr.accepts(fields):
+                data[position] = fields.to_response()
+                accepted.append(position)
+        self.ingestion_usage["ocr_accepted"] += len(accepted)
+        return accepted
+
+    def _record_image_payloads(
+        self, image_files: list[str], payloads: list[ImagePayload]
+    ) -> None:
+        """
+        Accumulate source versus uploaded bytes and estimated image tokens.
+
+        Source figures are the files as stored and the tokens Gemini would
+        bill at their full resolution, so the difference is what compression
+        and preprocessing saved.
+
+        Args:
+            image_files: Source image paths, aligned to *payloads*.
+            payloads: Payloads built from *image_files*.
+        """
+        for image_path, payload in zip(image_files, payloads):
+            with Image.open(image_path) as source:
+                source_size = source.size
+            self.ingestion_usage["images_sent"] += 1
+            self.ingestion_usage["image_source_bytes"] += os.path.getsize(image_path)
+            self.ingestion_usage["image_upload_bytes"] += len(payload.data)
+            self.ingestion_usage["image_source_tokens"] += estimate_image_tokens(
+                source_size
+            )
+            self.ingestion_usage["image_upload_tokens"] += estimate_image_tokens(
+                payload.size or source_size
+            )
+
     @staticmethod
     def _extract_text_content(message_content: object) -> str:
         """
@@ -450,8 +785,11 @@ class DataReader(LLMBase):
         Extract receipt data from image files at *data_path*.
 
         Images are encoded to base64, sent to the Gemini vision API concurrently,
-        and then normalised into a four-column DataFrame. Non-USD totals are
-        converted to USD via the exchange-rate API.
+        and then normalised into a four-column DataFrame. Images are preprocessed
+        first when the ``preprocess`` config block enables it. Images already in
+        the extraction cache are not encoded or sent, and when the ``ocr`` config
+        block enables it, receipts local OCR reads with high confidence are not
+        sent either. Non-USD totals are converted to USD via the exchange-rate API.
 
         Args:
             data_path: Either a directory path (str) or a list of image file paths.
@@ -462,15 +800,36 @@ class DataReader(LLMBase):
         """
         print("\n[Ingestion] Starting proof extraction\n")
         start = time()
-        payload = DataReader.create_image_payload(data_path, self.io_max_workers)
-        data = self.batch_read_data(payload)
+        image_files = [
+            path
+            for path in DataReader.gather_files(data_path)
+            if (mimetypes.guess_type(path)[0] or "").startswith("image/")
+        ]
+        variant = self._proof_cache_variant()
+        keys = [self._cache_key(path, RECEIPT_PROMPT, variant) for path in image_files]
+        data = [self._cached_extraction(key) for key in keys]
+        missing = [position for position, item in enumerate(data) if item is None]
+        ocr_read = set(self._read_with_ocr(image_files, missing, data))
+        missing = [position for position in missing if position not in ocr_read]
+
+        missing_files = [image_files[position] for position in missing]
+        payload = DataReader.create_image_payload(
+            missing_files, self.io_max_workers, preprocess=self.preprocess
+        )
+        self._record_image_payloads(missing_files, payload)
+        for position, item in zip(missing, self.batch_read_data(payload)):
+            data[position] = item
+        self.ingestion_usage["llm_images"] += len(missing)
         end = time()
         print(f"\nTime to read proofs: {round(end - start, 2)}s\n")
 
+        missed = set(missing)
         data_vec = []
-        for item in data:
+        for position, item in enumerate(data):
             parsed = ast.literal_eval(item)
             data_vec.extend(parsed)
+            if position in missed:
+                self._store_extraction(keys[position], item)
 
         processed_data = DataReader.preprocess_data(data_vec)
 
@@ -617,8 +976,12 @@ class DataReader(LLMBase):
 
             def process_pdf(pdf_path: str) -> pd.DataFrame:
                 try:
-                    extracted_data = self.extract_data_from_pdf(pdf_path)
+                    key = self._cache_key(pdf_path, STATEMENT_PROMPT)
+                    cached = self._cached_extraction(key)
+                    extracted_data = cached or self.extract_data_from_pdf(pdf_path)
                     data_vec = ast.literal_eval(extracted_data)
+                    if cached is None:
+                        self._store_extraction(key, extracted_data)
                     return DataReader.preprocess_data(data_vec)
                 except Exception as e:
                     print(f"\nWarning: Failed to process PDF {pdf_path}: {e}\n")
@@ -719,15 +1082,18 @@ class DataReader(LLMBase):
             text += doc.page_content
         return text
 
-    def batch_read_data(self, image_payloads: list[dict]) -> list[str]:
+    def batch_read_data(
+        self, image_payloads: list[ImagePayload] | list[dict]
+    ) -> list[str]:
         """
         Process multiple image payloads concurrently and return extracted text responses.
 
         Attempts the batch API path first (currently disabled) and falls back to
-        per-image parallel extraction via a thread pool.
+        parallel extraction via a thread pool: several images per request when
+        ``multi_image`` is enabled, otherwise one request per image.
 
         Args:
-            image_payloads: List of image payload dicts as produced by
+            image_payloads: List of image payloads as produced by
                 ``create_image_payload()``.
 
         Returns:
@@ -771,10 +1137,13 @@ class DataReader(LLMBase):
                     f"\nWarning: Batch proof extraction failed; falling back. Error: {e}\n"
                 )
 
-        with ThreadPoolExecutor(
-            max_workers=min(self.llm_max_workers, max(1, len(image_payloads)))
-        ) as executor:
-            results = list(executor.map(self.read_proofs_data, image_payloads))
+        if self.images_per_request > 1 and len(image_payloads) > 1:
+            results = self.read_proofs_data_packed(image_payloads)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.llm_max_workers, max(1, len(image_payloads)))
+            ) as executor:
+                results = list(executor.map(self.read_proofs_data, image_payloads))
 
         elapsed = time() - start_time
         cost_delta = (
@@ -840,10 +1209,13 @@ class DataReader(LLMBase):
 
     @staticmethod
     def create_image_payload(
-        data_path: str | list[str], max_workers: int = 8
-    ) -> list[dict]:
+        data_path: str | list[str],
+        max_workers: int = 8,
+        legacy: bool = False,
+        preprocess: PreprocessSettings | None = None,
+    ) -> list[ImagePayload] | list[dict]:
         """
-        Build a list of base64-encoded image payload dicts ready for the LLM.
+        Build a list of compressed image payloads ready for the LLM.
 
         Only files whose MIME type starts with ``image/`` are included. Encoding
         is done in parallel using a thread pool.
@@ -851,9 +1223,14 @@ class DataReader(LLMBase):
         Args:
             data_path: Directory path (str) or list of absolute file paths.
             max_workers: Maximum number of threads for concurrent encoding.
+            legacy: Return OpenAI-style ``image_url`` dicts with base64 data
+                URLs instead of ``ImagePayload`` objects.
+            preprocess: Optional preprocessing applied before compression.
 
         Returns:
-            List of ``{"type": "image_url", "image_url": {"url": "data:..."}}`` dicts.
+            List of ``ImagePayload`` objects, or of
+            ``{"type": "image_url", "image_url": {"url": "data:..."}}`` dicts
+            when *legacy* is set.
         """
         image_payload = []
         is_dir = isinstance(data_path, str)
@@ -863,13 +1240,8 @@ class DataReader(LLMBase):
             mime_type, _ = mimetypes.guess_type(file_name)
             if mime_type and mime_type.startswith("image/"):
                 image_path = os.path.join(data_path, file_name) if is_dir else file_name
-                encoded_string = DataReader.encode_image(image_path)
-                return {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:{mime_type};base64,{encoded_string}",
-                    },
-                }
+                payload = DataReader.read_image(image_path, preprocess)
+                return payload.to_openai() if legacy else payload
 
             return None
 
@@ -880,49 +1252,50 @@ class DataReader(LLMBase):
         return image_payload
 
     @staticmethod
-    def reduce_image_size(image_path, max_size=2 * 1024 * 1024):
+    def reduce_image_size(
+        image_path, max_size=DEFAULT_MAX_BYTES, max_attempts=MAX_ENCODE_ATTEMPTS
+    ):
         """
         Compress an image in-memory until it falls below *max_size* bytes.
 
-        Iteratively reduces JPEG quality by 5 points per pass, then falls back to
-        resizing by 5% per pass if quality reduction alone is insufficient.
+        Delegates to ``compress_image``: large JPEGs are decoded at reduced
+        scale, oversized images are resized from their pixel count, and JPEG
+        quality is searched with at most *max_attempts* encodes in total.
         The image is never written to disk.
 
         Args:
             image_path: Path to the source image file.
             max_size: Maximum acceptable file size in bytes. Defaults to 2 MB.
+            max_attempts: Cap on encodes, across every resize.
 
         Returns:
             ``io.BytesIO`` buffer positioned at byte 0 containing the compressed image.
         """
-        img = Image.open(image_path)
-
-        # Convert palette/alpha modes to RGB for JPEG compatibility
-        if img.mode in ("RGBA", "P"):
-            img = img.convert("RGB")
-
-        img_bytes = io.BytesIO()
-
-        quality = 90
-        while True:
-            img_bytes.seek(0)
-            img_bytes.truncate(0)
-            img.save(img_bytes, format="JPEG", quality=quality)
-
-            if img_bytes.tell() <= max_size or quality <= 10:
-                break
+        img_bytes, _ = compress_image(image_path, max_size, max_attempts)
+        return img_bytes
 
-            quality -= 5
+    @staticmethod
+    def read_image(
+        image_path: str, preprocess: PreprocessSettings | None = None
+    ) -> ImagePayload:
+        """
+        Compress an image file and wrap the result without re-encoding it.
 
-        while img_bytes.tell() > max_size:
-            width, height = img.size
-            img = img.resize((int(width * 0.95), int(height * 0.95)), Image.LANCZOS)
-            img_bytes.seek(0)
-            img_bytes.truncate(0)
-            img.save(img_bytes, format="JPEG", quality=quality)
+        Args:
+            image_path: Path to the source image file.
+            preprocess: Optional grayscale, deskew, crop and downscale steps
+                run before compression when enabled.
 
-        img_bytes.seek(0)
-        return img_bytes
+        Returns:
+            ``ImagePayload`` holding the compressed JPEG bytes and their size.
+        """
+        source = image_path
+        if preprocess is not None and preprocess.enabled:
+            source = preprocess_image(image_path, preprocess)
+        img_bytes, _ = compress_image(source)
+        with Image.open(img_bytes) as encoded:
+            size = encoded.size
+        return ImagePayload(img_bytes.getvalue(), size=size)
 
     @staticmethod
     def encode_image(image_path: str):
@@ -966,7 +1339,8 @@ class DataReader(LLMBase):
 
         System messages are collected into a single string returned as the second
         element. User messages are converted to ``Part.from_text`` or
-        ``Part.from_bytes`` (for image_url items).
+        ``Part.from_bytes``; ``ImagePayload`` items are passed through as raw
+        bytes, while legacy image_url items are decoded from their data URL.
 
         Args:
             messages: List of ``{"role": ..., "content": ...}`` message dicts.
@@ -1001,6 +1375,15 @@ class DataReader(LLMBase):
                             parts.append(types.Part.from_text(text=item))
                         continue
 
+                    if isinstance(item, ImagePayload):
+                        parts.append(
+                            types.Part.from_bytes(
+                                data=item.as_bytes(),
+                                mime_type=item.mime_type,
+                            )
+                        )
+                        continue
+
                     if not isinstance(item, dict):
                         continue
 
@@ -1058,12 +1441,13 @@ class DataReader(LLMBase):
 
         return ""
 
-    def read_proofs_data(self, image_payload: dict) -> str:
+    def read_proofs_data(self, image_payload: ImagePayload | dict) -> str:
         """
         Send a single encoded image payload to the Gemini vision API and return the extracted text.
 
         Args:
-            image_payload: A single image payload dict produced by ``create_image_payload()``.
+            image_payload: A single ``ImagePayload``, or a legacy ``image_url``
+                dict, as produced by ``create_image_payload()``.
 
         Returns:
             Raw LLM response string (Python list literal) containing receipt data.
@@ -1082,8 +1466,116 @@ class DataReader(LLMBase):
         ]
         return self._chat_completion_with_fallback(messages, max_tokens=300)
 
+    @staticmethod
+    def _payload_tokens(image_payload: ImagePayload | dict) -> int:
+        """Estimate the input tokens of one image payload."""
+        if isinstance(image_payload, ImagePayload) and image_payload.size:
+            return estimate_image_tokens(image_payload.size)
+        return _UNSIZED_IMAGE_TOKENS
+
+    def _read_proofs_pack(
+        self, image_payloads: list[ImagePayload] | list[dict]
+    ) -> list[str | None]:
+        """
+        Extract several receipts with one request.
+
+        Args:
+            image_payloads: Images of one pack.
+
+        Returns:
+            One raw response per image in single-image format, or ``None`` for
+            images whose part of the answer failed to parse.
+        """
+        if len(image_payloads) == 1:
+            return [self.read_proofs_data(image_payloads[0])]
+
+        content: list[dict | ImagePayload] = [
+            {
+                "type": "text",
+                "text": MULTI_RECEIPT_PROMPT.format(count=len(image_payloads)),
+            }
+        ]
+        for number, image_payload in enumerate(image_payloads, start=1):
+            content.extend(
+                [{"type": "text", "text": f"Image {number}:"}, image_payload]
+            )
+        messages = [{"role": "user", "content": content}]
+
+        self.ingestion_usage["packed_requests"] += 1
+        self.ingestion_usage["packed_images"] += len(image_payloads)
+        try:
+            response = self._chat_completion_with_fallback(
+                messages,
+                max_tokens=PACKED_OUTPUT_TOKENS_PER_IMAGE * len(image_payloads),
+                outputs=len(image_payloads),
+                response_mime_type="application/json",
+            )
+        except RuntimeError as e:
+            print(f"\nWarning: Packed proof extraction failed; retrying. Error: {e}\n")
+            return [None] * len(image_payloads)
+        return parse_packed_response(response, len(image_payloads))
+
+    def read_proofs_data_packed(
+        self, image_payloads: list[ImagePayload] | list[dict]
+    ) -> list[str]:
+        """
+        Extract receipts several images per request to share the prompt tokens.
+
+        Images are packed in order until ``packed_input_tokens`` (prompt
+        included) or ``images_per_request`` is reached, and packs are sent
+        concurrently. Images whose part of a packed answer is missing or
+        malformed are retried alone with ``read_proofs_data``.
+
+        Args:
+            image_payloads: Image payloads as produced by ``create_image_payload()``.
+
+        Returns:
+            Raw response strings (Python list literals), one per input payload.
+        """
+        prompt_tokens = estimate_text_tokens(
+            MULTI_RECEIPT_PROMPT.format(count=self.images_per_request)
+        )
+        # "Image N:" labels cost a few tokens per image
+        costs = [self._payload_tokens(payload) + 4 for payload in image_payloads]
+        packs = pack_by_tokens(
+            costs,
+            max(1, self.packed_input_tokens - prompt_tokens),
+            self.images_per_request,
+        )
+
+        results: list[str | None] = [None] * len(image_payloads)
+        with ThreadPoolExecutor(
+            max_workers=min(self.llm_max_workers, len(packs))
+        ) as executor:
+            answers = list(
+                executor.map(
+                    self._read_proofs_pack,
+                    [[image_payloads[index] for index in pack] for pack in packs],
+                )
+            )
+        for pack, answer in zip(packs, answers):
+            for index, response in zip(pack, answer):
+                results[index] = response
+
+        retry = [index for index, response in enumerate(results) if response is None]
+        if retry:
+            self.ingestion_usage["packed_retries"] += len(retry)
+            with ThreadPoolExecutor(
+                max_workers=min(self.llm_max_workers, len(retry))
+            ) as executor:
+                retried = executor.map(
+                    self.read_proofs_data, [image_payloads[index] for index in retry]
+                )
+                for index, response in zip(retry, retried):
+                    results[index] = response
+        return results
+
     def _chat_completion_with_fallback(
-        self, messages: list[dict], max_tokens: int
+        self,
+        messages: list[dict],
+        max_tokens: int,
+        outputs: int = 1,
+        response_mime_type: str | None = None,
     ) -> str:
         """
         Submit a message list to the primary Gemini model and return the text response.
@@ -1095,6 +1587,10 @@ class DataReader(LLMBase):
         Args:
             messages: List of ``{"role": ..., "content": ...}`` message dicts.
             max_tokens: Maximum number of output tokens requested for this call.
+            outputs: Independent answers the response holds, such as images
+                of a packed request; the configured token cap applies to each.
+            response_mime_type: Structured output type, e.g.
+                ``"application/json"``; plain text when ``None``.
 
         Returns:
             Text response string from the model.
@@ -1105,8 +1601,10 @@ class DataReader(LLMBase):
         completion_kwargs = types.GenerateContentConfig(
             temperature=self.temperature,
             top_p=self.top_p,
-            max_output_tokens=min(max_tokens, self.max_tokens),
+            max_output_tokens=min(max_tokens, self.max_tokens * outputs),
         )
+        if response_mime_type:
+            completion_kwargs.response_mime_type = response_mime_type
 
         contents, system_instruction = DataReader._build_gemini_contents(messages)
         # Attach system instruction when present; not all prompts include one
@@ -1115,11 +1613,14 @@ class DataReader(LLMBase):
 
         if self.primary_client is not None:
             try:
-                response = self.primary_client.models.generate_content(
-                    model=self.primary_model,
-                    contents=contents,
-                    config=completion_kwargs,
-                )
+                with self.request_slot():
+                    request_start = time()
+                    response = self.primary_client.models.generate_content(
+                        model=self.primary_model,
+                        contents=contents,
+                        config=completion_kwargs,
+                    )
+                    self.ingestion_usage["llm_seconds"] += time() - request_start
                 self._record_usage(
                     getattr(response, "usage_metadata", None),
                     mode="standard",
@@ -4,10 +4,19 @@ from datetime import datetime
 
 import pandas as pd
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, inspect, text
 from sqlalchemy.orm import sessionmaker
 
-from src.data.db_schema import Base, Session, Transaction, Proof, SessionState
+from src.data.db_schema import (
+    Base,
+    MerchantAlias,
+    Session,
+    Transaction,
+    Proof,
+    SessionState,
+)
+from src.utils.dates import parse_dates
+from src.utils.money import CENTS_COLUMN, frame_cents, from_cents
 
 
 class DataBase:
@@ -58,6 +67,7 @@ class DataBase:
                 Base.metadata.drop_all(bind=self.engine)
 
             Base.metadata.create_all(bind=self.engine)
+            self._migrate_schema()
 
             if db_exists:
                 print(f"📂 Found existing database '{self.db_path}'.")
@@ -68,16 +78,41 @@ class DataBase:
             if reset_db:
                 Base.metadata.drop_all(bind=self.engine)
             Base.metadata.create_all(bind=self.engine)
+            self._migrate_schema()
 
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
 
+    def _migrate_schema(self) -> None:
+        """
+        Add columns introduced after a database was first created.
+
+        ``create_all`` only creates missing tables, so older databases are
+        brought up to date with ``ALTER TABLE ... ADD COLUMN``. Integer cents
+        are backfilled from the stored float totals.
+        """
+        existing = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in (Transaction.__tablename__, Proof.__tablename__):
+                columns = {column["name"] for column in existing.get_columns(table)}
+                if CENTS_COLUMN in columns:
+                    continue
+                connection.execute(
+                    text(f"ALTER TABLE {table} ADD COLUMN {CENTS_COLUMN} INTEGER")
+                )
+                connection.execute(
+                    text(
+                        f"UPDATE {table} SET {CENTS_COLUMN} = "
+                        "CAST(ROUND(total * 100) AS INTEGER)"
+                    )
+                )
+
     @staticmethod
     def _normalize_date_series(series: pd.Series) -> pd.Series:
         """
         Normalise a Series of potentially noisy date strings to ``datetime.date`` values.
 
-        Tries ``pd.to_datetime`` first, then falls back to extracting a date-shaped
-        substring via regex for any values that could not be parsed directly.
+        Parsing is delegated to the shared, memoised parser in ``src.utils.dates``,
+        which tries known formats first and falls back to regex extraction.
 
         Args:
             series: Pandas Series of date values (strings, datetimes, etc.).
@@ -86,19 +121,9 @@ class DataBase:
             Series of ``datetime.date`` objects.
 
         Raises:
-            ValueError: If one or more values cannot be parsed after both attempts.
+            ValueError: If one or more values cannot be parsed.
         """
-        parsed = pd.to_datetime(series, errors="coerce")
-
-        # Attempt regex-based extraction for values that failed the first parse
-        unresolved = parsed.isna()
-        if unresolved.any():
-            extracted = series.astype(str).str.extract(
-                r"(\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})",
-                expand=False,
-            )
-            reparsed = pd.to_datetime(extracted, errors="coerce")
-            parsed = parsed.where(~unresolved, reparsed)
+        parsed = parse_dates(series)
 
         if parsed.isna().any():
             raise ValueError("Unable to parse one or more date values from inputs.")
@@ -112,20 +137,24 @@ class DataBase:
 
         Lowercases column names, enforces the required four columns, coerces
         numeric totals, normalises date strings, and uppercases currency codes.
+        Integer cents are derived from ``total``; rows without one take it
+        from their stored cents.
 
         Args:
             frame: Raw input DataFrame that must contain ``business_name``,
                 ``total``, ``date``, and ``currency`` columns (case-insensitive).
 
         Returns:
-            A clean, four-column DataFrame ready for database insertion.
+            A clean DataFrame with the four required columns plus
+            ``total_cents``, ready for database insertion.
 
         Raises:
-            ValueError: If any required column is missing after name normalisation.
+            ValueError: If any required column is missing after name
+                normalisation, or a row has no parseable total.
         """
         if frame is None or frame.empty:
             return pd.DataFrame(
-                [], columns=["business_name", "total", "date", "currency"]
+                [], columns=["business_name", "total", "date", "currency", CENTS_COLUMN]
             )
 
         normalized = frame.copy()
@@ -137,11 +166,21 @@ class DataBase:
         if missing:
             raise ValueError(f"Missing required columns: {', '.join(missing)}")
 
-        normalized = normalized[required]
+        normalized = normalized[
+            required + ([CENTS_COLUMN] if CENTS_COLUMN in normalized.columns else [])
+        ]
         normalized["business_name"] = (
             normalized["business_name"].astype(str).str.strip()
         )
         normalized["total"] = pd.to_numeric(normalized["total"], errors="raise")
+        normalized[CENTS_COLUMN] = frame_cents(normalized)
+        if normalized[CENTS_COLUMN].isna().any():
+            raise ValueError(
+                f"{int(normalized[CENTS_COLUMN].isna().sum())} row(s) have no total"
+            )
+        normalized["total"] = normalized["total"].fillna(
+            from_cents(normalized[CENTS_COLUMN])
+        )
         normalized["date"] = DataBase._normalize_date_series(normalized["date"])
         # Normalise currency codes to uppercase; replace blank values with USD
         normalized["currency"] = (
@@ -211,7 +250,8 @@ class DataBase:
                 for this session are replaced. Set to ``False`` to append.
 
         Raises:
-            ValueError: If *session_id* is empty or a required column is missing.
+            ValueError: If *session_id* is empty, a required column is missing
+                or a row has no total.
         """
         normalized_session_id = str(session_id).strip()
         if not normalized_session_id:
@@ -244,6 +284,7 @@ class DataBase:
                         session_ref_id=session_obj.id,
                         business_name=row["business_name"],
                         total=float(row["total"]),
+                        total_cents=int(row[CENTS_COLUMN]),
                         currency=row["currency"],
                         date=row["date"],
                     )
@@ -255,6 +296,7 @@ class DataBase:
                         session_ref_id=session_obj.id,
                         business_name=row["business_name"],
                         total=float(row["total"]),
+                        total_cents=int(row[CENTS_COLUMN]),
                         currency=row["currency"],
                         date=row["date"],
                     )
@@ -368,18 +410,111 @@ class DataBase:
 
     def clear_all_data(self) -> None:
         """
-        Remove all persisted sessions, transactions, proofs, and session states.
+        Remove all persisted sessions, transactions, proofs, session states, and
+        learned merchant aliases.
 
         This operation is irreversible. Intended for test teardown and
         administrative resets only.
         """
         with self.SessionLocal() as db:
             db.query(SessionState).delete()
+            db.query(MerchantAlias).delete()
             db.query(Proof).delete()
             db.query(Transaction).delete()
             db.query(Session).delete()
             db.commit()
 
+    def save_merchant_aliases(self, pairs: list[tuple[str, str]]) -> int:
+        """
+        Record accepted (transaction name, proof name) merchant alias pairs.
+
+        Names are stored as given, so callers should pass canonical merchant
+        names. Pairs seen before have their ``accepted_count`` incremented.
+
+        Args:
+            pairs: ``(transaction_name, proof_name)`` tuples.
+
+        Returns:
+            The number of new alias rows inserted.
+        """
+        unique_pairs = {
+            (str(tx_name).strip(), str(pr_name).strip())
+            for tx_name, pr_name in pairs
+            if str(tx_name).strip() and str(pr_name).strip()
+        }
+        if not unique_pairs:
+            return 0
+
+        inserted = 0
+        with self.SessionLocal() as db:
+            for tx_name, pr_name in sorted(unique_pairs):
+                alias_obj = (
+                    db.query(MerchantAlias)
+                    .filter(
+                        MerchantAlias.transaction_name == tx_name,
+                        MerchantAlias.proof_name == pr_name,
+                    )
+                    .first()
+                )
+
+                if alias_obj is None:
+                    db.add(
+                        MerchantAlias(
+                            transaction_name=tx_name,
+                            proof_name=pr_name,
+                            accepted_count=1,
+                            updated_at=datetime.utcnow(),
+                        )
+                    )
+                    inserted += 1
+                else:
+                    alias_obj.accepted_count += 1
+                    alias_obj.updated_at = datetime.utcnow()
+
+            db.commit()
+
+        return inserted
+
+    def load_merchant_aliases(self) -> dict[str, set[str]]:
+        """
+        Load every learned merchant alias.
+
+        Returns:
+            Mapping of transaction name to the set of proof names it is known
+            to match.
+        """
+        with self.SessionLocal() as db:
+            rows = db.query(
+                MerchantAlias.transaction_name, MerchantAlias.proof_name
+            ).all()
+
+        aliases: dict[str, set[str]] = {}
+        for tx_name, pr_name in rows:
+            aliases.setdefault(tx_name, set()).add(pr_name)
+
+        return aliases
+
+    def load_proof_merchant_names(self, limit: int) -> list[str]:
+        """
+        Load the distinct merchant names of the most recently stored proofs.
+
+        Args:
+            limit: Most names returned.
+
+        Returns:
+            Proof business names, most recently stored first.
+        """
+        with self.SessionLocal() as db:
+            rows = (
+                db.query(Proof.business_name)
+                .group_by(Proof.business_name)
+                .order_by(func.max(Proof.id).desc())
+                .limit(limit)
+                .all()
+            )
+
+        return [name for (name,) in rows]
+
     def save_session_state(self, session_id: str, state: dict) -> None:
         """
         Persist frontend/UI state for a session to support resume flows.
@@ -1,6 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship, declarative_base
 
 
@@ -50,6 +60,8 @@ class Transaction(Base):
     )
     business_name = Column(String, nullable=False)
     total = Column(Float, nullable=False)
+    # Nullable only so databases created before the column can be migrated
+    total_cents = Column(Integer, nullable=True)
     currency = Column(String, nullable=False)
     date = Column(Date, nullable=False)
 
@@ -75,6 +87,7 @@ class Proof(Base):
     )
     business_name = Column(String, nullable=False)
     total = Column(Float, nullable=False)
+    total_cents = Column(Integer, nullable=True)
     currency = Column(String, nullable=False)
     date = Column(Date, nullable=False)
 
@@ -100,3 +113,24 @@ class SessionState(Base):
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     session = relationship("Session", back_populates="state")
+
+
+class MerchantAlias(Base):
+    """
+    ORM model storing a learned transaction-name → proof-name merchant alias.
+
+    Rows are recorded when a user accepts a recommended pairing, keyed by the
+    canonical merchant names on each side, and are shared across sessions so
+    later validation runs can match the pair without fuzzy scoring.
+    """
+
+    __tablename__ = "merchant_aliases"
+    __table_args__ = (
+        UniqueConstraint("transaction_name", "proof_name", name="uq_merchant_alias"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    transaction_name = Column(String, nullable=False, index=True)
+    proof_name = Column(String, nullable=False)
+    accepted_count = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from time import time
+
+
+DEFAULT_CACHE_PATH = "data/cache/extractions.db"
+
+DEFAULT_CACHE_MB = 256
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def extraction_key(
+    file_path: str, prompt: str, model_name: str, variant: str = ""
+) -> str:
+    """
+    Hash everything an extraction depends on into a cache key.
+
+    The prompt is hashed in full, so editing a prompt invalidates its entries
+    without a hand-maintained version number.
+
+    Args:
+        file_path: Source file whose bytes are sent (or parsed and sent).
+        prompt: Extraction prompt text.
+        model_name: Model that answers the prompt.
+        variant: Tag for anything else that changes what is sent, such as
+            image preprocessing; empty when nothing does.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        # hashlib.file_digest needs Python 3.11; CI runs 3.10
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_BYTES), b""):
+            file_hash.update(chunk)
+    file_digest = file_hash.hexdigest()
+    prompt_version = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    key = f"{file_digest}:{prompt_version}:{model_name}"
+    if variant:
+        key += f":{variant}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk SQLite store of LLM extraction responses keyed by ``extraction_key``.
+
+    Entries are evicted least recently used first once their total size exceeds
+    ``max_bytes``. Every call opens its own connection, so one cache file can be
+    shared by several readers, threads and processes.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+    ):
+        """
+        Initialize the cache, creating the database file when missing.
+
+        Args:
+            path: SQLite file holding the entries.
+            max_bytes: Total response size kept before eviction.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        parent_dir = os.path.dirname(path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS extractions_last_used "
+                "ON extractions (last_used)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0])
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the stored responses."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions")
+            return int(row.fetchone()[0])
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a stored response and mark it recently used.
+
+        Args:
+            key: ``extraction_key`` of the request.
+
+        Returns:
+            The stored response, or ``None`` on a miss.
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT response FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE extractions SET last_used = ? WHERE key = ?", (time(), key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def recent_responses(self, limit: int) -> list[str]:
+        """
+        Return the most recently used responses, without marking them used.
+
+        Args:
+            limit: Most responses returned.
+
+        Returns:
+            Stored responses, most recently used first.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT response FROM extractions ORDER BY last_used DESC LIMIT ?",
+                (limit,),
+            )
+            return [row[0] for row in rows.fetchall()]
+
+    def put(self, key: str, response: str):
+        """
+        Store a response, evicting the least recently used over ``max_bytes``.
+
+        Args:
+            key: ``extraction_key`` of the request.
+            response: Raw model response to return on later hits.
+        """
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, response, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, size, time()),
+            )
+            total = conn.execute("SELECT SUM(size) FROM extractions").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            evicted = []
+            for old_key, old_size in conn.execute(
+                "SELECT key, size FROM extractions ORDER BY last_used, rowid"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                evicted.append((old_key,))
+                total -= old_size
+            conn.executemany("DELETE FROM extractions WHERE key = ?", evicted)
@@ -0,0 +1,106 @@
+import json
+from numbers import Real
+
+from src.utils.utils import strip_code_fence
+
+
+# Rough prompt size estimate; Gemini averages about four characters per token
+CHARS_PER_TOKEN = 4
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the input tokens of *text*."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def pack_by_tokens(
+    costs: list[int], max_tokens: int, max_items: int
+) -> list[list[int]]:
+    """
+    Group consecutive items into packs that fit a token budget.
+
+    Items are kept in order. An item over the budget on its own still gets a
+    pack of one, so every item is placed.
+
+    Args:
+        costs: Estimated input tokens of each item.
+        max_tokens: Token budget per pack.
+        max_items: Most items per pack.
+
+    Returns:
+        Lists of item indices, one per pack.
+    """
+    packs: list[list[int]] = []
+    current: list[int] = []
+    used = 0
+    for index, cost in enumerate(costs):
+        if current and (used + cost > max_tokens or len(current) >= max_items):
+            packs.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def _transaction(row: object) -> tuple[str, float, str, str] | None:
+    """Validate one ``[name, total, date, currency]`` row of a packed answer."""
+    if not isinstance(row, (list, tuple)) or len(row) != 4:
+        return None
+    name, total, date, currency = row
+    if not isinstance(total, Real) or isinstance(total, bool):
+        return None
+    if not all(isinstance(value, str) for value in (name, date, currency)):
+        return None
+    return name, float(total), date, currency
+
+
+def parse_packed_response(text: str, count: int) -> list[str | None]:
+    """
+    Split a packed multi-image answer into per-image responses.
+
+    The answer is JSON shaped like
+    ``{"items": [{"image": 1, "transactions": [["Name", 5.0, "mm-dd-yyyy",
+    "USD"]]}]}`` with images numbered from 1. Each image's transactions are
+    re-rendered as the Python list literal a single-image request returns.
+
+    Args:
+        text: Raw model response.
+        count: Number of images in the request.
+
+    Returns:
+        One response per image; ``None`` where the image is missing, repeated,
+        empty or malformed, so the caller can retry it alone.
+    """
+    try:
+        parsed = json.loads(strip_code_fence(text))
+    except json.JSONDecodeError:
+        return [None] * count
+
+    items = parsed.get("items", []) if isinstance(parsed, dict) else []
+    if not isinstance(items, list):
+        return [None] * count
+
+    answers: dict[int, list | None] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            image = int(item.get("image"))
+        except (TypeError, ValueError):
+            continue
+        if not 1 <= image <= count:
+            continue
+        rows = item.get("transactions")
+        transactions = (
+            [_transaction(row) for row in rows] if isinstance(rows, list) else []
+        )
+        valid = bool(transactions) and None not in transactions
+        # An image answered twice is ambiguous, so it is retried alone
+        answers[image] = None if image in answers or not valid else transactions
+
+    return [
+        repr(answers[image]) if answers.get(image) else None
+        for image in range(1, count + 1)
+    ]
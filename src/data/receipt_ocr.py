@@ -0,0 +1,435 @@
+import re
+from dataclasses import dataclass
+from time import perf_counter
+
+import pandas as pd
+from PIL import Image
+
+from src.intelligence.merchant_names import canonicalize_merchant_name
+from src.utils.dates import DATE_TOKEN_PATTERN
+from src.utils.preprocess import PreprocessSettings, preprocess_image
+
+
+DEFAULT_MIN_CONFIDENCE = 0.85
+
+# Labels of the final charged amount, strongest first; mirrors RECEIPT_PROMPT
+_FINAL_TOTAL_LABEL = re.compile(
+    r"\b(GRAND\s*TOTAL|AMOUNT\s*PAID|TOTAL\s*PAID|TOTAL\s*CHARGED)\b"
+)
+_TOTAL_LABEL = re.compile(r"\bTOTAL\b")
+_NOT_TOTAL_LABEL = re.compile(
+    r"SUB\s*-?\s*TOTAL|\bTAX\b|\bTIP\b|DISCOUNT|SAVINGS|BALANCE|CHANGE|\bITEMS?\b"
+)
+_SUBTOTAL_LABEL = re.compile(r"SUB\s*-?\s*TOTAL")
+_TAX_LABEL = re.compile(r"\bTAX\b")
+
+_AMOUNT = re.compile(r"(?<![\d.,])(\d{1,3}(?:,\d{3})+|\d+)[.,](\d{2})(?![\d.,])")
+_DATE = re.compile(DATE_TOKEN_PATTERN)
+_MONTH_DATE = re.compile(
+    r"\b(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)[A-Z]*\.?\s+"
+    r"(\d{1,2}),?\s+(\d{4})\b"
+)
+
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₩": "KRW"}
+_CURRENCY_CODES = re.compile(
+    r"\b(USD|EUR|GBP|JPY|CAD|AUD|CHF|CNY|KRW|INR|MXN|PHP|SGD|HKD|NZD)\b"
+)
+
+# Header lines that are never the merchant name: boilerplate and addresses
+_NOT_MERCHANT = re.compile(
+    r"\b(RECEIPT|WELCOME|THANK|VISIT(ING)?|INVOICE|TEL|PHONE|STORE\s*#|ST|STREET|"
+    r"AVE|AVENUE|RD|ROAD|BLVD|DR|DRIVE|LN|LANE|HWY|SUITE)\b|"
+    r"^\d+\s|\d{3}[-.\s]\d{3}[-.\s]\d{4}|WWW\.|\.COM"
+)
+_MERCHANT_SEARCH_LINES = 5
+
+# Penalties applied to a field's OCR confidence by the parsing rules
+_CONFLICTING_TOTALS = 0.6
+_TOTAL_BELOW_SUBTOTAL = 0.5
+_MIXED_CURRENCIES = 0.7
+
+# Ceiling for receipts with an uncorroborated guess; they always escalate
+GUESS_CONFIDENCE = 0.5
+
+
+@dataclass
+class OcrLine:
+    """
+    One line of OCR output.
+
+    Attributes:
+        text: Words of the line joined by spaces.
+        confidence: Mean word confidence, ``0``-``1``.
+    """
+
+    text: str
+    confidence: float
+
+
+@dataclass
+class ReceiptFields:
+    """
+    Receipt fields found by the rule-based parser.
+
+    Attributes:
+        business_name: Merchant name, if found.
+        total: Final charged amount, if found.
+        date: Transaction date as ``mm-dd-yyyy``, if found.
+        currency: ISO 4217 code; ``USD`` when the receipt shows none.
+        confidence: Lowest confidence of the four fields, ``0``-``1``; at most
+            ``GUESS_CONFIDENCE`` when *guesses* is not empty.
+        guesses: Fields that rest on an uncorroborated guess: a header line
+            taken as the merchant, a defaulted currency, or a date that reads
+            either day or month first.
+        seconds: Time spent on OCR and parsing.
+    """
+
+    business_name: str | None
+    total: float | None
+    date: str | None
+    currency: str
+    confidence: float
+    guesses: tuple[str, ...] = ()
+    seconds: float = 0.0
+
+    def to_response(self) -> str:
+        """
+        Format the fields like an LLM extraction response.
+
+        Returns:
+            Python list literal of one ``(name, total, date, currency)`` tuple,
+            so OCR results flow through the same parsing as LLM responses.
+        """
+        return repr([(self.business_name, self.total, self.date, self.currency)])
+
+
+def _amounts(text: str) -> list[float]:
+    return [
+        float(f"{whole.replace(',', '')}.{cents}")
+        for whole, cents in _AMOUNT.findall(text)
+    ]
+
+
+def _find_total(lines: list[OcrLine]) -> tuple[float | None, float]:
+    """
+    Pick the final charged amount and its confidence.
+
+    Args:
+        lines: OCR lines in reading order.
+
+    Returns:
+        A tuple ``(total, confidence)``; ``(None, 0.0)`` when no labelled
+        total is found.
+    """
+    final: list[tuple[float, float]] = []
+    plain: list[tuple[float, float]] = []
+    subtotal = tax = None
+    for line in lines:
+        text = line.text.upper()
+        amounts = _amounts(text)
+        if not amounts:
+            continue
+        if _SUBTOTAL_LABEL.search(text):
+            subtotal = amounts[-1]
+        elif _TAX_LABEL.search(text):
+            tax = amounts[-1]
+        elif _FINAL_TOTAL_LABEL.search(text):
+            final.append((amounts[-1], line.confidence))
+        elif _TOTAL_LABEL.search(text) and not _NOT_TOTAL_LABEL.search(text):
+            plain.append((amounts[-1], line.confidence))
+
+    candidates = final or plain
+    if not candidates:
+        return None, 0.0
+
+    # The last labelled line is the grand total on multi-section receipts
+    total, confidence = candidates[-1]
+    if len({amount for amount, _ in candidates}) > 1:
+        confidence *= _CONFLICTING_TOTALS
+    if subtotal is not None:
+        if total < subtotal:
+            confidence *= _TOTAL_BELOW_SUBTOTAL
+        elif tax is not None and round(subtotal + tax, 2) == total:
+            # Subtotal and tax adding up confirms the amount was read right
+            confidence = max(confidence, 0.99)
+    return total, confidence
+
+
+def _find_date(lines: list[OcrLine]) -> tuple[str | None, float, bool]:
+    """
+    Find the first readable date, formatted as ``mm-dd-yyyy``.
+
+    Numeric dates are read month first unless the first part exceeds 12.
+
+    Args:
+        lines: OCR lines in reading order.
+
+    Returns:
+        A tuple ``(date, confidence, ambiguous)``; *ambiguous* is true when
+        the date also reads day first. ``(None, 0.0, False)`` when none
+        parses.
+    """
+    for line in lines:
+        text = line.text.upper()
+        for token in _DATE.findall(text):
+            parts = re.split(r"[-/]", token)
+            ambiguous = False
+            if len(parts[0]) == 4:
+                year, month, day = parts
+            elif int(parts[0]) > 12:
+                day, month, year = parts
+            else:
+                month, day, year = parts
+                ambiguous = int(day) <= 12 and int(day) != int(month)
+            if len(year) == 2:
+                year = f"20{year}"
+            parsed = pd.to_datetime(
+                f"{year}-{month}-{day}", format="%Y-%m-%d", errors="coerce"
+            )
+            if pd.notna(parsed):
+                return parsed.strftime("%m-%d-%Y"), line.confidence, ambiguous
+        match = _MONTH_DATE.search(text)
+        if match:
+            parsed = pd.to_datetime(
+                " ".join(match.groups()), format="%b %d %Y", errors="coerce"
+            )
+            if pd.notna(parsed):
+                return parsed.strftime("%m-%d-%Y"), line.confidence, False
+    return None, 0.0, False
+
+
+def _find_merchant(lines: list[OcrLine]) -> tuple[str | None, float]:
+    """
+    Take the first header line that reads like a business name.
+
+    Args:
+        lines: OCR lines in reading order.
+
+    Returns:
+        A tuple ``(name, confidence)``; ``(None, 0.0)`` when no header line
+        qualifies.
+    """
+    for line in lines[:_MERCHANT_SEARCH_LINES]:
+        text = line.text.strip()
+        letters = sum(char.isalpha() for char in text)
+        if letters < 3 or letters < len(text.replace(" ", "")) / 2:
+            continue
+        upper = text.upper()
+        if _NOT_MERCHANT.search(upper) or _DATE.search(upper) or _AMOUNT.search(upper):
+            continue
+        return text, line.confidence
+    return None, 0.0
+
+
+def _find_currency(lines: list[OcrLine]) -> tuple[str, float, bool]:
+    """
+    Read the currency from symbols or ISO codes, defaulting to USD.
+
+    Args:
+        lines: OCR lines in reading order.
+
+    Returns:
+        A tuple ``(currency, confidence, explicit)``; *explicit* is false when
+        the receipt shows no symbol or code and USD is assumed.
+    """
+    text = " ".join(line.text for line in lines)
+    found = {code for symbol, code in _CURRENCY_SYMBOLS.items() if symbol in text}
+    found.update(_CURRENCY_CODES.findall(text.upper()))
+    if not found:
+        return "USD", 1.0, False
+    if len(found) > 1:
+        # Prefer a non-dollar code: "$" also prefixes CAD, AUD and MXN amounts
+        foreign = sorted(found - {"USD"})
+        return (foreign[0] if foreign else "USD"), _MIXED_CURRENCIES, True
+    return found.pop(), 1.0, True
+
+
+def parse_receipt(
+    lines: list[OcrLine], known_merchants: frozenset[str] = frozenset()
+) -> ReceiptFields:
+    """
+    Extract merchant, total, date and currency from OCR lines by rule.
+
+    Each field's confidence starts from the OCR confidence of the line it came
+    from and is lowered when the rules are unsure, e.g. several different
+    totals, or a total below the subtotal. The receipt's confidence is the
+    lowest field confidence, so a missing field always escalates.
+
+    Guesses are capped at ``GUESS_CONFIDENCE`` unless corroborated:
+    the merchant by a canonical name in *known_merchants*, the currency by a
+    symbol or code on the receipt, and a day/month-ambiguous date by an
+    explicit USD, whose receipts write the month first.
+
+    Args:
+        lines: OCR lines in reading order.
+        known_merchants: Canonical names (``canonicalize_merchant_name``) of
+            merchants already extracted by the LLM.
+
+    Returns:
+        The parsed ``ReceiptFields``.
+    """
+    total, total_confidence = _find_total(lines)
+    date, date_confidence, ambiguous_date = _find_date(lines)
+    merchant, merchant_confidence = _find_merchant(lines)
+    currency, currency_confidence, explicit_currency = _find_currency(lines)
+
+    guesses = []
+    if merchant and canonicalize_merchant_name(merchant) not in known_merchants:
+        guesses.append("business_name")
+    if not explicit_currency:
+        guesses.append("currency")
+    if ambiguous_date and not (explicit_currency and currency == "USD"):
+        guesses.append("date")
+
+    confidence = min(
+        total_confidence, date_confidence, merchant_confidence, currency_confidence
+    )
+    if guesses:
+        confidence = min(confidence, GUESS_CONFIDENCE)
+    return ReceiptFields(
+        business_name=merchant,
+        total=total,
+        date=date,
+        currency=currency,
+        confidence=confidence,
+        guesses=tuple(guesses),
+    )
+
+
+def ocr_lines(img: Image.Image, languages: str = "eng") -> list[OcrLine]:
+    """
+    Run Tesseract and group its words into lines.
+
+    Args:
+        img: Image to read.
+        languages: Tesseract language codes, e.g. ``"eng+fra"``.
+
+    Returns:
+        Non-empty lines in reading order.
+    """
+    # Lazy import: Tesseract is only needed when the OCR tier is enabled
+    import pytesseract
+
+    data = pytesseract.image_to_data(
+        img, lang=languages, output_type=pytesseract.Output.DICT
+    )
+    grouped: dict[tuple[int, int, int], list[tuple[str, float]]] = {}
+    for position, word in enumerate(data["text"]):
+        confidence = float(data["conf"][position])
+        if not str(word).strip() or confidence < 0:
+            continue
+        key = (
+            data["block_num"][position],
+            data["par_num"][position],
+            data["line_num"][position],
+        )
+        grouped.setdefault(key, []).append((str(word).strip(), confidence / 100))
+
+    return [
+        OcrLine(
+            " ".join(word for word, _ in words),
+            sum(confidence for _, confidence in words) / len(words),
+        )
+        for words in grouped.values()
+    ]
+
+
+class ReceiptOcr:
+    """
+    Local OCR tier that reads clean printed receipts without an LLM call.
+
+    Results are accepted when ``ReceiptFields.confidence`` reaches
+    ``min_confidence`` and no field was guessed; callers escalate everything
+    else to the LLM. When
+    Tesseract is not installed the tier disables itself after one warning.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        languages: str = "eng",
+        max_side: int = 2048,
+    ):
+        """
+        Initialize the OCR tier.
+
+        Args:
+            min_confidence: Lowest parser confidence accepted without the LLM.
+            languages: Tesseract language codes.
+            max_side: Longest side of the preprocessed image OCR reads.
+        """
+        self.min_confidence = min_confidence
+        self.languages = languages
+        self.settings = PreprocessSettings(enabled=True, max_side=max_side)
+        self.available = True
+
+    @classmethod
+    def from_config(cls, config: object) -> "ReceiptOcr | None":
+        """
+        Build the tier from the ``ocr`` config block.
+
+        Args:
+            config: Parsed HOCON config.
+
+        Returns:
+            A ``ReceiptOcr``, or ``None`` when ``ocr.enabled`` is false.
+        """
+        if str(config.get("ocr.enabled", False)).lower() != "true":
+            return None
+        return cls(
+            min_confidence=float(
+                config.get("ocr.min_confidence", DEFAULT_MIN_CONFIDENCE)
+            ),
+            languages=str(config.get("ocr.languages", "eng")),
+            max_side=int(config.get("ocr.max_side", 2048)),
+        )
+
+    def accepts(self, fields: ReceiptFields | None) -> bool:
+        """Whether *fields* are corroborated and confident enough to skip the LLM."""
+        return (
+            fields is not None
+            and not fields.guesses
+            and fields.confidence >= self.min_confidence
+        )
+
+    def extract(
+        self, image_path: str, known_merchants: frozenset[str] = frozenset()
+    ) -> ReceiptFields | None:
+        """
+        OCR and parse one receipt image.
+
+        Args:
+            image_path: Path to the receipt image.
+            known_merchants: Canonical merchant names that corroborate the
+                merchant guess; see ``parse_receipt``.
+
+        Returns:
+            The parsed fields, or ``None`` when OCR is unavailable or fails.
+        """
+        if not self.available:
+            return None
+        start = perf_counter()
+        try:
+            lines = ocr_lines(
+                preprocess_image(image_path, self.settings), self.languages
+            )
+        except ImportError as e:
+            self._disable(e)
+            return None
+        except Exception as e:
+            # pytesseract raises TesseractNotFoundError when the binary is missing
+            if type(e).__name__ == "TesseractNotFoundError":
+                self._disable(e)
+            else:
+                print(f"\nWarning: OCR failed for {image_path}: {e}\n")
+            return None
+        fields = parse_receipt(lines, known_merchants)
+        fields.seconds = perf_counter() - start
+        return fields
+
+    def _disable(self, error: Exception):
+        if self.available:
+            print(
+                f"\nWarning: Local OCR unavailable; using the LLM only. Error: {error}\n"
+            )
+        self.available = False
@@ -0,0 +1,169 @@
+import numpy as np
+
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import (
+    connected_components,
+    min_weight_full_bipartite_matching,
+)
+
+
+MATCHING_STRATEGIES = ("greedy", "optimal")
+
+# Totals further apart than this contribute the maximum delta penalty
+DELTA_COST_CAP = 10.0
+
+
+def greedy_assignment(
+    candidates: list[tuple[int, int, int, float]],
+) -> list[tuple[int, int]]:
+    """
+    Resolve candidate pairs one-to-one by taking the best remaining pair first.
+
+    Candidates are ordered by highest similarity, then smallest total delta.
+    Once a transaction or proof index is used it is skipped for later pairs.
+
+    Args:
+        candidates: ``(tx_idx, pr_idx, score, total_delta)`` tuples.
+
+    Returns:
+        Matched ``(tx_idx, pr_idx)`` pairs in the order they were accepted.
+    """
+    ordered = sorted(candidates, key=lambda item: (-item[2], item[3]))
+
+    used_tx_indices: set[int] = set()
+    used_proof_indices: set[int] = set()
+    matched_pairs: list[tuple[int, int]] = []
+
+    for tx_idx, pr_idx, _, _ in ordered:
+        if tx_idx in used_tx_indices or pr_idx in used_proof_indices:
+            continue
+
+        used_tx_indices.add(tx_idx)
+        used_proof_indices.add(pr_idx)
+        matched_pairs.append((tx_idx, pr_idx))
+
+    return matched_pairs
+
+
+def pair_cost(score: float, total_delta: float) -> float:
+    """
+    Combine name similarity and total delta into a single cost in ``[0, 2]``.
+
+    Args:
+        score: Fuzzy name similarity in ``[0, 100]``.
+        total_delta: Absolute difference between totals; ``inf`` when unknown.
+
+    Returns:
+        ``0.0`` for an identical name with identical totals, up to ``2.0``.
+    """
+    delta_cost = min(float(total_delta), DELTA_COST_CAP) / DELTA_COST_CAP
+    return (100.0 - float(score)) / 100.0 + delta_cost
+
+
+def optimal_assignment(
+    candidates: list[tuple[int, int, int, float]],
+) -> list[tuple[int, int]]:
+    """
+    Resolve candidate pairs with a minimum-cost one-to-one assignment.
+
+    The candidate graph is split into connected components (each lies inside a
+    single date block, or a run of blocks within the posting-lag window), and
+    every component is solved independently as a sparse matching, so memory
+    and time follow the number of candidate pairs rather than rows times
+    proofs. Each component first maximises the number of matches and then
+    minimises the combined similarity/delta cost, so an ambiguous pair never
+    blocks two good ones the way a greedy pass can.
+
+    Args:
+        candidates: ``(tx_idx, pr_idx, score, total_delta)`` tuples.
+
+    Returns:
+        Matched ``(tx_idx, pr_idx)`` pairs ordered by transaction, then proof index.
+    """
+    if not candidates:
+        return []
+
+    tx_labels, tx_codes = np.unique(
+        np.asarray([item[0] for item in candidates]), return_inverse=True
+    )
+    pr_labels, pr_codes = np.unique(
+        np.asarray([item[1] for item in candidates]), return_inverse=True
+    )
+    costs = np.asarray([pair_cost(item[2], item[3]) for item in candidates])
+    tx_values, pr_values = tx_labels.tolist(), pr_labels.tolist()
+
+    # Transactions and proofs share one node space: proofs are offset by n_tx
+    n_tx, n_pr = len(tx_labels), len(pr_labels)
+    graph = coo_matrix(
+        (np.ones(len(candidates)), (tx_codes, pr_codes + n_tx)),
+        shape=(n_tx + n_pr, n_tx + n_pr),
+    )
+    _, component_of = connected_components(graph, directed=False)
+    edge_component = component_of[tx_codes]
+
+    matched_pairs: list[tuple[int, int]] = []
+    order = np.argsort(edge_component, kind="stable")
+    boundaries = np.flatnonzero(np.diff(edge_component[order])) + 1
+    for edges in np.split(order, boundaries):
+        rows, row_codes = np.unique(tx_codes[edges], return_inverse=True)
+        cols, col_codes = np.unique(pr_codes[edges], return_inverse=True)
+        for row, col in _sparse_matching(row_codes, col_codes, costs[edges]):
+            matched_pairs.append((tx_values[rows[row]], pr_values[cols[col]]))
+
+    matched_pairs.sort()
+    return matched_pairs
+
+
+def _sparse_matching(
+    row_codes: np.ndarray, col_codes: np.ndarray, costs: np.ndarray
+) -> list[tuple[int, int]]:
+    """
+    Solve one component as a sparse minimum-cost matching that may leave rows out.
+
+    Rows are the component's transactions followed by one dummy per proof, and
+    columns its proofs followed by one dummy per transaction. Each node's dummy
+    edge leaves it unmatched, and each candidate pair has a dummy twin that
+    frees those partners again, so a full matching always exists and the
+    graph stays at ``O(pairs)`` edges. Leaving a pair unmatched costs two dummy
+    edges, which outweighs any total of pair costs, so the solver maximises the
+    match count first and only then minimises pair cost.
+
+    Args:
+        row_codes: Transaction position of each candidate pair, ``0..n_rows-1``.
+        col_codes: Proof position of each candidate pair, ``0..n_cols-1``.
+        costs: ``pair_cost`` of each candidate pair.
+
+    Returns:
+        Matched ``(row, col)`` positions.
+    """
+    n_rows, n_cols, n_edges = row_codes.max() + 1, col_codes.max() + 1, len(costs)
+    unmatched_cost = 2.0 * (min(n_rows, n_cols) + 1)
+    row_nodes, col_nodes = np.arange(n_rows), np.arange(n_cols)
+    # The solver treats stored zeros as missing edges, so every weight is >= 1
+    graph = csr_matrix(
+        (
+            np.concatenate(
+                [
+                    costs + 1.0,
+                    np.full(n_rows, unmatched_cost),
+                    np.full(n_cols, unmatched_cost),
+                    np.ones(n_edges),
+                ]
+            ),
+            (
+                np.concatenate(
+                    [row_codes, row_nodes, n_rows + col_nodes, n_rows + col_codes]
+                ),
+                np.concatenate(
+                    [col_codes, n_cols + row_nodes, col_nodes, n_cols + row_codes]
+                ),
+            ),
+        ),
+        shape=(n_rows + n_cols, n_cols + n_rows),
+    )
+    assigned_rows, assigned_cols = min_weight_full_bipartite_matching(graph)
+    return [
+        (row, col)
+        for row, col in zip(assigned_rows.tolist(), assigned_cols.tolist())
+        if row < n_rows and col < n_cols
+    ]
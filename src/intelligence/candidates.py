@@ -0,0 +1,693 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz as rapid_fuzz
+from rapidfuzz.process import cdist
+
+from src.intelligence.merchant_names import MerchantNameIndex
+from src.intelligence.score_cache import ScoreCache, SparseScores, candidate_key
+
+
+NAME_SCORE_THRESHOLD = 80
+
+# rapidfuzz's partial_ratio searches every alignment fuzzywuzzy's heuristic does,
+# so its score is an upper bound. One point of slack absorbs rounding differences.
+_PREFILTER_SLACK = 1.0
+
+# Shards per worker process; more shards even out uneven date-block sizes
+_SHARDS_PER_WORKER = 4
+
+# Scoring pools live for the whole process, one per worker count. They use the
+# spawn context because validation runs on web job threads, where forking a
+# multi-threaded process can deadlock the child.
+_POOLS: dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _score_unique(
+    tx_unique: np.ndarray,
+    pr_unique: np.ndarray,
+    threshold: int,
+    name_index: MerchantNameIndex | None = None,
+    stats: dict | None = None,
+    aliases: dict[str, set[str]] | None = None,
+) -> np.ndarray:
+    """
+    Score unique transaction names against unique proof names.
+
+    rapidfuzz scores act as a prefilter; only surviving cells are rescored with
+    fuzzywuzzy's ``partial_ratio`` so the final scores are identical to the
+    per-pair path. Without *name_index* the prefilter is one vectorised
+    ``cdist`` call; with it, each transaction name is only compared to proof
+    names sharing a token or trigram. Known *aliases* score ``100`` without
+    being scored at all.
+
+    Args:
+        tx_unique: Unique normalised transaction name keys.
+        pr_unique: Unique normalised proof name keys.
+        threshold: Minimum score kept; cells below it are returned as ``0``.
+        name_index: Optional index covering every name in *pr_unique*.
+        stats: Optional dict whose ``"scorerCalls"`` and ``"aliasHits"``
+            counters are incremented by the name pairs scored and resolved by
+            alias.
+        aliases: Optional mapping of transaction name key to proof name keys
+            learned from accepted recommendations.
+
+    Returns:
+        An ``int`` matrix of shape ``(len(tx_unique), len(pr_unique))``.
+    """
+    cutoff = max(0.0, threshold - _PREFILTER_SLACK)
+
+    alias_cells: set[tuple[int, int]] = set()
+    if aliases:
+        col_of_name = {name: col for col, name in enumerate(pr_unique)}
+        for row, tx_name in enumerate(tx_unique):
+            for alias in aliases.get(tx_name, ()):
+                if alias in col_of_name:
+                    alias_cells.add((row, col_of_name[alias]))
+
+    if name_index is None:
+        upper_bound = cdist(
+            list(tx_unique),
+            list(pr_unique),
+            scorer=rapid_fuzz.partial_ratio,
+            score_cutoff=cutoff,
+        )
+        rows, cols = np.nonzero(upper_bound)
+        scored = upper_bound.size
+    else:
+        # Map index vocabulary ids to this block's proof columns (-1 = absent)
+        col_of_id = np.full(len(name_index.names), -1, dtype=np.int64)
+        col_of_id[[name_index.ids[name] for name in pr_unique]] = np.arange(
+            len(pr_unique)
+        )
+        rows, cols, scored = [], [], 0
+        for row, tx_name in enumerate(tx_unique):
+            shared = name_index.candidates(tx_name)
+            block_cols = (
+                np.arange(len(pr_unique)) if shared is None else col_of_id[shared]
+            )
+            for col in block_cols[block_cols >= 0].tolist():
+                if (row, col) in alias_cells:
+                    continue
+                scored += 1
+                if rapid_fuzz.partial_ratio(
+                    tx_name, pr_unique[col], score_cutoff=cutoff
+                ):
+                    rows.append(row)
+                    cols.append(col)
+
+    if stats is not None:
+        stats["scorerCalls"] = stats.get("scorerCalls", 0) + int(scored)
+        stats["aliasHits"] = stats.get("aliasHits", 0) + len(alias_cells)
+
+    unique_scores = np.zeros((len(tx_unique), len(pr_unique)), dtype=np.int64)
+    for row, col in zip(rows, cols):
+        score = int(fuzz.partial_ratio(tx_unique[row], pr_unique[col]))
+        if score >= threshold:
+            unique_scores[row, col] = score
+    for row, col in alias_cells:
+        unique_scores[row, col] = 100
+
+    return unique_scores
+
+
+def _score_block(
+    tx_names: np.ndarray,
+    pr_names: np.ndarray,
+    threshold: int,
+    name_index: MerchantNameIndex | None = None,
+    stats: dict | None = None,
+    aliases: dict[str, set[str]] | None = None,
+) -> np.ndarray:
+    """
+    Score every transaction/proof name pair within one date block.
+
+    Each unique name pair is scored once by ``_score_unique`` and the result is
+    broadcast back to the block's rows.
+
+    Args:
+        tx_names: Normalised transaction name keys in the block.
+        pr_names: Normalised proof name keys in the block.
+        threshold: Minimum score kept; cells below it are returned as ``0``.
+        name_index: Optional index over every proof name key.
+        stats: Optional dict receiving ``"scorerCalls"`` and ``"aliasHits"``.
+        aliases: Optional learned merchant aliases.
+
+    Returns:
+        An ``int`` matrix of shape ``(len(tx_names), len(pr_names))``.
+    """
+    tx_unique, tx_inverse = np.unique(tx_names, return_inverse=True)
+    pr_unique, pr_inverse = np.unique(pr_names, return_inverse=True)
+    unique_scores = _score_unique(
+        tx_unique, pr_unique, threshold, name_index, stats, aliases
+    )
+    return unique_scores[np.ix_(tx_inverse, pr_inverse)]
+
+
+def _score_shard(
+    blocks: list[tuple[list[str], list[str]]],
+    threshold: int,
+    use_name_index: bool,
+    aliases: dict[str, set[str]] | None,
+) -> tuple[list[tuple[np.ndarray, np.ndarray, np.ndarray]], dict]:
+    """
+    Score a shard of date blocks in a worker process.
+
+    Only unique name keys cross the process boundary; each block gets its own
+    small name index over its proof names.
+
+    Args:
+        blocks: ``(tx_unique, pr_unique)`` name lists, one entry per block.
+        threshold: Minimum name similarity kept.
+        use_name_index: Restrict scoring to names sharing a token or trigram.
+        aliases: Learned aliases for the transaction names in this shard.
+
+    Returns:
+        A tuple ``(hits, stats)``: per block, the sparse ``(rows, cols, scores)``
+        over unique names, and the shard's scorer counters.
+    """
+    stats: dict = {}
+    hits = []
+    for tx_unique, pr_unique in blocks:
+        name_index = MerchantNameIndex(pr_unique) if use_name_index else None
+        unique_scores = _score_unique(
+            np.asarray(tx_unique, dtype=object),
+            np.asarray(pr_unique, dtype=object),
+            threshold,
+            name_index,
+            stats,
+            aliases,
+        )
+        rows, cols = np.nonzero(unique_scores)
+        hits.append((rows, cols, unique_scores[rows, cols]))
+    return hits, stats
+
+
+def _scoring_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared scoring pool for *workers* processes, starting it once.
+
+    Args:
+        workers: Number of worker processes.
+
+    Returns:
+        A long-lived spawn-context ``ProcessPoolExecutor``.
+    """
+    with _POOLS_LOCK:
+        if workers not in _POOLS:
+            _POOLS[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=get_context("spawn")
+            )
+        return _POOLS[workers]
+
+
+def _discard_pool(workers: int, executor: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken scoring pool so the next call starts a fresh one.
+
+    Args:
+        workers: Worker count the pool was cached under.
+        executor: The broken or shut-down pool; a fresh pool another thread
+            already cached in its place is left alone.
+    """
+    with _POOLS_LOCK:
+        if _POOLS.get(workers) is executor:
+            del _POOLS[workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _score_blocks_parallel(
+    blocks: list[tuple[np.ndarray, np.ndarray]],
+    threshold: int,
+    use_name_index: bool,
+    aliases: dict[str, set[str]] | None,
+    workers: int,
+    stats: dict | None,
+) -> list[np.ndarray]:
+    """
+    Score date blocks across a process pool.
+
+    Blocks are split into contiguous shards (a few per worker, to balance
+    uneven block sizes) and merged back in their original order. If the cached
+    pool is broken or shut down, it is replaced and the shards are retried
+    once; should that pool fail as well, they are scored in process.
+
+    Args:
+        blocks: ``(tx_names, pr_names)`` arrays, one entry per block.
+        threshold: Minimum name similarity kept.
+        use_name_index: Restrict scoring to names sharing a token or trigram.
+        aliases: Optional learned merchant aliases.
+        workers: Number of worker processes.
+        stats: Optional dict receiving the merged scorer counters.
+
+    Returns:
+        One score matrix per block, as ``_score_block`` would return it.
+    """
+    uniques = [
+        (
+            np.unique(tx_names, return_inverse=True),
+            np.unique(pr_names, return_inverse=True),
+        )
+        for tx_names, pr_names in blocks
+    ]
+    shard_count = min(len(blocks), workers * _SHARDS_PER_WORKER)
+    shards = np.array_split(np.arange(len(blocks)), shard_count)
+
+    payloads = []
+    for shard in shards:
+        payload = [
+            (uniques[pos][0][0].tolist(), uniques[pos][1][0].tolist()) for pos in shard
+        ]
+        shard_aliases = None
+        if aliases:
+            shard_aliases = {
+                name: aliases[name]
+                for tx_unique, _ in payload
+                for name in tx_unique
+                if name in aliases
+            }
+        payloads.append((payload, threshold, use_name_index, shard_aliases))
+
+    results = None
+    for _ in range(2):
+        executor = _scoring_pool(workers)
+        try:
+            # Submitting to a broken or shut-down pool raises RuntimeError
+            futures = [executor.submit(_score_shard, *args) for args in payloads]
+        except RuntimeError:
+            _discard_pool(workers, executor)
+            continue
+        try:
+            results = [future.result() for future in futures]
+            break
+        except BrokenProcessPool:
+            _discard_pool(workers, executor)
+    if results is None:
+        results = [_score_shard(*args) for args in payloads]
+
+    scores: list[np.ndarray] = []
+    for shard, (hits, shard_stats) in zip(shards, results):
+        if stats is not None:
+            for key, value in shard_stats.items():
+                stats[key] = stats.get(key, 0) + value
+        for pos, (rows, cols, values) in zip(shard, hits):
+            (tx_unique, tx_inverse), (pr_unique, pr_inverse) = uniques[pos]
+            unique_scores = np.zeros((len(tx_unique), len(pr_unique)), np.int64)
+            unique_scores[rows, cols] = values
+            scores.append(unique_scores[np.ix_(tx_inverse, pr_inverse)])
+
+    return scores
+
+
+def _key_days(date_keys: list[str]) -> np.ndarray:
+    """
+    Convert ``YYYY-MM-DD`` date keys to day numbers for window arithmetic.
+
+    Args:
+        date_keys: Date keys as produced by ``Validator._date_keys``.
+
+    Returns:
+        Float array of days since the epoch, ``nan`` for keys that are not dates.
+    """
+    parsed = pd.to_datetime(pd.Index(date_keys), format="%Y-%m-%d", errors="coerce")
+    days = parsed.values.astype("datetime64[D]").astype(np.int64).astype(float)
+    days[parsed.isna()] = np.nan
+    return days
+
+
+def _proof_windows(
+    tx_keys: list[str], pr_keys: list[str], date_window_days: int
+) -> list[tuple[list[str], np.ndarray]]:
+    """
+    Find the proof date blocks that fall inside each transaction block's window.
+
+    Proof block dates are sorted once and each transaction block probes them
+    with two binary searches, so no transaction × proof cross join is built.
+    Keys that are not parseable dates only ever match the identical key.
+
+    Args:
+        tx_keys: Transaction date keys, one per block.
+        pr_keys: Proof date keys, one per block.
+        date_window_days: Maximum allowed posting lag in days, either direction.
+
+    Returns:
+        One ``(proof_keys, day_distances)`` entry per transaction key.
+    """
+    pr_days = _key_days(pr_keys)
+    dated = np.flatnonzero(~np.isnan(pr_days))
+    order = dated[np.argsort(pr_days[dated], kind="stable")]
+    sorted_days = pr_days[order]
+    sorted_keys = [pr_keys[pos] for pos in order]
+    pr_key_set = set(pr_keys)
+
+    windows: list[tuple[list[str], np.ndarray]] = []
+    for tx_key, tx_day in zip(tx_keys, _key_days(tx_keys)):
+        if np.isnan(tx_day) or date_window_days <= 0:
+            keys = [tx_key] if tx_key in pr_key_set else []
+            windows.append((keys, np.zeros(len(keys))))
+            continue
+
+        lo = np.searchsorted(sorted_days, tx_day - date_window_days, side="left")
+        hi = np.searchsorted(sorted_days, tx_day + date_window_days, side="right")
+        windows.append((sorted_keys[lo:hi], np.abs(sorted_days[lo:hi] - tx_day)))
+
+    return windows
+
+
+def _score_candidates(
+    transactions: pd.DataFrame,
+    proofs: pd.DataFrame,
+    tx_names: np.ndarray,
+    pr_names: np.ndarray,
+    threshold: int,
+    date_window_days: int,
+    use_name_index: bool,
+    aliases: dict[str, set[str]] | None,
+    workers: int,
+) -> SparseScores:
+    """
+    Score every name pair within the posting-lag window of each date block.
+
+    Args:
+        transactions: Transactions with a ``date_key`` column.
+        proofs: Proofs with a ``date_key`` column.
+        tx_names: Normalised transaction name keys, in row order.
+        pr_names: Normalised proof name keys, in row order.
+        threshold: Minimum name similarity kept.
+        date_window_days: Maximum posting lag in days between paired dates.
+        use_name_index: Restrict scoring with a ``MerchantNameIndex``.
+        aliases: Optional learned merchant aliases.
+        workers: Worker processes used to score date blocks.
+
+    Returns:
+        ``SparseScores`` over row positions, ordered by date distance, then
+        transaction order, then proof order.
+    """
+    pr_blocks = proofs.groupby("date_key", sort=False).indices
+    tx_blocks = transactions.groupby("date_key", sort=False).indices
+    windows = _proof_windows(list(tx_blocks), list(pr_blocks), date_window_days)
+
+    blocks: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    for tx_pos, (window_keys, window_distances) in zip(tx_blocks.values(), windows):
+        if not window_keys:
+            continue
+
+        block_positions = [pr_blocks[key] for key in window_keys]
+        pr_pos = np.concatenate(block_positions)
+        pr_distance = np.repeat(window_distances, [len(pos) for pos in block_positions])
+        blocks.append((tx_pos, pr_pos, pr_distance))
+
+    stats: dict = {}
+    workers = (os.cpu_count() or 1) if workers <= 0 else workers
+    if workers > 1 and len(blocks) > 1:
+        block_scores = _score_blocks_parallel(
+            [(tx_names[tx_pos], pr_names[pr_pos]) for tx_pos, pr_pos, _ in blocks],
+            threshold,
+            use_name_index,
+            aliases,
+            workers,
+            stats,
+        )
+    else:
+        name_index = MerchantNameIndex(pr_names.tolist()) if use_name_index else None
+        block_scores = [
+            _score_block(
+                tx_names[tx_pos],
+                pr_names[pr_pos],
+                threshold,
+                name_index,
+                stats,
+                aliases,
+            )
+            for tx_pos, pr_pos, _ in blocks
+        ]
+
+    tx_hits: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+    pr_hits: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+    score_hits: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+    distance_hits: list[np.ndarray] = [np.empty(0)]
+    for (tx_pos, pr_pos, pr_distance), scores in zip(blocks, block_scores):
+        rows, cols = np.nonzero(scores)
+        tx_hits.append(tx_pos[rows])
+        pr_hits.append(pr_pos[cols])
+        score_hits.append(scores[rows, cols])
+        distance_hits.append(pr_distance[cols])
+
+    tx_hit = np.concatenate(tx_hits)
+    pr_hit = np.concatenate(pr_hits)
+    score_hit = np.concatenate(score_hits)
+    distance_hit = np.concatenate(distance_hits)
+
+    # Closest dates first so equal-score ties favour the smallest posting lag;
+    # with no window this is a transaction-major scan over both frames.
+    order = np.lexsort((pr_hit, tx_hit, distance_hit))
+    return SparseScores(
+        tx_pos=tx_hit[order].astype(np.int32),
+        pr_pos=pr_hit[order].astype(np.int32),
+        scores=score_hit[order].astype(np.uint8),
+        floor=threshold,
+        scorer_calls=int(stats.get("scorerCalls", 0)),
+        alias_hits=int(stats.get("aliasHits", 0)),
+    )
+
+
+def build_candidates(
+    transactions: pd.DataFrame,
+    proofs: pd.DataFrame,
+    tx_totals: pd.Series,
+    pr_totals: pd.Series,
+    threshold: int = NAME_SCORE_THRESHOLD,
+    date_window_days: int = 0,
+    use_name_index: bool = True,
+    stats: dict | None = None,
+    aliases: dict[str, set[str]] | None = None,
+    workers: int = 1,
+    score_cache: ScoreCache | None = None,
+) -> list[tuple[int, int, int, float]]:
+    """
+    Build candidate (transaction, proof) pairs with close dates and similar names.
+
+    Both sides are grouped by ``date_key`` once. Each transaction date block is
+    scored in a single matrix call against every proof block within
+    *date_window_days*, found by a sorted sweep over block dates. With
+    *use_name_index*, an inverted token/trigram index over the proof names
+    limits scoring to pairs that share at least one token or trigram. With
+    more than one worker, blocks are scored across a long-lived process pool
+    and merged back in order, so the output does not depend on *workers*.
+
+    With a *score_cache*, the sparse scores of the input are kept down to the
+    cache's floor and reused by later calls on the same names and dates, so a
+    different threshold only re-filters them.
+
+    Args:
+        transactions: Transactions with ``name_key`` and ``date_key`` columns.
+        proofs: Proofs with ``name_key`` and ``date_key`` columns.
+        tx_totals: Numeric transaction totals aligned to ``transactions.index``.
+        pr_totals: Numeric proof totals aligned to ``proofs.index``.
+        threshold: Minimum name similarity (0–100) for a pair to be kept.
+        date_window_days: Maximum posting lag in days between paired dates.
+            ``0`` keeps exact ``date_key`` equality.
+        use_name_index: Restrict scoring with a ``MerchantNameIndex``; when
+            ``False`` every name pair in a window is scored.
+        stats: Optional dict that receives ``"scorerCalls"``, ``"aliasHits"``
+            and ``"scoreCacheHits"`` counts.
+        aliases: Optional learned merchant aliases; matching pairs score
+            ``100`` without fuzzy scoring.
+        workers: Worker processes used to score date blocks. ``1`` scores in
+            process; ``0`` or less uses every available CPU.
+        score_cache: Optional cache of scores from earlier calls.
+
+    Returns:
+        List of ``(tx_idx, pr_idx, score, total_delta)`` tuples ordered by date
+        distance, then transaction order, then proof order. ``total_delta`` is
+        ``inf`` when either total is missing.
+    """
+    if transactions.empty or proofs.empty:
+        return []
+
+    tx_names = transactions["name_key"].astype(str).str.strip().str.lower().to_numpy()
+    pr_names = proofs["name_key"].astype(str).str.strip().str.lower().to_numpy()
+
+    key = None
+    entry = None
+    if score_cache is not None:
+        key = candidate_key(
+            tx_names,
+            transactions["date_key"].to_numpy(),
+            pr_names,
+            proofs["date_key"].to_numpy(),
+            {
+                "dateWindowDays": date_window_days,
+                "nameIndex": use_name_index,
+                "aliases": sorted(
+                    [tx_name, sorted(pr_aliases)]
+                    for tx_name, pr_aliases in (aliases or {}).items()
+                ),
+            },
+        )
+        entry = score_cache.get(key, threshold)
+
+    cache_hit = entry is not None
+    if entry is None:
+        entry = _score_candidates(
+            transactions,
+            proofs,
+            tx_names,
+            pr_names,
+            threshold if score_cache is None else min(threshold, score_cache.floor),
+            date_window_days,
+            use_name_index,
+            aliases,
+            workers,
+        )
+        if score_cache is not None:
+            score_cache.put(key, entry)
+
+    if stats is not None:
+        scorer_calls = 0 if cache_hit else entry.scorer_calls
+        stats["scorerCalls"] = stats.get("scorerCalls", 0) + scorer_calls
+        stats["aliasHits"] = stats.get("aliasHits", 0) + entry.alias_hits
+        stats["scoreCacheHits"] = stats.get("scoreCacheHits", 0) + int(cache_hit)
+
+    tx_hit, pr_hit, score_hit = entry.above(threshold)
+    if len(tx_hit) == 0:
+        return []
+
+    tx_amounts = tx_totals.to_numpy(dtype=float)
+    pr_amounts = pr_totals.to_numpy(dtype=float)
+    deltas = np.abs(tx_amounts[tx_hit] - pr_amounts[pr_hit])
+    deltas[np.isnan(deltas)] = np.inf
+
+    tx_labels = transactions.index.to_numpy()[tx_hit]
+    pr_labels = proofs.index.to_numpy()[pr_hit]
+
+    return [
+        (tx_idx, pr_idx, int(score), float(delta))
+        for tx_idx, pr_idx, score, delta in zip(
+            tx_labels.tolist(), pr_labels.tolist(), score_hit.tolist(), deltas.tolist()
+        )
+    ]
+
+
+def exact_match_pairs(
+    transactions: pd.DataFrame,
+    proofs: pd.DataFrame,
+    tx_cents: pd.Series,
+    pr_cents: pd.Series,
+) -> list[tuple[int, int]]:
+    """
+    Pair rows with the same name key, date key and cents by a hash join.
+
+    Such pairs would score ``100`` with a zero delta, so they are accepted
+    without fuzzy scoring. When several rows share a key, the k-th transaction
+    is paired with the k-th proof in frame order and the surplus rows are left
+    for the fuzzy stage. Rows with an empty name or no total never pair here.
+
+    Args:
+        transactions: Transactions with ``name_key`` and ``date_key`` columns.
+        proofs: Proofs with ``name_key`` and ``date_key`` columns.
+        tx_cents: Integer cents aligned to ``transactions.index``.
+        pr_cents: Integer cents aligned to ``proofs.index``.
+
+    Returns:
+        ``(tx_idx, pr_idx)`` index-label pairs in transaction order.
+    """
+    if transactions.empty or proofs.empty:
+        return []
+
+    def keyed(frame: pd.DataFrame, cents: pd.Series) -> pd.DataFrame:
+        keys = pd.DataFrame(
+            {
+                "name": frame["name_key"].astype(str).str.strip().str.lower(),
+                "date": frame["date_key"].astype(str),
+                "cents": cents.astype("Int64"),
+                "label": frame.index,
+            },
+            index=frame.index,
+        )
+        keys = keys[(keys["name"] != "") & keys["cents"].notna()]
+        keys["occurrence"] = keys.groupby(["name", "date", "cents"]).cumcount()
+        return keys
+
+    pairs = keyed(transactions, tx_cents).merge(
+        keyed(proofs, pr_cents),
+        on=["name", "date", "cents", "occurrence"],
+        suffixes=("_tx", "_pr"),
+        sort=False,
+    )
+    return list(zip(pairs["label_tx"].tolist(), pairs["label_pr"].tolist()))
+
+
+def band_join(
+    left_days: np.ndarray,
+    left_cents: np.ndarray,
+    right_days: np.ndarray,
+    right_cents: np.ndarray,
+    max_day_distance: int,
+    max_cent_distance: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pair rows whose dates and amounts both fall inside a band, without a cross join.
+
+    Right-hand rows are sorted once by ``(day, cents)``. For every day offset in
+    the window, each left row probes the matching day bucket with two binary
+    searches over amounts, so memory scales with the surviving pairs only.
+
+    Args:
+        left_days: Integer day numbers for the left rows.
+        left_cents: Integer amounts in cents for the left rows.
+        right_days: Integer day numbers for the right rows.
+        right_cents: Integer amounts in cents for the right rows.
+        max_day_distance: Maximum absolute day difference kept.
+        max_cent_distance: Maximum absolute amount difference kept, in cents.
+
+    Returns:
+        A tuple ``(left_pos, right_pos)`` of positional indices, one entry per pair.
+    """
+    left_days = np.asarray(left_days, dtype=np.int64)
+    left_cents = np.asarray(left_cents, dtype=np.int64)
+    right_days = np.asarray(right_days, dtype=np.int64)
+    right_cents = np.asarray(right_cents, dtype=np.int64)
+
+    if len(left_days) == 0 or len(right_days) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # One sortable int64 key per row: day in the high bits, shifted cents below
+    cent_offset = int(
+        max(np.abs(left_cents).max(), np.abs(right_cents).max()) + max_cent_distance
+    )
+    day_stride = 2 * cent_offset + 1
+
+    order = np.lexsort((right_cents, right_days))
+    right_keys = right_days[order] * day_stride + (right_cents[order] + cent_offset)
+
+    left_hits: list[np.ndarray] = []
+    right_hits: list[np.ndarray] = []
+    for day_offset in range(-max_day_distance, max_day_distance + 1):
+        base = (left_days + day_offset) * day_stride + cent_offset
+        lo = np.searchsorted(right_keys, base + left_cents - max_cent_distance, "left")
+        hi = np.searchsorted(right_keys, base + left_cents + max_cent_distance, "right")
+
+        counts = hi - lo
+        if not counts.any():
+            continue
+
+        left_pos = np.repeat(np.arange(len(left_days)), counts)
+        # Position of each pair inside its [lo, hi) run of sorted right rows
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        within = np.arange(int(counts.sum())) - run_starts
+        left_hits.append(left_pos)
+        right_hits.append(order[np.repeat(lo, counts) + within])
+
+    if not left_hits:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    return np.concatenate(left_hits), np.concatenate(right_hits)
@@ -5,6 +5,7 @@ from time import time
 import pandas as pd
 from google.genai import types
 from src.intelligence.llm_base import LLMBase
+from src.utils.utils import strip_code_fence
 
 
 CATEGORIZE_CATEGORIES = [
@@ -197,26 +198,6 @@ class TransactionCategorizer(LLMBase):
             return 1.0
         return conf
 
-    @staticmethod
-    def _strip_code_fence(text: str) -> str:
-        """
-        Remove a markdown code fence wrapper (``` ... ```) if present.
-
-        Args:
-            text: Raw string that may be wrapped in a triple-backtick fence.
-
-        Returns:
-            The inner content with fence markers and language hint stripped,
-            or the original string if no fence was detected.
-        """
-        stripped = text.strip()
-        if stripped.startswith("```"):
-            lines = stripped.splitlines()
-            # A valid fence has at least an opening line, content, and closing line
-            if len(lines) >= 3:
-                return "\n".join(lines[1:-1]).strip()
-        return stripped
-
     def _categorize_chunk(self, chunk: pd.DataFrame) -> list[dict]:
         """
         Send a single chunk of rows to the LLM and return parsed category assignments.
@@ -266,11 +247,12 @@ class TransactionCategorizer(LLMBase):
 
         if self.primary_client is not None:
             try:
-                response = self.primary_client.models.generate_content(
-                    model=self.primary_model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(**completion_kwargs),
-                )
+                with self.request_slot():
+                    response = self.primary_client.models.generate_content(
+                        model=self.primary_model,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(**completion_kwargs),
+                    )
             except Exception:
                 response = None
 
@@ -286,7 +268,7 @@ class TransactionCategorizer(LLMBase):
         )
 
         raw = str(getattr(response, "text", "") or "").strip()
-        payload_text = self._strip_code_fence(raw)
+        payload_text = strip_code_fence(raw)
 
         try:
             parsed = json.loads(payload_text)
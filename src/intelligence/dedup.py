@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from src.intelligence.candidates import _key_days
+
+DEFAULT_DEDUP_WINDOW_DAYS = 2
+
+
+def _row_days(date_keys: pd.Series, undated: int) -> np.ndarray:
+    """
+    Convert date keys to integer day numbers, using *undated* for non-dates.
+
+    Args:
+        date_keys: ``YYYY-MM-DD`` date keys.
+        undated: Day number given to keys that are not dates.
+
+    Returns:
+        ``int64`` array aligned to *date_keys*.
+    """
+    days = _key_days(date_keys.astype(str).tolist())
+    return np.where(np.isnan(days), undated, days).astype(np.int64)
+
+
+def find_duplicates(
+    name_keys: pd.Series,
+    cents: pd.Series,
+    date_keys: pd.Series,
+    other_name_keys: pd.Series,
+    other_cents: pd.Series,
+    other_date_keys: pd.Series,
+    date_window_days: int = DEFAULT_DEDUP_WINDOW_DAYS,
+) -> np.ndarray:
+    """
+    Find rows that repeat an earlier row of the same frame.
+
+    Rows are grouped by hashing ``(canonical name, cents)`` and sorted by date
+    within each group, so one sweep finds exact duplicates (same date) and
+    near duplicates (within *date_window_days* of the first row of the run,
+    e.g. a pending and a posted line). A run is only collapsed down to as many
+    rows as the other frame has rows of the same name and cents within the
+    run's dates, so genuinely repeated purchases that each have a counterpart
+    are kept. Undated rows only collapse into identical undated rows, and rows
+    without a total are never collapsed.
+
+    Sorting dominates, so the cost is ``O(n log n)`` in the rows of both frames.
+
+    Args:
+        name_keys: Canonical merchant names of the frame to deduplicate.
+        cents: Integer cents aligned to *name_keys*.
+        date_keys: ``YYYY-MM-DD`` date keys aligned to *name_keys*.
+        other_name_keys: Canonical merchant names of the other frame.
+        other_cents: Integer cents of the other frame.
+        other_date_keys: Date keys of the other frame.
+        date_window_days: Largest date distance from the first row of a run
+            that still counts as the same line. ``0`` only collapses exact
+            duplicates.
+
+    Returns:
+        ``int64`` array aligned to the frame: for each collapsed row the
+        position of the row it duplicates, ``-1`` for rows that are kept.
+    """
+    size = len(name_keys)
+    duplicate_of = np.full(size, -1, dtype=np.int64)
+    if size < 2:
+        return duplicate_of
+
+    window = max(0, int(date_window_days))
+    group_codes, _ = pd.factorize(
+        pd.MultiIndex.from_arrays(
+            [
+                pd.concat([name_keys, other_name_keys], ignore_index=True).astype(str),
+                pd.concat([cents, other_cents], ignore_index=True).astype("Int64"),
+            ]
+        ),
+        use_na_sentinel=False,
+    )
+    has_total = pd.concat([cents, other_cents], ignore_index=True).notna().to_numpy()
+
+    dated_days = _key_days(pd.concat([date_keys, other_date_keys]).astype(str).tolist())
+    first_day = 0 if np.isnan(dated_days).all() else int(np.nanmin(dated_days))
+    # Undated rows sit far enough below every date to never join a dated run
+    undated = first_day - window - 1
+    days = _row_days(date_keys, undated)
+    other_days = _row_days(other_date_keys, undated)
+    span = int(np.concatenate([days, other_days]).max()) - undated + 1
+
+    groups, other_groups = group_codes[:size], group_codes[size:]
+    rows = np.flatnonzero(has_total[:size])
+    order = rows[np.lexsort((rows, days[rows], groups[rows]))]
+
+    other_rows = np.flatnonzero(has_total[size:])
+    other_keys = np.sort(
+        other_groups[other_rows].astype(np.int64) * span
+        + (other_days[other_rows] - undated)
+    )
+
+    def collapse(run: list[int]):
+        if len(run) < 2:
+            return
+        base = int(groups[run[0]]) * span - undated
+        counterparts = np.searchsorted(
+            other_keys, base + days[run[-1]], side="right"
+        ) - np.searchsorted(other_keys, base + days[run[0]], side="left")
+        for position in run[max(1, int(counterparts)) :]:
+            duplicate_of[position] = run[0]
+
+    run: list[int] = []
+    for position in order.tolist():
+        if (
+            run
+            and groups[position] == groups[run[0]]
+            and days[position] - days[run[0]] <= window
+        ):
+            run.append(position)
+            continue
+        collapse(run)
+        run = [position]
+    collapse(run)
+
+    return duplicate_of
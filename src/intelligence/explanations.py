@@ -0,0 +1,167 @@
+import numpy as np
+
+
+# How a pair was accepted; stored as a small integer code per pair.
+PAIR_STRATEGIES = ("greedy", "optimal", "alias", "split", "exact")
+
+# Result tables an explained pair can appear in.
+EXPLAINED_TABLES = ("validated_transactions", "discrepancies", "grouped_matches")
+
+# Stored for undated rows, whose date distance is unknown
+UNKNOWN_DISTANCE = -1
+
+
+class MatchExplanations:
+    """
+    Array-backed record of why each accepted pair was matched.
+
+    One entry per accepted ``(transaction, proof)`` pair holds the name
+    similarity score, the total delta, the date distance in days and the
+    strategy that accepted it, plus where the pair sits in ``Results``. Entries
+    are looked up in O(1) by result row or by input rows, so explaining a match
+    never re-runs the fuzzy scorer.
+
+    For split payments there is one entry per part, keyed by the part's row in
+    ``grouped_matches``.
+    """
+
+    def __init__(
+        self,
+        transaction_rows: np.ndarray | list[int] = (),
+        proof_rows: np.ndarray | list[int] = (),
+        scores: np.ndarray | list[int] = (),
+        deltas: np.ndarray | list[float] = (),
+        date_distances: np.ndarray | list[int] = (),
+        strategies: np.ndarray | list[int] = (),
+        tables: np.ndarray | list[int] = (),
+        result_rows: np.ndarray | list[int] = (),
+    ):
+        """
+        Initialize from parallel arrays, one element per explained pair.
+
+        Args:
+            transaction_rows: Transaction row labels of the validated inputs.
+            proof_rows: Proof row labels of the validated inputs.
+            scores: Name similarity scores, ``0``-``100``.
+            deltas: Transaction total minus proof total; ``nan`` if unknown.
+            date_distances: Absolute date distance in days, or
+                ``UNKNOWN_DISTANCE``.
+            strategies: Indexes into ``PAIR_STRATEGIES``.
+            tables: Indexes into ``EXPLAINED_TABLES``.
+            result_rows: Row of the pair within its result table.
+        """
+        self.transaction_rows = np.asarray(transaction_rows, dtype=np.int64)
+        self.proof_rows = np.asarray(proof_rows, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.int16)
+        self.deltas = np.asarray(deltas, dtype=np.float64)
+        self.date_distances = np.asarray(date_distances, dtype=np.int32)
+        self.strategies = np.asarray(strategies, dtype=np.uint8)
+        self.tables = np.asarray(tables, dtype=np.uint8)
+        self.result_rows = np.asarray(result_rows, dtype=np.int64)
+        self._by_result: dict[tuple[int, int], int] | None = None
+        self._by_pair: dict[tuple[int, int], int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.transaction_rows)
+
+    def _entry(self, position: int) -> dict:
+        """Return one entry as a JSON-ready dict."""
+        delta = float(self.deltas[position])
+        distance = int(self.date_distances[position])
+        return {
+            "transactionRow": int(self.transaction_rows[position]),
+            "proofRow": int(self.proof_rows[position]),
+            "score": int(self.scores[position]),
+            "delta": None if np.isnan(delta) else round(delta, 2),
+            "dateDistanceDays": None if distance == UNKNOWN_DISTANCE else distance,
+            "strategy": PAIR_STRATEGIES[self.strategies[position]],
+            "table": EXPLAINED_TABLES[self.tables[position]],
+            "row": int(self.result_rows[position]),
+        }
+
+    def explain(self, table: str, row: int) -> dict | None:
+        """
+        Explain the pair shown at *row* of a result table.
+
+        Args:
+            table: One of ``EXPLAINED_TABLES``.
+            row: Row position within that table.
+
+        Returns:
+            The entry as a dict, or ``None`` when the row has no entry.
+        """
+        if self._by_result is None:
+            self._by_result = {
+                (int(code), int(position)): entry
+                for entry, (code, position) in enumerate(
+                    zip(self.tables, self.result_rows)
+                )
+            }
+        if table not in EXPLAINED_TABLES:
+            return None
+        entry = self._by_result.get((EXPLAINED_TABLES.index(table), int(row)))
+        return None if entry is None else self._entry(entry)
+
+    def explain_pair(self, transaction_row: int, proof_row: int) -> dict | None:
+        """
+        Explain the match between two input rows.
+
+        Args:
+            transaction_row: Transaction row label.
+            proof_row: Proof row label.
+
+        Returns:
+            The entry as a dict, or ``None`` when the rows were not matched.
+        """
+        if self._by_pair is None:
+            self._by_pair = {
+                (int(tx_row), int(pr_row)): entry
+                for entry, (tx_row, pr_row) in enumerate(
+                    zip(self.transaction_rows, self.proof_rows)
+                )
+            }
+        entry = self._by_pair.get((int(transaction_row), int(proof_row)))
+        return None if entry is None else self._entry(entry)
+
+    def to_dict(self) -> dict:
+        """
+        Serialise column-wise for session persistence.
+
+        Returns:
+            JSON-ready dict of equally long lists.
+        """
+        return {
+            "transactionRows": self.transaction_rows.tolist(),
+            "proofRows": self.proof_rows.tolist(),
+            "scores": self.scores.tolist(),
+            "deltas": [
+                None if np.isnan(delta) else delta for delta in self.deltas.tolist()
+            ],
+            "dateDistances": self.date_distances.tolist(),
+            "strategies": self.strategies.tolist(),
+            "tables": self.tables.tolist(),
+            "resultRows": self.result_rows.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict | None) -> "MatchExplanations":
+        """
+        Rebuild explanations saved with ``to_dict``.
+
+        Args:
+            payload: Saved dict; ``None`` or an empty dict gives no entries.
+
+        Returns:
+            A ``MatchExplanations`` instance.
+        """
+        payload = payload or {}
+        return cls(
+            payload.get("transactionRows", []),
+            payload.get("proofRows", []),
+            payload.get("scores", []),
+            [np.nan if delta is None else delta for delta in payload.get("deltas", [])],
+            payload.get("dateDistances", []),
+            payload.get("strategies", []),
+            payload.get("tables", []),
+            payload.get("resultRows", []),
+        )
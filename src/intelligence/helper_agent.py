@@ -9,6 +9,8 @@ import pandas as pd
 from langchain.agents import create_agent
 from langchain_core.tools import BaseTool, tool
 from src.intelligence.llm_base import LLMBase
+from src.intelligence.results import ResultTable
+from src.utils.money import to_cents
 
 
 logger = logging.getLogger(__name__)
@@ -20,12 +22,13 @@ class AgentInput:
 
     Attributes:
         question: Raw user question to answer.
-        validated_rows: Normalized validated transaction rows available for tools.
+        validated_rows: Normalized validated transaction rows available for
+            tools, as records or the columnar ``ResultTable`` of a run.
         chat_history: Optional prior turns in ``{"role", "text"}`` shape.
     """
 
     question: str
-    validated_rows: list[dict[str, Any]]
+    validated_rows: list[dict[str, Any]] | ResultTable
     chat_history: list[dict[str, Any]] | None = None
 
 
@@ -107,7 +110,8 @@ class HelperAgent(LLMBase):
             allow_test_key=True,
         )
         # Will be replaced on each ask/stream_answer call with fresh row data
-        self._validated_rows: list[dict[str, Any]] = []
+        self._validated_rows: list[dict[str, Any]] | ResultTable = []
+        self._validated_frame: pd.DataFrame | None = None
         # Init HelperAgent + tools
         self._agent = create_agent(
             model=self._model,
@@ -165,7 +169,7 @@ class HelperAgent(LLMBase):
             Returns:
                 A text summary of the spending analysis.
             """
-            frame = HelperAgent._to_frame(agent_ref._validated_rows)
+            frame = agent_ref._validated_view()
             if frame.empty:
                 return json.dumps({"status": "no_data"})
 
@@ -211,10 +215,11 @@ class HelperAgent(LLMBase):
                 # Group by category, aggregate, then sort descending to get the top N
                 grouped = (
                     scoped.groupby("Transaction Category", dropna=False)[
-                        "Transaction Total"
+                        "Transaction Total Cents"
                     ]
                     .agg("mean" if method == "average" else "sum")
                     .sort_values(ascending=False)
+                    / 100
                 )
                 top = grouped.head(max(1, top_n))
                 return json.dumps(
@@ -238,11 +243,13 @@ class HelperAgent(LLMBase):
                         "type": "average",
                         "this_month": this_month,
                         "category_filter": category or None,
-                        "value": round(float(scoped["Transaction Total"].mean()), 2),
+                        "value": round(
+                            float(scoped["Transaction Total Cents"].mean()) / 100, 2
+                        ),
                     }
                 )
             else:
-                total = float(scoped["Transaction Total"].sum())
+                total = int(scoped["Transaction Total Cents"].sum()) / 100
                 return json.dumps(
                     {
                         "status": "ok",
@@ -297,7 +304,7 @@ class HelperAgent(LLMBase):
             Returns:
                 A text summary showing both period values and change.
             """
-            frame = HelperAgent._to_frame(agent_ref._validated_rows)
+            frame = agent_ref._validated_view()
             if frame.empty:
                 return json.dumps({"status": "no_data"})
 
@@ -489,10 +496,11 @@ class HelperAgent(LLMBase):
         elif method not in {"sum", "average"}:
             method = "sum"
 
+        # Sum whole cents so long periods do not accumulate float error
         if method == "average":
-            base_value = float(scoped["Transaction Total"].mean())
+            base_value = float(scoped["Transaction Total Cents"].mean()) / 100
         else:
-            base_value = float(scoped["Transaction Total"].sum())
+            base_value = int(scoped["Transaction Total Cents"].sum()) / 100
 
         if not weekly_average:
             return base_value
@@ -502,10 +510,27 @@ class HelperAgent(LLMBase):
             return 0.0
         return base_value / week_count
 
+    def _set_validated_rows(
+        self, validated_rows: list[dict[str, Any]] | ResultTable
+    ) -> None:
+        """Swap in the rows for a new request and drop the cached frame."""
+        self._validated_rows = validated_rows
+        self._validated_frame = None
+
+    def _validated_view(self) -> pd.DataFrame:
+        """Return the current rows as a typed frame, built once per request.
+
+        Every tool call in a request reads the same frame instead of
+        re-converting the rows.
+        """
+        if self._validated_frame is None:
+            self._validated_frame = HelperAgent._to_frame(self._validated_rows)
+        return self._validated_frame
+
     def ask(
         self,
         question: str,
-        validated_rows: list[dict[str, Any]],
+        validated_rows: list[dict[str, Any]] | ResultTable,
         chat_history: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         """
@@ -541,7 +566,7 @@ class HelperAgent(LLMBase):
             Structured ``AgentOutput`` containing answer and run metadata.
         """
         # Refresh the per-request data backing the tool closures.
-        self._validated_rows = payload.validated_rows
+        self._set_validated_rows(payload.validated_rows)
         messages = self._add_context_to_messages(payload.question, payload.chat_history)
 
         # Pass 1: let the tool-calling agent reason and produce tool outputs.
@@ -592,7 +617,7 @@ class HelperAgent(LLMBase):
     def stream_answer(
         self,
         question: str,
-        validated_rows: list[dict[str, Any]],
+        validated_rows: list[dict[str, Any]] | ResultTable,
         chat_history: list[dict[str, Any]] | None = None,
     ) -> Iterator[str]:
         """
@@ -611,7 +636,7 @@ class HelperAgent(LLMBase):
             Incremental text tokens that together form the complete answer.
         """
         # Make the current transaction data available to the tool closure
-        self._validated_rows = validated_rows
+        self._set_validated_rows(validated_rows)
         yielded_any = False
         messages = self._add_context_to_messages(question, chat_history)
 
@@ -843,25 +868,39 @@ class HelperAgent(LLMBase):
         return False
 
     @staticmethod
-    def _to_frame(validated_rows: list[dict[str, Any]]) -> pd.DataFrame:
+    def _to_frame(
+        validated_rows: list[dict[str, Any]] | ResultTable,
+    ) -> pd.DataFrame:
         """
         Normalize validated-row records into a typed DataFrame ready for analysis.
 
         Ensures the four expected columns are always present, coerces numeric and
         date columns to their proper dtypes, and drops rows where either value
-        could not be parsed (which would make aggregation unreliable).
+        could not be parsed (which would make aggregation unreliable). Totals
+        are also converted once to integer ``Transaction Total Cents``, which
+        every aggregation sums.
 
         Args:
-            validated_rows: List of transaction dicts as stored in the session.
-                Each dict should contain ``Transaction Business Name``,
+            validated_rows: List of transaction dicts as stored in the session,
+                or the columnar ``validated_transactions`` table of a run. Each
+                row should contain ``Transaction Business Name``,
                 ``Transaction Total``, ``Transaction Date``, and
-                ``Transaction Category`` keys.
+                ``Transaction Category``.
 
         Returns:
-            A clean DataFrame with the four expected columns, or an empty
-            DataFrame with those columns if *validated_rows* is empty/invalid.
+            A clean DataFrame with the four expected columns plus the cents
+            column, or an empty DataFrame with those columns if
+            *validated_rows* is empty/invalid.
         """
-        if not isinstance(validated_rows, list) or not validated_rows:
+        if isinstance(validated_rows, ResultTable):
+            # Columnar rows skip the dict round trip entirely
+            frame = validated_rows.to_frame()
+        elif isinstance(validated_rows, list) and validated_rows:
+            frame = pd.DataFrame(validated_rows)
+        else:
+            frame = pd.DataFrame()
+
+        if frame.empty:
             return pd.DataFrame(
                 [],
                 columns=[
@@ -869,11 +908,10 @@ class HelperAgent(LLMBase):
                     "Transaction Total",
                     "Transaction Date",
                     "Transaction Category",
+                    "Transaction Total Cents",
                 ],
             )
 
-        frame = pd.DataFrame(validated_rows).copy()
-
         # Guarantee all expected columns exist even if some rows omit them
         for col in [
             "Transaction Business Name",
@@ -897,6 +935,11 @@ class HelperAgent(LLMBase):
             frame["Transaction Category"].fillna("Other").astype(str)
         )
 
+        frame["Transaction Total Cents"] = to_cents(frame["Transaction Total"])
+
         # Drop rows where essential numeric/date values are unparseable
-        frame = frame.dropna(subset=["Transaction Total", "Transaction Date"])
+        frame = frame.dropna(subset=["Transaction Total Cents", "Transaction Date"])
+        frame["Transaction Total Cents"] = frame["Transaction Total Cents"].astype(
+            "int64"
+        )
         return frame
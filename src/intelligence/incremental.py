@@ -0,0 +1,353 @@
+import hashlib
+import json
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.intelligence.candidates import _key_days
+from src.intelligence.split_payments import SplitMatch
+
+
+MATCH_STATE_VERSION = 4
+
+
+@dataclass
+class IncrementalPlan:
+    """
+    What an incremental run can reuse from the previous run of a session.
+
+    Attributes:
+        kept_pairs: Previous ``(tx_idx, pr_idx)`` matches whose rows and date
+            blocks are unchanged, as index labels of the current frames.
+        kept_details: ``(score, strategy)`` each kept pair was accepted with,
+            aligned to *kept_pairs*.
+        kept_groups: Previous split payments whose rows and date blocks are
+            unchanged, with index labels of the current frames.
+        rematch_transactions: Boolean mask of transactions to re-match.
+        rematch_proofs: Boolean mask of proofs to re-match.
+        transaction_categories: Previously assigned categories aligned to the
+            current transactions, ``None`` for new rows.
+        proof_categories: Previously assigned categories aligned to the
+            current proofs, ``None`` for new rows.
+    """
+
+    kept_pairs: list[tuple[int, int]]
+    kept_details: list[tuple[int, str]]
+    kept_groups: list[SplitMatch]
+    rematch_transactions: np.ndarray
+    rematch_proofs: np.ndarray
+    transaction_categories: pd.Series
+    proof_categories: pd.Series
+
+
+def row_keys(frame: pd.DataFrame, date_keys: pd.Series) -> pd.Series:
+    """
+    Build a stable content key for every input row.
+
+    The key hashes the stripped business name, the total rounded to cents, the
+    normalised date key and the currency. Identical rows are told apart by an
+    occurrence counter so duplicates keep distinct keys.
+
+    Args:
+        frame: Transactions or proofs with ``business_name`` and ``total``
+            columns, and optionally ``currency``.
+        date_keys: ``YYYY-MM-DD`` date keys aligned to *frame*.
+
+    Returns:
+        Series of ``"<hash>-<occurrence>"`` strings aligned to *frame*.
+    """
+    if frame.empty:
+        return pd.Series([], index=frame.index, dtype=object)
+
+    totals = pd.to_numeric(frame["total"], errors="coerce").round(2)
+    currency = (
+        frame["currency"].astype(str).str.strip().str.upper()
+        if "currency" in frame.columns
+        else pd.Series("", index=frame.index)
+    )
+    content = pd.DataFrame(
+        {
+            "business_name": frame["business_name"].astype(str).str.strip(),
+            "total": totals.map(lambda value: f"{value:.2f}"),
+            "date": date_keys.astype(str),
+            "currency": currency,
+        },
+        index=frame.index,
+    )
+
+    hashes = pd.util.hash_pandas_object(content, index=False)
+    occurrence = hashes.groupby(hashes).cumcount()
+    return hashes.map(lambda value: f"{value:016x}") + "-" + occurrence.astype(str)
+
+
+def settings_fingerprint(settings: dict) -> str:
+    """
+    Hash the matching settings a previous run's pairs depend on.
+
+    Args:
+        settings: JSON-serialisable matching settings.
+
+    Returns:
+        Hex digest that changes whenever any setting changes.
+    """
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _affected(
+    date_keys: pd.Series, changed_keys: set[str], date_window_days: int
+) -> np.ndarray:
+    """
+    Flag rows whose date block lies within the window of a changed date.
+
+    Args:
+        date_keys: Date keys of the rows to test.
+        changed_keys: Date keys of rows that were added or removed.
+        date_window_days: Posting-lag window used for matching.
+
+    Returns:
+        Boolean mask aligned to *date_keys*.
+    """
+    mask = date_keys.isin(changed_keys).to_numpy()
+    if date_window_days <= 0 or not changed_keys or date_keys.empty:
+        return mask
+
+    changed_days = _key_days(sorted(changed_keys))
+    changed_days = np.sort(changed_days[~np.isnan(changed_days)])
+    if len(changed_days) == 0:
+        return mask
+
+    days = _key_days(date_keys.tolist())
+    # Distance to the nearest changed day via the two neighbours in sorted order
+    right = np.clip(np.searchsorted(changed_days, days), 0, len(changed_days) - 1)
+    left = np.clip(right - 1, 0, len(changed_days) - 1)
+    nearest = np.minimum(
+        np.abs(changed_days[right] - days), np.abs(changed_days[left] - days)
+    )
+    return mask | (nearest <= date_window_days)
+
+
+def plan_incremental(
+    previous: dict | None,
+    fingerprint: str,
+    tx_keys: pd.Series,
+    pr_keys: pd.Series,
+    tx_dates: pd.Series,
+    pr_dates: pd.Series,
+    date_window_days: int,
+    aliases: list[tuple[str, str]] | None = None,
+    tx_names: pd.Series | None = None,
+    pr_names: pd.Series | None = None,
+) -> IncrementalPlan | None:
+    """
+    Diff the current inputs against a previous run's match state.
+
+    Rows are compared by content key. A row whose canonical name gained or
+    lost a learned alias since the previous run counts as changed too. Date
+    blocks within the posting-lag window of any changed row are re-matched in
+    full, together with the previous partners of their rows; every other
+    previous pair and split payment is kept as is.
+
+    Rows freed in that region may pair with previously unmatched rows up to
+    twice the window away, so those are re-matched as well. The plan is still
+    an approximation of a full run: a previously matched row outside the
+    region keeps its partner even where a full greedy pass would have chosen
+    differently.
+
+    Args:
+        previous: Match state saved by a previous run, as built by
+            ``build_match_state``.
+        fingerprint: Settings fingerprint of the current run.
+        tx_keys: Content keys of the current transactions.
+        pr_keys: Content keys of the current proofs.
+        tx_dates: Date keys of the current transactions.
+        pr_dates: Date keys of the current proofs.
+        date_window_days: Posting-lag window used for matching.
+        aliases: ``(transaction_name, proof_name)`` learned aliases between
+            names of the current inputs, as saved by ``build_match_state``.
+        tx_names: Canonical names of the current transactions; required with
+            *aliases*.
+        pr_names: Canonical names of the current proofs; required with
+            *aliases*.
+
+    Returns:
+        An ``IncrementalPlan``, or ``None`` when there is no usable previous
+        state (missing, another version, or different matching settings).
+    """
+    if not isinstance(previous, dict):
+        return None
+    if previous.get("version") != MATCH_STATE_VERSION:
+        return None
+    if previous.get("fingerprint") != fingerprint:
+        return None
+
+    prev_tx = previous.get("transactions", {})
+    prev_pr = previous.get("proofs", {})
+
+    changed_dates: set[str] = set()
+    for keys, dates, prev_rows in (
+        (tx_keys, tx_dates, prev_tx),
+        (pr_keys, pr_dates, prev_pr),
+    ):
+        current = set(keys)
+        changed_dates.update(dates[~keys.isin(prev_rows.keys())].astype(str))
+        changed_dates.update(
+            row["date"] for key, row in prev_rows.items() if key not in current
+        )
+
+    changed_aliases = set(map(tuple, previous.get("aliases", []))) ^ set(aliases or [])
+    if changed_aliases:
+        changed_dates.update(
+            tx_dates[tx_names.isin({name for name, _ in changed_aliases})].astype(str)
+        )
+        changed_dates.update(
+            pr_dates[pr_names.isin({name for _, name in changed_aliases})].astype(str)
+        )
+
+    rematch_tx = _affected(tx_dates, changed_dates, date_window_days)
+    rematch_pr = _affected(pr_dates, changed_dates, date_window_days)
+
+    # Freed partners reach unmatched rows up to a window beyond the region
+    pairs = previous.get("pairs", [])
+    groups = previous.get("groups", [])
+    settled_tx = {pair[0] for pair in pairs}
+    settled_pr = {pair[1] for pair in pairs}
+    for tx_group, pr_group, _ in groups:
+        settled_tx.update(tx_group)
+        settled_pr.update(pr_group)
+    rematch_tx |= (
+        _affected(tx_dates, changed_dates, 2 * date_window_days)
+        & ~tx_keys.isin(settled_tx).to_numpy()
+    )
+    rematch_pr |= (
+        _affected(pr_dates, changed_dates, 2 * date_window_days)
+        & ~pr_keys.isin(settled_pr).to_numpy()
+    )
+
+    tx_label = dict(zip(tx_keys, tx_keys.index))
+    pr_label = dict(zip(pr_keys, pr_keys.index))
+    tx_pos = {label: pos for pos, label in enumerate(tx_keys.index)}
+    pr_pos = {label: pos for pos, label in enumerate(pr_keys.index)}
+
+    # A re-matched row frees its old partner, which must be re-matched too
+    prev_pairs = [
+        (tx_pos[tx_label[tx_key]], pr_pos[pr_label[pr_key]], (int(score), strategy))
+        for tx_key, pr_key, score, strategy in pairs
+        if tx_key in tx_label and pr_key in pr_label
+    ]
+    for tx_at, pr_at, _ in prev_pairs:
+        if rematch_tx[tx_at] or rematch_pr[pr_at]:
+            rematch_tx[tx_at] = rematch_pr[pr_at] = True
+
+    # A split payment is kept whole or all of its rows are re-matched
+    prev_groups = [
+        (
+            [tx_pos[tx_label[key]] for key in tx_group],
+            [pr_pos[pr_label[key]] for key in pr_group],
+            [int(score) for score in scores],
+        )
+        for tx_group, pr_group, scores in groups
+        if all(key in tx_label for key in tx_group)
+        and all(key in pr_label for key in pr_group)
+    ]
+    for tx_at, pr_at, _ in prev_groups:
+        if rematch_tx[tx_at].any() or rematch_pr[pr_at].any():
+            rematch_tx[tx_at] = True
+            rematch_pr[pr_at] = True
+
+    kept = [
+        ((tx_keys.index[tx_at], pr_keys.index[pr_at]), details)
+        for tx_at, pr_at, details in prev_pairs
+        if not rematch_tx[tx_at]
+    ]
+
+    return IncrementalPlan(
+        kept_pairs=[pair for pair, _ in kept],
+        kept_details=[details for _, details in kept],
+        kept_groups=[
+            SplitMatch(
+                tx_keys.index[tx_at].tolist(), pr_keys.index[pr_at].tolist(), scores
+            )
+            for tx_at, pr_at, scores in prev_groups
+            if not rematch_tx[tx_at].any()
+        ],
+        rematch_transactions=rematch_tx,
+        rematch_proofs=rematch_pr,
+        transaction_categories=tx_keys.map(
+            lambda key: prev_tx.get(key, {}).get("category")
+        ),
+        proof_categories=pr_keys.map(lambda key: prev_pr.get(key, {}).get("category")),
+    )
+
+
+def build_match_state(
+    fingerprint: str,
+    tx_keys: pd.Series,
+    pr_keys: pd.Series,
+    tx_dates: pd.Series,
+    pr_dates: pd.Series,
+    tx_categories: pd.Series | None,
+    pr_categories: pd.Series | None,
+    matched_pairs: list[tuple[int, int]],
+    pair_details: list[tuple[int, str]],
+    aliases: list[tuple[str, str]] | None = None,
+    split_groups: list[SplitMatch] | None = None,
+) -> dict:
+    """
+    Build the JSON-serialisable match state an incremental run diffs against.
+
+    Args:
+        fingerprint: Settings fingerprint of this run.
+        tx_keys: Content keys of the transactions.
+        pr_keys: Content keys of the proofs.
+        tx_dates: Date keys of the transactions.
+        pr_dates: Date keys of the proofs.
+        tx_categories: Assigned transaction categories, or ``None`` when
+            categorization was skipped.
+        pr_categories: Assigned proof categories, or ``None``.
+        matched_pairs: Final ``(tx_idx, pr_idx)`` matches as index labels.
+        pair_details: ``(score, strategy)`` per matched pair, kept so later
+            runs can explain kept pairs without rescoring them.
+        aliases: Learned aliases between names of the inputs, so the next run
+            can re-match rows whose aliases changed.
+        split_groups: Split payments found by this run, as index labels.
+
+    Returns:
+        Dict with ``version``, ``fingerprint``, per-row ``transactions`` and
+        ``proofs`` entries keyed by content key, matched ``pairs`` as
+        ``[tx_key, pr_key, score, strategy]``, split payment ``groups`` as
+        ``[tx_keys, pr_keys, scores]`` and ``aliases`` as
+        ``[transaction_name, proof_name]``.
+    """
+
+    def rows(keys: pd.Series, dates: pd.Series, categories: pd.Series | None):
+        category_values = (
+            [None] * len(keys) if categories is None else categories.tolist()
+        )
+        return {
+            key: {"date": str(date), "category": category}
+            for key, date, category in zip(
+                keys.tolist(), dates.tolist(), category_values
+            )
+        }
+
+    return {
+        "version": MATCH_STATE_VERSION,
+        "fingerprint": fingerprint,
+        "transactions": rows(tx_keys, tx_dates, tx_categories),
+        "proofs": rows(pr_keys, pr_dates, pr_categories),
+        "pairs": [
+            [str(tx_keys.loc[tx_idx]), str(pr_keys.loc[pr_idx]), int(score), strategy]
+            for (tx_idx, pr_idx), (score, strategy) in zip(matched_pairs, pair_details)
+        ],
+        "groups": [
+            [
+                [str(tx_keys.loc[tx_idx]) for tx_idx in group.transaction_indices],
+                [str(pr_keys.loc[pr_idx]) for pr_idx in group.proof_indices],
+                [int(score) for score in group.scores],
+            ]
+            for group in split_groups or []
+        ],
+        "aliases": [list(alias) for alias in aliases or []],
+    }
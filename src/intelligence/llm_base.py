@@ -1,4 +1,6 @@
 import os
+import threading
+from contextlib import contextmanager
 from functools import lru_cache
 from typing import Any, Iterator
 
@@ -18,6 +20,9 @@ class LLMBase:
     and lightweight streaming helpers for Gemini-backed components.
     """
 
+    # Process-wide cap on concurrent Gemini requests; None leaves them unbounded
+    _request_slots: threading.BoundedSemaphore | None = None
+
     def __init__(
         self,
         llm_config_path: str,
@@ -65,6 +70,37 @@ class LLMBase:
         """
         return ConfigFactory.parse_file(config_path)
 
+    @staticmethod
+    def limit_concurrent_requests(limit: int | None) -> None:
+        """
+        Cap concurrent Gemini requests across every component in this process.
+
+        Requests wrapped in ``request_slot()`` wait for a free slot, so parallel
+        validation jobs cannot oversubscribe the API quota.
+
+        Args:
+            limit: Maximum requests in flight; ``None`` or ``0`` removes the cap.
+        """
+        LLMBase._request_slots = (
+            threading.BoundedSemaphore(limit) if limit and limit > 0 else None
+        )
+
+    @staticmethod
+    @contextmanager
+    def request_slot() -> Iterator[None]:
+        """
+        Hold one of the ``limit_concurrent_requests`` slots for a request.
+
+        Yields:
+            Nothing; the slot is released when the block exits.
+        """
+        slots = LLMBase._request_slots
+        if slots is None:
+            yield
+            return
+        with slots:
+            yield
+
     @staticmethod
     def resolve_api_key(allow_test_key: bool = False) -> str:
         """
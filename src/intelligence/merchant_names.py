@@ -0,0 +1,263 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+# Card processors and POS vendors put their own tag in front of the merchant,
+# e.g. "SQ *BLUE BOTTLE" (Square) or "TST* TARTINE" (Toast).
+PROCESSOR_PREFIX_PATTERN = re.compile(
+    r"^(?:(?:pos|debit card|checkcard|card)\s+purchase\s+)?"
+    r"(?:(?:[a-z]{2,3}|paypal)\s*\*\s*)?"
+)
+
+# Store numbers such as "#1234", "no 12" or "store 88" mark the point where
+# statement descriptors switch from the merchant to its location.
+STORE_NUMBER_PATTERN = re.compile(r"^(?:#\d+|no\d+|store\d+)$")
+STORE_NUMBER_MARKERS = frozenset({"no", "store"})
+
+# A bare number is only a store number in a processor descriptor or right
+# before a location suffix; elsewhere it is part of the name ("Cafe 1905").
+BARE_NUMBER_PATTERN = re.compile(r"^\d{3,}$")
+
+US_STATE_CODES = frozenset(
+    "al ak az ar ca co ct de fl ga hi id il in ia ks ky la me md ma mi mn ms mo "
+    "mt ne nv nh nj nm ny nc nd oh ok or pa ri sc sd tn tx ut vt va wa wv wi wy "
+    "dc".split()
+)
+
+KNOWN_CITY_SUFFIXES = (
+    ("new", "york"),
+    ("brooklyn",),
+    ("los", "angeles"),
+    ("san", "francisco"),
+    ("san", "jose"),
+    ("san", "diego"),
+    ("oakland",),
+    ("seattle",),
+    ("portland",),
+    ("chicago",),
+    ("boston",),
+    ("austin",),
+    ("houston",),
+    ("dallas",),
+    ("denver",),
+    ("miami",),
+    ("atlanta",),
+    ("philadelphia",),
+    ("washington",),
+    ("las", "vegas"),
+)
+
+CANONICAL_CACHE_SIZE = 8192
+
+# Names this short share too few trigrams to be indexed reliably
+_MIN_INDEXED_LENGTH = 3
+
+
+def _strip_city_suffix(tokens: list[str]) -> list[str]:
+    """
+    Drop a trailing known city, optionally followed by a US state code.
+
+    Args:
+        tokens: Lowercased merchant tokens.
+
+    Returns:
+        The tokens without the location suffix, never fewer than one token.
+    """
+    body = tokens[:-1] if len(tokens) > 1 and tokens[-1] in US_STATE_CODES else tokens
+    for city in KNOWN_CITY_SUFFIXES:
+        if len(body) > len(city) and tuple(body[-len(city) :]) == city:
+            return body[: -len(city)]
+    return tokens
+
+
+def _fold_accents(text: str) -> str:
+    """Decompose *text* with NFKD and drop the combining marks."""
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    )
+
+
+def _is_store_number(tokens: list[str], position: int, prefixed: bool) -> bool:
+    """
+    Tell whether the token at *position* starts the store-number tail.
+
+    Args:
+        tokens: Lowercased merchant tokens.
+        position: Position of the token to test.
+        prefixed: Whether the name carried a processor prefix.
+
+    Returns:
+        ``True`` for ``#123``-style tokens, a number after ``no``/``store``,
+        and, in prefixed descriptors, any bare number of three or more digits.
+    """
+    token = tokens[position]
+    if STORE_NUMBER_PATTERN.match(token):
+        return True
+    following = tokens[position + 1] if position + 1 < len(tokens) else ""
+    if token in STORE_NUMBER_MARKERS and following.isdigit():
+        return True
+    return prefixed and bool(BARE_NUMBER_PATTERN.match(token))
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonicalize_merchant_name(raw: str) -> str:
+    """
+    Reduce a noisy statement or receipt merchant name to a canonical form.
+
+    Folds accents (``"Café Münster"`` becomes ``"cafe munster"``), strips
+    processor prefixes (``"SQ *"``, ``"TST*"``, ``"PAYPAL *"``), trailing
+    ``*reference`` codes, store numbers and everything after them, and a
+    trailing known city/state suffix. For example
+    ``"SQ *BLUE BOTTLE 1234 SAN FRANCISCO"`` becomes ``"blue bottle"``, while
+    a number that is part of the name, as in ``"Cafe 1905"``, is kept.
+
+    Results are cached per unique raw name.
+
+    Args:
+        raw: Raw business name.
+
+    Returns:
+        The canonical lowercase name, or the stripped lowercase raw name when
+        canonicalisation would leave nothing.
+    """
+    fallback = str(raw).strip().lower()
+    folded = _fold_accents(fallback)
+    name = PROCESSOR_PREFIX_PATTERN.sub("", folded, count=1)
+    prefixed = len(name) < len(folded)
+    # Anything after an embedded "*" is a processor reference, not the merchant
+    name = name.split("*", 1)[0] if "*" in name.lstrip("*") else name.lstrip("*")
+    name = name.replace("'", "").replace("’", "")
+
+    tokens = re.findall(r"#?[^\W_]+", name)
+    for position in range(1, len(tokens)):
+        if _is_store_number(tokens, position, prefixed):
+            tokens = tokens[:position]
+            break
+    tokens = [token.lstrip("#") for token in tokens]
+    tokens = [token for token in tokens if token]
+
+    if len(tokens) > 1:
+        located = _strip_city_suffix(tokens)
+        # A number right before the location is the store's
+        if (
+            len(located) < len(tokens)
+            and len(located) > 1
+            and BARE_NUMBER_PATTERN.match(located[-1])
+        ):
+            located = located[:-1]
+        tokens = located
+
+    return " ".join(tokens) or fallback
+
+
+def canonicalize_names(values: pd.Series) -> pd.Series:
+    """
+    Canonicalise a Series of merchant names, once per unique raw value.
+
+    Args:
+        values: Series of raw business names.
+
+    Returns:
+        Series of canonical names aligned to *values*.
+    """
+    raw = values.astype(str)
+    unique_raw = raw.unique()
+    canonical = {name: canonicalize_merchant_name(name) for name in unique_raw}
+    return raw.map(canonical)
+
+
+def canonical_cache_info() -> dict[str, int]:
+    """Return size and hit/miss counters for the canonical-name cache."""
+    info = canonicalize_merchant_name.cache_info()
+    return {
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+    }
+
+
+def name_grams(name: str) -> set[str]:
+    """
+    Return the word tokens and character trigrams used to index a name.
+
+    Trigrams are taken with spaces removed so ``"bluebottle"`` and
+    ``"blue bottle"`` still share keys.
+
+    Args:
+        name: Canonical merchant name.
+
+    Returns:
+        Set of index keys; tokens are prefixed ``"t:"`` and trigrams ``"g:"``.
+    """
+    compact = name.replace(" ", "")
+    grams = {f"t:{token}" for token in name.split() if len(token) > 1}
+    grams.update(f"g:{compact[i : i + 3]}" for i in range(len(compact) - 2))
+    return grams
+
+
+class MerchantNameIndex:
+    """
+    Inverted token/trigram index over a fixed vocabulary of merchant names.
+
+    Used to restrict fuzzy scoring to proof names that share at least one word
+    token or character trigram with the transaction name. Names too short to
+    carry a trigram are compared against everything.
+    """
+
+    def __init__(self, names: list[str]):
+        """
+        Build the index.
+
+        Args:
+            names: Canonical merchant names; duplicates are collapsed.
+        """
+        self.names = np.asarray(sorted(set(names)), dtype=object)
+        self.ids = {name: position for position, name in enumerate(self.names)}
+
+        postings: dict[str, list[int]] = {}
+        unindexed: list[int] = []
+        for position, name in enumerate(self.names):
+            if len(name.replace(" ", "")) < _MIN_INDEXED_LENGTH:
+                unindexed.append(position)
+                continue
+            for gram in name_grams(name):
+                postings.setdefault(gram, []).append(position)
+
+        self.postings = {
+            gram: np.asarray(ids, dtype=np.int64) for gram, ids in postings.items()
+        }
+        self.unindexed = np.asarray(unindexed, dtype=np.int64)
+        self._lookups: dict[str, np.ndarray] = {}
+
+    def candidates(self, name: str) -> np.ndarray | None:
+        """
+        Look up vocabulary ids that share a token or trigram with *name*.
+
+        Lookups are memoised per name since every date block repeats them.
+
+        Args:
+            name: Canonical name to look up.
+
+        Returns:
+            Sorted array of vocabulary ids, or ``None`` when *name* is too
+            short to index and must be compared against every name.
+        """
+        if len(name.replace(" ", "")) < _MIN_INDEXED_LENGTH:
+            return None
+
+        if name not in self._lookups:
+            hits = [
+                self.postings[gram]
+                for gram in name_grams(name)
+                if gram in self.postings
+            ]
+            hits.append(self.unindexed)
+            self._lookups[name] = np.unique(np.concatenate(hits))
+        return self._lookups[name]
@@ -0,0 +1,290 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.intelligence.explanations import MatchExplanations
+
+# Result fields are stored snake_case; these are the names shown to users.
+DISPLAY_NAMES = {
+    "transaction_business_name": "Transaction Business Name",
+    "transaction_total": "Transaction Total",
+    "transaction_date": "Transaction Date",
+    "transaction_category": "Transaction Category",
+    "proof_business_name": "Proof Business Name",
+    "proof_total": "Proof Total",
+    "proof_date": "Proof Date",
+    "proof_category": "Proof Category",
+    "delta": "Delta",
+    "result": "Result",
+    "business_name": "Business Name",
+    "total": "Total",
+    "date": "Date",
+    "category": "Category",
+    "group": "Group",
+    "side": "Side",
+    "duplicate_of": "Duplicate Of",
+    "duplicate_kind": "Duplicate Kind",
+}
+
+FIELD_NAMES = {display: field for field, display in DISPLAY_NAMES.items()}
+
+RESULT_TABLES = (
+    "validated_transactions",
+    "discrepancies",
+    "unmatched_transactions",
+    "unmatched_proofs",
+    "grouped_matches",
+    "duplicates",
+)
+
+
+class ResultTable:
+    """
+    Column-oriented result rows keyed by snake_case field name.
+
+    Each field is one NumPy array. The display-named DataFrame and the JSON
+    records are only built when first requested and are then cached, so each
+    consumer pays for the projection it uses and nothing else. Callers get
+    copies of the cache, never the cache itself.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray] | None = None):
+        """
+        Initialize the table.
+
+        Args:
+            columns: Mapping of field name to equally long arrays.
+
+        Raises:
+            ValueError: If the columns differ in length.
+        """
+        self.columns = {
+            field: np.asarray(values) for field, values in (columns or {}).items()
+        }
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Result columns must all have the same length.")
+        self._length = lengths.pop() if lengths else 0
+        self._frame: pd.DataFrame | None = None
+        self._records: list[dict[str, Any]] | None = None
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame | None) -> "ResultTable":
+        """
+        Build a table from a DataFrame with snake_case or display column names.
+
+        Args:
+            frame: Source rows; ``None`` gives an empty table.
+
+        Returns:
+            A ``ResultTable`` holding the frame's columns as arrays.
+        """
+        if frame is None:
+            return cls()
+        return cls(
+            {
+                FIELD_NAMES.get(str(column), str(column)): frame[column].to_numpy()
+                for column in frame.columns
+            }
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def fields(self) -> list[str]:
+        """Field names in column order."""
+        return list(self.columns)
+
+    @property
+    def empty(self) -> bool:
+        """Whether the table has no rows."""
+        return self._length == 0
+
+    def take(self, selector: np.ndarray) -> "ResultTable":
+        """
+        Select rows by boolean mask or positions.
+
+        Args:
+            selector: Boolean mask or integer positions.
+
+        Returns:
+            A new ``ResultTable`` with the selected rows.
+        """
+        return ResultTable(
+            {field: values[selector] for field, values in self.columns.items()}
+        )
+
+    def _display_frame(self) -> pd.DataFrame:
+        """
+        Return the cached display-named DataFrame, building it on first use.
+
+        Returns:
+            The shared frame, with a fresh ``RangeIndex``; never hand it out.
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {
+                    DISPLAY_NAMES.get(field, field): values
+                    for field, values in self.columns.items()
+                },
+                index=pd.RangeIndex(self._length),
+            )
+        return self._frame
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the rows as a DataFrame with display column names.
+
+        The frame is built once; each call gets its own copy, so callers such
+        as UI session state may mutate it freely.
+
+        Returns:
+            DataFrame with a fresh ``RangeIndex``.
+        """
+        return self._display_frame().copy()
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """
+        Return the rows as JSON-ready dicts keyed by display name.
+
+        Missing values (``NaN``, ``NaT``, ``None``, ``pd.NA``) become ``None``.
+        The records are built once; each call gets a fresh list of fresh dicts.
+
+        Returns:
+            One dict per row.
+        """
+        if self._records is None:
+            names = [DISPLAY_NAMES.get(field, field) for field in self.columns]
+            cells = []
+            for values in self.columns.values():
+                items = (
+                    list(pd.DatetimeIndex(values))
+                    if values.dtype.kind == "M"
+                    else values.tolist()
+                )
+                missing = pd.isna(values).tolist()
+                cells.append(
+                    [None if gone else item for item, gone in zip(items, missing)]
+                )
+            self._records = [dict(zip(names, row)) for row in zip(*cells)]
+        return [dict(record) for record in self._records]
+
+    def to_csv(self, path_or_buf: Any = None) -> str | None:
+        """
+        Write the rows as CSV with display column names.
+
+        Args:
+            path_or_buf: File path or buffer; ``None`` returns the CSV text.
+
+        Returns:
+            The CSV text when *path_or_buf* is ``None``, else ``None``.
+        """
+        return self._display_frame().to_csv(path_or_buf, index=False)
+
+
+class _DisplayFrame:
+    """Expose one of ``Results.tables`` as its display-named DataFrame."""
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, results: "Results | None", owner: type | None = None):
+        if results is None:
+            return self
+        return results.tables[self.name].to_frame()
+
+    def __set__(self, results: "Results", value: object):
+        results.tables[self.name] = (
+            value if isinstance(value, ResultTable) else ResultTable.from_frame(value)
+        )
+
+
+class Results:
+    """
+    Container for all outputs produced by a single validation run.
+
+    Every output is held in ``tables`` as a columnar ``ResultTable`` with
+    snake_case fields. The attributes below are display-named DataFrame views
+    built on first access; use ``records()`` or ``to_csv()`` to project
+    straight to JSON rows or CSV without going through them.
+
+    Attributes:
+        validated_transactions: Rows where transaction and proof amounts matched exactly.
+        discrepancies: Matched pairs where the totals differed (non-zero delta).
+        unmatched_transactions: Transactions that could not be paired with any proof.
+        unmatched_proofs: Proofs that could not be paired with any transaction.
+        grouped_matches: Split payments, one row per grouped transaction or
+            proof, tagged with a ``Group`` number and a ``Side``.
+        duplicates: Rows collapsed by the dedup stage, tagged with a ``Side``,
+            the input row they repeat and whether they were exact or near
+            duplicates.
+        explanations: Score, delta, date distance and strategy of every
+            accepted pair, indexed by result row.
+    """
+
+    validated_transactions = _DisplayFrame()
+    discrepancies = _DisplayFrame()
+    unmatched_transactions = _DisplayFrame()
+    unmatched_proofs = _DisplayFrame()
+    grouped_matches = _DisplayFrame()
+    duplicates = _DisplayFrame()
+
+    def __init__(
+        self,
+        validated_transactions: pd.DataFrame | ResultTable = None,
+        discrepancies: pd.DataFrame | ResultTable = None,
+        unmatched_transactions: pd.DataFrame | ResultTable = None,
+        unmatched_proofs: pd.DataFrame | ResultTable = None,
+        grouped_matches: pd.DataFrame | ResultTable = None,
+        duplicates: pd.DataFrame | ResultTable = None,
+        explanations: MatchExplanations | None = None,
+    ):
+        self.tables: dict[str, ResultTable] = {}
+        self.validated_transactions = validated_transactions
+        self.discrepancies = discrepancies
+        self.unmatched_transactions = unmatched_transactions
+        self.unmatched_proofs = unmatched_proofs
+        self.grouped_matches = grouped_matches
+        self.duplicates = duplicates
+        self.explanations = (
+            MatchExplanations() if explanations is None else explanations
+        )
+
+    def table(self, name: str) -> ResultTable:
+        """
+        Return one output in columnar form.
+
+        Args:
+            name: One of ``RESULT_TABLES``.
+
+        Returns:
+            The ``ResultTable`` for *name*.
+        """
+        return self.tables[name]
+
+    def records(self, name: str) -> list[dict[str, Any]]:
+        """
+        Return one output as JSON-ready dicts keyed by display name.
+
+        Args:
+            name: One of ``RESULT_TABLES``.
+
+        Returns:
+            One dict per row, with missing values as ``None``.
+        """
+        return self.tables[name].to_records()
+
+    def to_csv(self, name: str, path_or_buf: Any = None) -> str | None:
+        """
+        Write one output as CSV with display column names.
+
+        Args:
+            name: One of ``RESULT_TABLES``.
+            path_or_buf: File path or buffer; ``None`` returns the CSV text.
+
+        Returns:
+            The CSV text when *path_or_buf* is ``None``, else ``None``.
+        """
+        return self.tables[name].to_csv(path_or_buf)
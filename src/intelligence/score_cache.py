@@ -0,0 +1,162 @@
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+
+# Scores are cached down to this floor so nearby thresholds never rescore
+DEFAULT_SCORE_FLOOR = 70
+
+DEFAULT_CACHE_MB = 64
+
+
+@dataclass
+class SparseScores:
+    """
+    Name scores of every candidate pair of one input at or above a floor.
+
+    Pairs are stored in ``build_candidates`` order (date distance, then
+    transaction, then proof), so filtering by a threshold keeps that order.
+
+    Attributes:
+        tx_pos: Transaction positions within the scored frame.
+        pr_pos: Proof positions within the scored frame.
+        scores: Name similarity of each pair, ``floor``-``100``.
+        floor: Lowest threshold the entry can answer.
+        scorer_calls: Fuzzy scorer calls it took to build the entry.
+        alias_hits: Pairs resolved by a learned alias.
+    """
+
+    tx_pos: np.ndarray
+    pr_pos: np.ndarray
+    scores: np.ndarray
+    floor: int
+    scorer_calls: int = 0
+    alias_hits: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays."""
+        return self.tx_pos.nbytes + self.pr_pos.nbytes + self.scores.nbytes
+
+    def above(self, threshold: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Select the pairs scoring at least *threshold*.
+
+        Args:
+            threshold: Minimum name similarity, not below ``floor``.
+
+        Returns:
+            A tuple ``(tx_pos, pr_pos, scores)`` in stored order.
+        """
+        keep = self.scores >= threshold
+        return self.tx_pos[keep], self.pr_pos[keep], self.scores[keep]
+
+
+def candidate_key(
+    tx_names: np.ndarray,
+    tx_dates: np.ndarray,
+    pr_names: np.ndarray,
+    pr_dates: np.ndarray,
+    settings: dict,
+) -> str:
+    """
+    Hash everything candidate scores depend on, except the threshold.
+
+    Args:
+        tx_names: Normalised transaction name keys, in row order.
+        tx_dates: Transaction date keys, in row order.
+        pr_names: Normalised proof name keys, in row order.
+        pr_dates: Proof date keys, in row order.
+        settings: JSON-serialisable scoring settings (window, name index,
+            aliases).
+
+    Returns:
+        Hex digest identifying the input.
+    """
+    digest = hashlib.sha256()
+    for names, dates in ((tx_names, tx_dates), (pr_names, pr_dates)):
+        rows = pd.DataFrame({"name": names, "date": dates}).astype(str)
+        digest.update(len(rows).to_bytes(8, "little"))
+        digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ScoreCache:
+    """
+    Size-bounded LRU of ``SparseScores`` keyed by ``candidate_key``.
+
+    Re-running a session with a different threshold then only re-filters the
+    cached scores. Entries are answered for any threshold at or above their
+    floor; a lower threshold rescores and replaces the entry.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024,
+        floor: int = DEFAULT_SCORE_FLOOR,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Total array memory kept before the least recently used
+                entries are evicted.
+            floor: Lowest score cached for a run at a higher threshold.
+        """
+        self.max_bytes = max_bytes
+        self.floor = floor
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, SparseScores] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, threshold: int) -> SparseScores | None:
+        """
+        Look up the scores of an input.
+
+        Args:
+            key: ``candidate_key`` of the input.
+            threshold: Threshold of the run.
+
+        Returns:
+            The cached entry, or ``None`` when missing or built at a floor
+            above *threshold*.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.floor > threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: SparseScores):
+        """
+        Store the scores of an input, evicting old entries over ``max_bytes``.
+
+        Args:
+            key: ``candidate_key`` of the input.
+            entry: Scores to keep.
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
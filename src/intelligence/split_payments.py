@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from itertools import combinations
+
+import pandas as pd
+
+
+DEFAULT_MAX_PARTS = 3
+
+# Only the nearest-dated parts are searched, which bounds the subset search at
+# C(n, k/2) sums per side no matter how busy a merchant is.
+_MAX_CANDIDATE_PARTS = 16
+
+
+@dataclass
+class SplitMatch:
+    """
+    One many-to-one match found by the split-payment pass.
+
+    Exactly one of the two lists holds a single row: either one transaction
+    paid by several receipts, or one receipt paid in several swipes.
+
+    Attributes:
+        transaction_indices: Index labels of the grouped transactions.
+        proof_indices: Index labels of the grouped proofs.
+        scores: Name similarity between the single row and each part, in the
+            order of the many side's indices.
+    """
+
+    transaction_indices: list[int]
+    proof_indices: list[int]
+    scores: list[int]
+
+
+def _subset_summing_to(
+    amounts: list[int], target: int, size: int
+) -> tuple[int, ...] | None:
+    """
+    Find *size* amounts that add up to *target* by meeting in the middle.
+
+    The first half of each subset is enumerated against a table of sums of the
+    second half, so the search costs ``C(n, size // 2) + C(n, size - size // 2)``
+    lookups instead of ``C(n, size)``.
+
+    Args:
+        amounts: Candidate amounts in integer cents, in preference order.
+        target: Amount the subset must add up to exactly.
+        size: Number of amounts in the subset.
+
+    Returns:
+        Positions into *amounts* in ascending order, or ``None``. Among several
+        solutions the lexicographically smallest (most preferred) one wins.
+    """
+    ordered = sorted(amounts)
+    if sum(ordered[:size]) > target or sum(ordered[-size:]) < target:
+        return None
+
+    left_size = size // 2
+    right_sums: dict[int, list[tuple[int, ...]]] = {}
+    for right in combinations(range(len(amounts)), size - left_size):
+        right_sums.setdefault(sum(amounts[i] for i in right), []).append(right)
+
+    for left in combinations(range(len(amounts)), left_size):
+        need = target - sum(amounts[i] for i in left)
+        for right in right_sums.get(need, ()):
+            # Halves are kept disjoint and counted once by ordering them
+            if right[0] > left[-1]:
+                return left + right
+    return None
+
+
+def find_split_payments(
+    candidates: list[tuple[int, int, int, float]],
+    tx_cents: pd.Series,
+    pr_cents: pd.Series,
+    max_parts: int = DEFAULT_MAX_PARTS,
+) -> list[SplitMatch]:
+    """
+    Group rows left unmatched by the one-to-one pass into split payments.
+
+    A transaction is grouped with 2..*max_parts* proofs (or a proof with that
+    many transactions) when their cents add up exactly. Parts must be candidate
+    pairs of the group's single row, i.e. the same merchant within the
+    posting-lag window. Smaller groups are formed first; within a size,
+    transactions are tried before proofs and nearer-dated parts are preferred.
+
+    Args:
+        candidates: ``(tx_idx, pr_idx, score, total_delta)`` tuples between the
+            unmatched rows, ordered by date distance as ``build_candidates``
+            returns them.
+        tx_cents: Integer cents of the transactions, indexed by label.
+        pr_cents: Integer cents of the proofs, indexed by label.
+        max_parts: Largest number of rows allowed on the many side.
+
+    Returns:
+        Non-overlapping ``SplitMatch`` groups.
+    """
+    tx_amounts = {label: int(cents) for label, cents in tx_cents.dropna().items()}
+    pr_amounts = {label: int(cents) for label, cents in pr_cents.dropna().items()}
+
+    tx_parts: dict[int, list[int]] = {}
+    pr_parts: dict[int, list[int]] = {}
+    scores: dict[tuple[int, int], int] = {}
+    for tx_idx, pr_idx, score, _ in candidates:
+        if tx_idx in tx_amounts and pr_idx in pr_amounts:
+            tx_parts.setdefault(tx_idx, []).append(pr_idx)
+            pr_parts.setdefault(pr_idx, []).append(tx_idx)
+            scores[tx_idx, pr_idx] = score
+
+    used_tx: set[int] = set()
+    used_pr: set[int] = set()
+    groups: list[SplitMatch] = []
+
+    for size in range(2, max_parts + 1):
+        for parts_of, target_amounts, part_amounts, used_targets, used_parts, is_tx in (
+            (tx_parts, tx_amounts, pr_amounts, used_tx, used_pr, True),
+            (pr_parts, pr_amounts, tx_amounts, used_pr, used_tx, False),
+        ):
+            for target, neighbours in parts_of.items():
+                if target in used_targets:
+                    continue
+                goal = target_amounts[target]
+                # Parts are positive and each strictly smaller than the whole
+                parts = [
+                    part
+                    for part in neighbours
+                    if part not in used_parts and 0 < part_amounts[part] < goal
+                ][:_MAX_CANDIDATE_PARTS]
+                if len(parts) < size:
+                    continue
+
+                found = _subset_summing_to(
+                    [part_amounts[part] for part in parts], goal, size
+                )
+                if found is None:
+                    continue
+
+                grouped = [parts[i] for i in found]
+                used_targets.add(target)
+                used_parts.update(grouped)
+                if is_tx:
+                    part_scores = [scores[target, part] for part in grouped]
+                    groups.append(SplitMatch([target], grouped, part_scores))
+                else:
+                    part_scores = [scores[part, target] for part in grouped]
+                    groups.append(SplitMatch(grouped, [target], part_scores))
+
+    return groups
@@ -0,0 +1,378 @@
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from pyhocon import ConfigFactory
+
+from src.data.database import DataBase
+from src.intelligence.categorize import TransactionCategorizer
+from src.intelligence.results import ResultTable
+from src.intelligence.validator import Results, Validator
+from src.utils.dates import parse_dates
+
+
+INPUT_COLUMNS = ["business_name", "total", "date", "currency"]
+
+
+def _as_frame(batch: object) -> pd.DataFrame:
+    """
+    Convert one input batch to a DataFrame.
+
+    Args:
+        batch: A ``pd.DataFrame``, anything exposing ``to_pandas()`` (Arrow
+            ``RecordBatch``/``Table``), or records accepted by ``pd.DataFrame``.
+
+    Returns:
+        The batch as a DataFrame with a fresh ``RangeIndex``.
+    """
+    if isinstance(batch, pd.DataFrame):
+        frame = batch
+    elif hasattr(batch, "to_pandas"):
+        frame = batch.to_pandas()
+    else:
+        frame = pd.DataFrame(batch)
+    return frame.reset_index(drop=True)
+
+
+def _day_numbers(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Return each row's date as a float day number, ``nan`` when unparseable.
+
+    Args:
+        frame: Rows with a ``date`` column.
+
+    Returns:
+        Float array aligned to *frame*.
+    """
+    parsed = parse_dates(frame["date"])
+    days = parsed.values.astype("datetime64[D]").astype(np.int64).astype(float)
+    days[parsed.isna().to_numpy()] = np.nan
+    return days
+
+
+class _SideBuffer:
+    """
+    Buffered rows from one input stream plus its date watermark.
+
+    The watermark is the latest date read so far; because the stream is date
+    ordered, no future row can be dated before it. ``positions`` holds each
+    buffered row's zero-based position in the whole stream.
+    """
+
+    def __init__(self, batches: Iterable, label: str):
+        self.batches = iter(batches)
+        self.label = label
+        self.frame = pd.DataFrame(columns=INPUT_COLUMNS)
+        self.days = np.empty(0)
+        self.positions = np.empty(0, dtype=np.int64)
+        self.read = 0
+        self.head = -np.inf
+        self.done = False
+
+    def pull(self, categorize) -> None:
+        """
+        Read the next non-empty batch, or mark the stream as exhausted.
+
+        Args:
+            categorize: Callable that adds a ``category`` column to a batch.
+
+        Raises:
+            ValueError: If the batch is dated before rows already read.
+        """
+        for batch in self.batches:
+            frame = _as_frame(batch)
+            if frame.empty:
+                continue
+
+            days = _day_numbers(frame)
+            dated = days[~np.isnan(days)]
+            if len(dated) and dated.min() < self.head:
+                raise ValueError(
+                    f"{self.label} must be ordered by date; got a batch starting "
+                    "before rows already read."
+                )
+
+            frame = categorize(frame)
+            self.frame = (
+                frame
+                if self.frame.empty
+                else pd.concat([self.frame, frame], ignore_index=True)
+            )
+            self.days = np.concatenate([self.days, days])
+            self.positions = np.concatenate(
+                [self.positions, np.arange(self.read, self.read + len(frame))]
+            )
+            self.read += len(frame)
+            if len(dated):
+                self.head = max(self.head, float(dated.max()))
+            return
+
+        self.done = True
+        self.head = np.inf
+
+    def take(self, mask: np.ndarray) -> pd.DataFrame:
+        """
+        Remove and return the rows selected by *mask*.
+
+        Args:
+            mask: Boolean mask over the buffered rows.
+
+        Returns:
+            The removed rows with a fresh ``RangeIndex``.
+        """
+        taken = self.frame[mask].reset_index(drop=True)
+        self.frame = self.frame[~mask].reset_index(drop=True)
+        self.days = self.days[~mask]
+        self.positions = self.positions[~mask]
+        return taken
+
+
+class StreamingValidator:
+    """
+    Validate date-ordered transaction and proof streams with bounded memory.
+
+    Both inputs are consumed batch by batch, always advancing the stream whose
+    latest date is behind. Once both streams have moved past a date (plus the
+    posting-lag window), transactions up to it can no longer gain candidates:
+    they are matched against the proofs still open and emitted as a ``Results``
+    partition. Proofs that have fallen out of every future transaction's
+    window are closed and reported as unmatched in that partition.
+
+    With ``date_window_days = 0`` the partitions add up to exactly what
+    ``Validator.validate`` returns for the full inputs. With a wider window,
+    earlier transactions get the first claim on open proofs.
+
+    When dedup is enabled, a proof is only reported as a duplicate once it
+    closes, since until then a later transaction may still be its
+    counterpart. Duplicate proofs whose kept row already left the buffer stay
+    unmatched instead. ``duplicate_of`` in each partition refers to the kept
+    row's position in its whole input stream.
+
+    Rows without a parseable date have no place in the date order, so they
+    stay buffered until both streams end and are matched in the final
+    partition. Memory is only bounded when undated rows are rare;
+    ``matching_summary["peakUndatedRows"]`` reports how many were held.
+    """
+
+    def __init__(
+        self,
+        config_path: str = "config/config.conf",
+        parsed_config: object | None = None,
+        database: DataBase | None = None,
+    ):
+        """
+        Initialize the streaming validator.
+
+        Args:
+            config_path: Path to the HOCON app config file. Ignored when
+                *parsed_config* is supplied.
+            parsed_config: Pre-parsed config object.
+            database: Optional database holding learned merchant aliases.
+        """
+        self.config = (
+            parsed_config
+            if parsed_config is not None
+            else ConfigFactory.parse_file(config_path)
+        )
+        self.database = database
+        self.categorize_failed = False
+        self.matching_summary: dict = {
+            "partitions": 0,
+            "matchedPairs": 0,
+            "peakOpenProofs": 0,
+            "peakUndatedRows": 0,
+            "splitGroups": 0,
+        }
+        self.merchant_aliases: dict[str, set[str]] = {}
+        self._categorizers: dict[str, TransactionCategorizer | None] = {}
+
+    def _categorize(self, frame: pd.DataFrame, side: str) -> pd.DataFrame:
+        """
+        Categorize one incoming batch once, as it is read.
+
+        Args:
+            frame: Incoming batch.
+            side: ``"transactions"`` or ``"proofs"``; one categorizer per side.
+
+        Returns:
+            *frame* with a ``category`` column, or unchanged when it already has
+            one or categorization failed.
+        """
+        if self.categorize_failed or "category" in frame.columns:
+            return frame
+
+        try:
+            if side not in self._categorizers:
+                self._categorizers[side] = TransactionCategorizer(self.config)
+            return self._categorizers[side].categorize_dataframe(frame).frame
+        except Exception as e:
+            print(f"Warning: Categorization failed and was skipped. Error: {e}")
+            self.categorize_failed = True
+            return frame
+
+    def _flush(
+        self,
+        transactions: _SideBuffer,
+        proofs: _SideBuffer,
+        cutoff: float,
+        window: int,
+    ) -> Results | None:
+        """
+        Match and emit every transaction dated before *cutoff*.
+
+        Args:
+            transactions: Transaction buffer.
+            proofs: Proof buffer; matched and closed proofs are removed.
+            cutoff: Day number before which transactions are final. ``inf``
+                flushes everything, including undated rows.
+            window: Posting-lag window in days.
+
+        Returns:
+            A ``Results`` partition, or ``None`` when there is nothing to emit.
+        """
+        final = cutoff == np.inf
+        tx_mask = transactions.days < cutoff
+        if final:
+            tx_mask = np.ones(len(transactions.days), dtype=bool)
+        # No remaining or future transaction can reach proofs this far back
+        closing = proofs.days < cutoff - window
+        if final:
+            closing = np.ones(len(proofs.days), dtype=bool)
+
+        if not tx_mask.any() and not closing.any():
+            return None
+
+        columns = list(
+            dict.fromkeys([*transactions.frame.columns, *proofs.frame.columns])
+        )
+        tx_positions = transactions.positions[tx_mask]
+        pr_positions = proofs.positions
+        tx_part = transactions.take(tx_mask).reindex(columns=columns)
+        open_proofs = proofs.frame.reindex(columns=columns)
+
+        validator = Validator(
+            tx_part,
+            open_proofs,
+            parsed_config=self.config,
+            merchant_aliases=self.merchant_aliases,
+            verbose=False,
+        )
+        results = validator.validate(date_window_days=window, categorize=False)
+
+        matched = np.zeros(len(open_proofs), dtype=bool)
+        matched[[pr_idx for _, pr_idx in validator.matched_pairs]] = True
+        for group in validator.split_groups:
+            matched[group.proof_indices] = True
+        collapsed = validator.pr_duplicate_of >= 0
+        # unmatched_proofs lists the open proofs neither matched nor collapsed
+        results.unmatched_proofs = results.table("unmatched_proofs").take(
+            closing[~(matched | collapsed)]
+        )
+        results.duplicates = self._stream_duplicates(
+            results.table("duplicates"),
+            validator,
+            closing,
+            tx_positions,
+            pr_positions,
+        )
+        proofs.take(matched | closing)
+
+        self.matching_summary["partitions"] += 1
+        self.matching_summary["matchedPairs"] += len(validator.matched_pairs)
+        self.matching_summary["splitGroups"] += len(validator.split_groups)
+        return results
+
+    @staticmethod
+    def _stream_duplicates(
+        duplicates: ResultTable,
+        validator: Validator,
+        closing: np.ndarray,
+        tx_positions: np.ndarray,
+        pr_positions: np.ndarray,
+    ) -> ResultTable:
+        """
+        Keep the duplicates a partition can report and point them at stream rows.
+
+        Args:
+            duplicates: The partition's duplicates table, transactions first.
+            validator: The validator that produced the partition.
+            closing: Mask of open proofs closed by this partition.
+            tx_positions: Stream positions of the partition's transactions.
+            pr_positions: Stream positions of the open proofs.
+
+        Returns:
+            Collapsed transactions and closing proofs, with ``duplicate_of`` as
+            the kept row's position in its input stream.
+        """
+        tx_rows = np.flatnonzero(validator.tx_duplicate_of >= 0)
+        pr_rows = np.flatnonzero(validator.pr_duplicate_of >= 0)
+        keep = np.concatenate([np.ones(len(tx_rows), dtype=bool), closing[pr_rows]])
+        kept_at = np.concatenate(
+            [
+                tx_positions[validator.tx_duplicate_of[tx_rows]],
+                pr_positions[validator.pr_duplicate_of[pr_rows]],
+            ]
+        )
+        kept = duplicates.take(keep)
+        return ResultTable({**kept.columns, "duplicate_of": kept_at[keep]})
+
+    def validate_stream(
+        self,
+        transactions: Iterable,
+        proofs: Iterable,
+        date_window_days: int | None = None,
+    ) -> Iterator[Results]:
+        """
+        Validate two date-ordered streams, yielding ``Results`` partitions.
+
+        Args:
+            transactions: Iterable of transaction batches (DataFrames, Arrow
+                record batches, or lists of row dicts), ordered by date.
+            proofs: Iterable of proof batches, ordered by date.
+            date_window_days: Maximum posting lag in days. Defaults to
+                ``matching.date_window_days`` from config.
+
+        Yields:
+            One ``Results`` per flushed date range. Every transaction and every
+            proof appears in exactly one partition; undated rows appear in the
+            last one.
+
+        Raises:
+            ValueError: If either stream is not ordered by date.
+        """
+        if date_window_days is None:
+            date_window_days = int(self.config.get("matching.date_window_days", 0))
+        window = max(0, int(date_window_days))
+        # Aliases are loaded once; every partition matches with the same set
+        if self.database is not None:
+            self.merchant_aliases = self.database.load_merchant_aliases()
+
+        tx_buffer = _SideBuffer(transactions, "transactions")
+        pr_buffer = _SideBuffer(proofs, "proofs")
+
+        while not (tx_buffer.done and pr_buffer.done):
+            # Advance the stream that is behind so both buffers stay short
+            if not tx_buffer.done and (
+                pr_buffer.done or tx_buffer.head <= pr_buffer.head
+            ):
+                tx_buffer.pull(lambda frame: self._categorize(frame, "transactions"))
+            else:
+                pr_buffer.pull(lambda frame: self._categorize(frame, "proofs"))
+
+            self.matching_summary["peakOpenProofs"] = max(
+                self.matching_summary["peakOpenProofs"], len(pr_buffer.days)
+            )
+            self.matching_summary["peakUndatedRows"] = max(
+                self.matching_summary["peakUndatedRows"],
+                int(np.isnan(tx_buffer.days).sum() + np.isnan(pr_buffer.days).sum()),
+            )
+
+            watermark = min(tx_buffer.head, pr_buffer.head)
+            partition = self._flush(tx_buffer, pr_buffer, watermark - window, window)
+            if partition is not None:
+                yield partition
+
+        partition = self._flush(tx_buffer, pr_buffer, np.inf, window)
+        if partition is not None:
+            yield partition
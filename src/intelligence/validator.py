@@ -1,41 +1,68 @@
 import numpy as np
 import pandas as pd
 from time import time
-from dataclasses import dataclass
-import re
 from concurrent.futures import ThreadPoolExecutor
 
 from pyhocon import ConfigFactory
 
 from fuzzywuzzy import process, fuzz
+from src.data.database import DataBase
+from src.intelligence.assignment import (
+    MATCHING_STRATEGIES,
+    greedy_assignment,
+    optimal_assignment,
+)
+from src.intelligence.candidates import (
+    NAME_SCORE_THRESHOLD,
+    _key_days,
+    band_join,
+    build_candidates,
+    exact_match_pairs,
+)
 from src.intelligence.categorize import TransactionCategorizer
+from src.intelligence.dedup import DEFAULT_DEDUP_WINDOW_DAYS, find_duplicates
+from src.intelligence.explanations import (
+    EXPLAINED_TABLES,
+    PAIR_STRATEGIES,
+    UNKNOWN_DISTANCE,
+    MatchExplanations,
+)
+from src.intelligence.incremental import (
+    build_match_state,
+    plan_incremental,
+    row_keys,
+    settings_fingerprint,
+)
+from src.intelligence.merchant_names import (
+    canonicalize_merchant_name,
+    canonicalize_names,
+)
+from src.intelligence.results import Results
+from src.intelligence.score_cache import ScoreCache
+from src.intelligence.split_payments import (
+    DEFAULT_MAX_PARTS,
+    SplitMatch,
+    find_split_payments,
+)
+from src.utils.money import CENTS_COLUMN, frame_cents, from_cents, to_cents
+from src.utils.dates import normalize_date, parse_dates
 
 pd.set_option("display.max_columns", None)
 
+# Minimum name similarity (0-1) for recommending an unmatched pairing
+RECOMMENDATION_SIMILARITY = 0.65
 
-@dataclass
-class Results:
-    """
-    Container for all outputs produced by a single validation run.
-
-    Attributes:
-        validated_transactions: Rows where transaction and proof amounts matched exactly.
-        discrepancies: Matched pairs where the totals differed (non-zero delta).
-        unmatched_transactions: Transactions that could not be paired with any proof.
-        unmatched_proofs: Proofs that could not be paired with any transaction.
-    """
-
-    def __init__(
-        self,
-        validated_transactions: pd.DataFrame = None,
-        discrepancies: pd.DataFrame = None,
-        unmatched_transactions: pd.DataFrame = None,
-        unmatched_proofs: pd.DataFrame = None,
-    ):
-        self.validated_transactions = validated_transactions
-        self.discrepancies = discrepancies
-        self.unmatched_transactions = unmatched_transactions
-        self.unmatched_proofs = unmatched_proofs
+# Suffixed columns of a transaction/proof merge and the result fields they become
+MERGED_FIELDS = {
+    "business_name_transaction": "transaction_business_name",
+    "total_transaction": "transaction_total",
+    "date_transaction": "transaction_date",
+    "category_transaction": "transaction_category",
+    "business_name_proof": "proof_business_name",
+    "total_proof": "proof_total",
+    "date_proof": "proof_date",
+    "category_proof": "proof_category",
+}
 
 
 class Validator:
@@ -43,7 +70,8 @@ class Validator:
     Match transactions against receipts/proofs and surface discrepancies.
 
     Uses fuzzy business-name matching and date windowing to build candidate
-    pairs, then resolves conflicts greedily by similarity score and total delta.
+    pairs, then resolves conflicts greedily by similarity score and total delta,
+    or with a min-cost assignment when ``matching.strategy`` is ``"optimal"``.
     """
 
     def __init__(
@@ -52,6 +80,10 @@ class Validator:
         proofs: pd.DataFrame,
         config_path: str = "config/config.conf",
         parsed_config: object | None = None,
+        database: DataBase | None = None,
+        score_cache: ScoreCache | None = None,
+        merchant_aliases: dict[str, set[str]] | None = None,
+        verbose: bool = True,
     ):
         """
         Initialize the Validator with transaction and proof DataFrames.
@@ -64,8 +96,18 @@ class Validator:
                 *parsed_config* is supplied.
             parsed_config: Pre-parsed config object. Takes precedence over
                 *config_path* to avoid redundant disk I/O.
+            database: Optional database holding learned merchant aliases. When
+                supplied, ``validate()`` resolves known aliases as exact matches.
+            score_cache: Optional cache of candidate name scores shared across
+                runs, so re-validating the same inputs at another threshold
+                does not rescore them.
+            merchant_aliases: Learned merchant aliases loaded by the caller,
+                used when no *database* is supplied.
+            verbose: Print matching timings after each run.
         """
         self.transactions = transactions
+        self.database = database
+        self.score_cache = score_cache
         self.proofs = proofs
         # Prefer an already-parsed config to avoid re-reading the file
         self.config = (
@@ -74,32 +116,113 @@ class Validator:
             else ConfigFactory.parse_file(config_path)
         )
         self.categorize_cost: dict = {}
+        self.matching_strategy = (
+            str(self.config.get("matching.strategy", "greedy")).strip().lower()
+        )
+        if self.matching_strategy not in MATCHING_STRATEGIES:
+            raise ValueError(
+                f"Unsupported matching strategy: {self.matching_strategy}. "
+                f"Expected one of {', '.join(MATCHING_STRATEGIES)}."
+            )
+        self.date_window_days = int(self.config.get("matching.date_window_days", 0))
+        self.use_name_index = bool(self.config.get("matching.name_index", True))
+        self.matching_workers = int(self.config.get("matching.workers", 1))
+        self.split_max_parts = int(
+            self.config.get("matching.split_max_parts", DEFAULT_MAX_PARTS)
+        )
+        self.name_threshold = int(
+            self.config.get("matching.name_threshold", NAME_SCORE_THRESHOLD)
+        )
+        self.recommendation_similarity = float(
+            self.config.get(
+                "matching.recommendation_similarity", RECOMMENDATION_SIMILARITY
+            )
+        )
+        self.dedup_enabled = bool(self.config.get("dedup.enabled", False))
+        self.dedup_window_days = int(
+            self.config.get("dedup.date_window_days", DEFAULT_DEDUP_WINDOW_DAYS)
+        )
+        self.verbose = verbose
+        self.matching_summary: dict = {}
+        self.merchant_aliases: dict[str, set[str]] = merchant_aliases or {}
+        self.match_state: dict = {}
+        self.matched_pairs: list[tuple[int, int]] = []
+        self.split_groups: list[SplitMatch] = []
+        self.tx_duplicate_of = np.empty(0, dtype=np.int64)
+        self.pr_duplicate_of = np.empty(0, dtype=np.int64)
+
+    @staticmethod
+    def _apply_known_categories(
+        frame: pd.DataFrame, known: pd.Series | None, categorized: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Combine previously known categories with those of freshly categorized rows.
+
+        Args:
+            frame: Full input frame.
+            known: Known categories aligned to *frame* (``None`` for unknown
+                rows), or ``None`` when every row was categorized.
+            categorized: Categorizer output for the rows without a category.
+
+        Returns:
+            *frame* with a ``category`` column.
+        """
+        if known is None:
+            return categorized
+
+        out = frame.copy()
+        pending = known.isna().to_numpy()
+        categories = known.to_numpy(dtype=object, copy=True)
+        categories[pending] = categorized["category"].to_numpy(dtype=object)
+        out["category"] = categories
+        return out
 
-    def _categorize_inputs(self) -> None:
+    def _categorize_inputs(
+        self,
+        known_transaction_categories: pd.Series | None = None,
+        known_proof_categories: pd.Series | None = None,
+    ) -> None:
         """
         Categorize transaction and proof rows in parallel and track aggregate model usage.
 
         Runs two ``TransactionCategorizer`` instances concurrently via a thread pool
-        and merges their usage summaries into ``self.categorize_cost``.
+        and merges their usage summaries into ``self.categorize_cost``. Rows with a
+        known category from a previous run are not sent to the LLM again.
+
+        Args:
+            known_transaction_categories: Categories aligned to
+                ``self.transactions``; ``None`` entries are categorized.
+            known_proof_categories: Categories aligned to ``self.proofs``.
         """
         categorizer_tx = TransactionCategorizer(self.config)
         categorizer_pr = TransactionCategorizer(self.config)
 
+        pending_tx = self.transactions
+        if known_transaction_categories is not None:
+            pending_tx = pending_tx[known_transaction_categories.isna().to_numpy()]
+        pending_pr = self.proofs
+        if known_proof_categories is not None:
+            pending_pr = pending_pr[known_proof_categories.isna().to_numpy()]
+
         # Categorize transactions and proofs concurrently to reduce wall-clock time
         with ThreadPoolExecutor(max_workers=2) as executor:
             tx_future = executor.submit(
                 categorizer_tx.categorize_dataframe,
-                self.transactions,
+                pending_tx,
             )
             pr_future = executor.submit(
                 categorizer_pr.categorize_dataframe,
-                self.proofs,
+                pending_pr,
             )
             tx_enriched = tx_future.result()
             pr_enriched = pr_future.result()
 
-        self.transactions = tx_enriched.frame
-        self.proofs = pr_enriched.frame
+        self.transactions = Validator._apply_known_categories(
+            self.transactions, known_transaction_categories, tx_enriched.frame
+        )
+        self.proofs = Validator._apply_known_categories(
+            self.proofs, known_proof_categories, pr_enriched.frame
+        )
 
         # Merge usage summaries from both categorizers into a single aggregate dict
         costs = [tx_enriched.summary, pr_enriched.summary]
@@ -133,7 +256,9 @@ class Validator:
         }
 
     @staticmethod
-    def match_business_names(transaction_name: str, proofs: list[str], threshold=80):
+    def match_business_names(
+        transaction_name: str, proofs: list[str], threshold=NAME_SCORE_THRESHOLD
+    ):
         """
         Find the closest matching proof business name for a given transaction name.
 
@@ -164,8 +289,7 @@ class Validator:
         """
         Parse raw or noisy date text into a normalised midnight ``Timestamp`` or ``NaT``.
 
-        First attempts a direct ``pd.to_datetime`` parse. If that fails, extracts a
-        date-shaped token via regex before retrying.
+        Delegates to the shared, memoised parser in ``src.utils.dates``.
 
         Args:
             value: Any value that may represent a date (string, datetime, etc.).
@@ -173,24 +297,7 @@ class Validator:
         Returns:
             A ``pd.Timestamp`` normalised to midnight, or ``pd.NaT`` on failure.
         """
-        raw = str(value).strip()
-        parsed = pd.to_datetime(raw, errors="coerce")
-        if pd.notna(parsed):
-            return parsed.normalize()
-
-        # Fall back to extracting a recognisable date substring
-        token = re.search(
-            r"(\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})",
-            raw,
-        )
-        if not token:
-            return pd.NaT
-
-        parsed_token = pd.to_datetime(token.group(1), errors="coerce")
-        if pd.isna(parsed_token):
-            return pd.NaT
-
-        return parsed_token.normalize()
+        return normalize_date(value)
 
     @staticmethod
     def _date_key(value: object) -> str:
@@ -206,17 +313,31 @@ class Validator:
         Returns:
             A ``"YYYY-MM-DD"`` string, or the lowercased raw string if parsing fails.
         """
-        parsed = Validator._normalize_date_value(value)
-        if pd.notna(parsed):
-            return parsed.strftime("%Y-%m-%d")
-        return str(value).strip().lower()
+        return Validator._date_keys(pd.Series([value], dtype=object)).iloc[0]
+
+    @staticmethod
+    def _date_keys(values: pd.Series) -> pd.Series:
+        """
+        Vectorised form of ``_date_key`` for a whole column.
+
+        Args:
+            values: Series of date values.
+
+        Returns:
+            Series of ``"YYYY-MM-DD"`` keys aligned to *values*, falling back to
+            the lowercased raw string where parsing fails.
+        """
+        parsed = parse_dates(values)
+        raw_keys = values.astype(str).str.strip().str.lower()
+        return parsed.dt.strftime("%Y-%m-%d").where(parsed.notna(), raw_keys)
 
     @staticmethod
     def _name_similarity(left: object, right: object) -> int:
         """
         Compute a fuzzy partial-ratio similarity score for two business name strings.
 
-        Both inputs are lowercased and stripped before comparison to reduce noise.
+        Both inputs are reduced to their canonical merchant names before
+        comparison to strip processor prefixes, store numbers and city suffixes.
 
         Args:
             left: First business name (transaction side).
@@ -226,7 +347,10 @@ class Validator:
             An integer score in the range ``[0, 100]``.
         """
         return int(
-            fuzz.partial_ratio(str(left).strip().lower(), str(right).strip().lower())
+            fuzz.partial_ratio(
+                canonicalize_merchant_name(str(left)),
+                canonicalize_merchant_name(str(right)),
+            )
         )
 
     @staticmethod
@@ -234,21 +358,32 @@ class Validator:
         """
         Split matched pairs into validated transactions and discrepancies.
 
-        Rows with a zero delta (amounts match exactly) go into the validated set;
-        rows with a non-zero delta go into discrepancies.
+        Totals are compared as integer cents. Rows with a zero delta (amounts
+        match to the cent) go into the validated set; rows with a non-zero or
+        unknown delta go into discrepancies.
 
         Args:
             merged_df: DataFrame of matched transaction–proof pairs with
-                ``total_transaction`` and ``total_proof`` columns.
+                ``total_transaction`` and ``total_proof`` columns, and
+                optionally their ``total_cents_*`` counterparts.
 
         Returns:
-            A tuple ``(validated, discrepancies)`` where both are DataFrames with
-            human-readable column names applied.
+            A tuple ``(validated, discrepancies)`` of DataFrames with snake_case
+            result fields (``transaction_total``, ``proof_date``, ...). Only
+            discrepancies carry ``delta``; validated rows get ``result``.
         """
-        merged_df["delta"] = merged_df["total_transaction"] - merged_df["total_proof"]
+        delta_cents = frame_cents(merged_df, "_transaction") - frame_cents(
+            merged_df, "_proof"
+        )
+        exact = delta_cents.eq(0).fillna(False).to_numpy(dtype=bool)
+        merged_df["delta"] = from_cents(delta_cents)
+        merged_df = merged_df.drop(
+            columns=[f"{CENTS_COLUMN}_transaction", f"{CENTS_COLUMN}_proof"],
+            errors="ignore",
+        )
 
-        discrepancies: pd.DataFrame = np.round(merged_df[merged_df["delta"] != 0.0], 2)
-        validated = merged_df[merged_df["delta"] == 0.0]
+        discrepancies = merged_df[~exact]
+        validated = merged_df[exact]
 
         # Drop internal matching columns before presenting results to the caller
         validated = validated.drop(
@@ -260,19 +395,9 @@ class Validator:
             errors="ignore",
         )
 
-        validated = validated.rename(
-            columns={
-                "business_name_transaction": "Transaction Business Name",
-                "total_transaction": "Transaction Total",
-                "date_transaction": "Transaction Date",
-                "business_name_proof": "Proof Business Name",
-                "total_proof": "Proof Total",
-                "date_proof": "Proof Date",
-                "category_transaction": "Transaction Category",
-                "category_proof": "Proof Category",
-            }
-        )
-        validated["Result"] = ["Validated"] * len(validated)
+        validated = validated.rename(columns=MERGED_FIELDS)
+        discrepancies = discrepancies.rename(columns=MERGED_FIELDS)
+        validated["result"] = ["Validated"] * len(validated)
 
         return validated, discrepancies
 
@@ -292,7 +417,7 @@ class Validator:
         ]
 
         return unmatched.drop(
-            columns=["name_key", "date_key", "currency"], errors="ignore"
+            columns=["name_key", "date_key", "currency", CENTS_COLUMN], errors="ignore"
         )
 
     def find_unmatched_proofs(self, used_proof_indices: set[int]) -> pd.DataFrame:
@@ -309,7 +434,7 @@ class Validator:
         unmatched = self.proofs.loc[~self.proofs.index.isin(list(used_proof_indices))]
 
         return unmatched.drop(
-            columns=["name_key", "date_key", "currency"], errors="ignore"
+            columns=["name_key", "date_key", "currency", CENTS_COLUMN], errors="ignore"
         )
 
     @staticmethod
@@ -317,18 +442,23 @@ class Validator:
         accepted_recommendations: pd.DataFrame,
         unmatched_transactions: pd.DataFrame,
         unmatched_proofs: pd.DataFrame,
+        database: DataBase | None = None,
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
         """
         Remove accepted recommendation pairs from the unmatched DataFrames.
 
         When the user accepts a recommendation, those rows should no longer appear
         in the unmatched lists. This method performs that removal via an outer merge.
+        When *database* is supplied, the accepted business-name pairs are also
+        persisted as merchant aliases for later validation runs.
 
         Args:
             accepted_recommendations: DataFrame of user-accepted pairings. The first
                 three columns map to transactions; the next columns map to proofs.
             unmatched_transactions: Current unmatched transactions DataFrame.
             unmatched_proofs: Current unmatched proofs DataFrame.
+            database: Optional database to record accepted pairs in as
+                merchant aliases.
 
         Returns:
             A tuple ``(remaining_transactions, remaining_proofs)`` with accepted
@@ -338,6 +468,11 @@ class Validator:
         if accepted_recommendations.empty:
             return unmatched_transactions, unmatched_proofs
 
+        if database is not None:
+            database.save_merchant_aliases(
+                Validator.alias_pairs(accepted_recommendations)
+            )
+
         accepted_transactions: pd.DataFrame = accepted_recommendations.iloc[:, :3]
         accepted_transactions = accepted_transactions.map(
             lambda x: x.strip() if isinstance(x, str) else x
@@ -372,28 +507,182 @@ class Validator:
 
         return remained_unmatched_transactions, remained_unmatched_proofs
 
-    def validate(self) -> Results:
+    @staticmethod
+    def alias_pairs(accepted_recommendations: pd.DataFrame) -> list[tuple[str, str]]:
+        """
+        Extract canonical (transaction name, proof name) pairs from accepted rows.
+
+        Args:
+            accepted_recommendations: Accepted recommendation rows, with either
+                ``Transaction Business Name``/``Proof Business Name`` columns or
+                the positional layout used by ``update_unmatched_dataframes``.
+
+        Returns:
+            Canonical merchant-name pairs, excluding pairs that already share a
+            canonical name.
+        """
+        if accepted_recommendations.empty:
+            return []
+
+        columns = accepted_recommendations.columns
+        if {"Transaction Business Name", "Proof Business Name"}.issubset(columns):
+            tx_names = accepted_recommendations["Transaction Business Name"]
+            pr_names = accepted_recommendations["Proof Business Name"]
+        else:
+            tx_names = accepted_recommendations.iloc[:, 0]
+            pr_names = accepted_recommendations.iloc[:, 3]
+
+        pairs = zip(canonicalize_names(tx_names), canonicalize_names(pr_names))
+        return [(tx_name, pr_name) for tx_name, pr_name in pairs if tx_name != pr_name]
+
+    def _settings_fingerprint(
+        self, date_window_days: int, name_threshold: int, dedup: bool
+    ) -> str:
+        """
+        Fingerprint the settings previous matches depend on for incremental runs.
+
+        Args:
+            date_window_days: Posting-lag window of the current run.
+            name_threshold: Name similarity threshold of the current run.
+            dedup: Whether the current run collapses duplicate rows.
+
+        Returns:
+            Hex digest of strategy, window, name-index flag, threshold and dedup
+            settings. Learned aliases are global, so they are diffed per
+            session by ``plan_incremental`` instead of fingerprinted.
+        """
+        return settings_fingerprint(
+            {
+                "strategy": self.matching_strategy,
+                "dateWindowDays": date_window_days,
+                "nameIndex": self.use_name_index,
+                "threshold": name_threshold,
+                "dedupWindowDays": self.dedup_window_days if dedup else None,
+            }
+        )
+
+    def _session_aliases(
+        self, tx_name_keys: pd.Series, pr_name_keys: pd.Series
+    ) -> list[tuple[str, str]]:
+        """
+        Return the learned aliases that can pair rows of this session.
+
+        Args:
+            tx_name_keys: Canonical transaction names.
+            pr_name_keys: Canonical proof names.
+
+        Returns:
+            Sorted ``(transaction_name, proof_name)`` pairs whose names both
+            occur in the inputs.
+        """
+        pr_names = set(pr_name_keys)
+        return sorted(
+            (tx_name, pr_name)
+            for tx_name in set(tx_name_keys)
+            for pr_name in self.merchant_aliases.get(tx_name, ())
+            if pr_name in pr_names
+        )
+
+    def validate(
+        self,
+        date_window_days: int | None = None,
+        previous_run: dict | None = None,
+        categorize: bool = True,
+        name_threshold: int | None = None,
+        dedup: bool | None = None,
+    ) -> Results:
         """
         Run the full validation pipeline and return matched/unmatched results.
 
         Steps:
         1. Categorize both inputs concurrently via the LLM.
-        2. Build normalised name and date keys for fuzzy matching.
-        3. Generate candidate pairs (same date, fuzzy name similarity ≥ 80).
-        4. Greedily resolve conflicts: highest similarity first, then lowest delta.
-        5. Split pairs into validated (zero delta) and discrepancies (non-zero delta).
-        6. Collect unmatched rows from both sides.
+        2. Build canonical merchant-name keys (processor prefixes, store numbers
+           and city suffixes stripped) and normalised date keys. With
+           ``dedup.enabled``, collapse rows repeating an earlier row of the
+           same frame (see ``find_duplicates``); they skip matching and are
+           reported in ``Results.duplicates``.
+        3. Pair rows with identical name key, date key and cents by a hash
+           join; only the remaining rows are scored.
+        4. Generate candidate pairs (dates within the posting-lag window, fuzzy
+           name similarity ≥ ``matching.name_threshold``), scoring only names
+           that share a token or trigram unless ``matching.name_index`` is
+           disabled. Learned merchant aliases score 100 without fuzzy scoring.
+           Date blocks are scored across ``matching.workers`` processes when it
+           is above 1.
+        5. Resolve conflicts one-to-one: greedily (highest similarity first, then
+           lowest delta) or, with ``matching.strategy = "optimal"``, by a
+           min-cost assignment solved per connected candidate block.
+        6. Group remaining rows into split payments: one row whose cents equal
+           the sum of 2..``matching.split_max_parts`` candidate rows from
+           step 4 on the other side (see ``find_split_payments``).
+        7. Split pairs into validated (zero delta) and discrepancies (non-zero delta).
+        8. Collect unmatched rows from both sides.
+
+        With *previous_run*, rows are diffed against that run by content hash:
+        only new rows are categorized, only date blocks touched by added or
+        removed rows, or by rows whose names gained or lost a learned alias,
+        are re-matched, and every other previous pair and split payment is
+        kept.
+        The state to pass to the next run is left in ``self.match_state``.
+
+        Args:
+            date_window_days: Maximum posting lag in days between a transaction
+                and its proof. Defaults to ``matching.date_window_days`` from
+                config; ``0`` requires identical dates.
+            previous_run: ``match_state`` from an earlier run of the same
+                session. Ignored when missing or produced with different
+                matching settings, in which case everything is re-matched.
+            categorize: Set to ``False`` to skip LLM categorization, e.g. when
+                the inputs already carry a ``category`` column.
+            name_threshold: Minimum name similarity (0–100) for a candidate
+                pair. Defaults to ``matching.name_threshold`` from config.
+            dedup: Collapse duplicate rows before matching. Defaults to
+                ``dedup.enabled`` from config.
 
         Returns:
             A ``Results`` object with validated transactions, discrepancies,
             unmatched transactions, and unmatched proofs.
         """
         start = time()
-        self.transactions = self.transactions.copy()
-        self.proofs = self.proofs.copy()
+        # Positional labels keep row keys aligned through categorization
+        self.transactions = self.transactions.reset_index(drop=True)
+        self.proofs = self.proofs.reset_index(drop=True)
+
+        window = self.date_window_days if date_window_days is None else date_window_days
+        window = max(0, int(window))
+        threshold = self.name_threshold if name_threshold is None else name_threshold
+        threshold = int(threshold)
+        dedup = self.dedup_enabled if dedup is None else bool(dedup)
+        if self.database is not None:
+            self.merchant_aliases = self.database.load_merchant_aliases()
+
+        tx_dates = Validator._date_keys(self.transactions["date"])
+        pr_dates = Validator._date_keys(self.proofs["date"])
+        tx_row_keys = row_keys(self.transactions, tx_dates)
+        pr_row_keys = row_keys(self.proofs, pr_dates)
+        tx_name_keys = canonicalize_names(self.transactions["business_name"])
+        pr_name_keys = canonicalize_names(self.proofs["business_name"])
+        session_aliases = self._session_aliases(tx_name_keys, pr_name_keys)
+        fingerprint = self._settings_fingerprint(window, threshold, dedup)
+        plan = plan_incremental(
+            previous_run,
+            fingerprint,
+            tx_row_keys,
+            pr_row_keys,
+            tx_dates,
+            pr_dates,
+            window,
+            aliases=session_aliases,
+            tx_names=tx_name_keys,
+            pr_names=pr_name_keys,
+        )
 
         try:
-            self._categorize_inputs()
+            if categorize:
+                self._categorize_inputs(
+                    None if plan is None else plan.transaction_categories,
+                    None if plan is None else plan.proof_categories,
+                )
         except Exception as e:
             print(f"Warning: Categorization failed and was skipped. Error: {e}")
             self.categorize_cost = {
@@ -407,63 +696,171 @@ class Validator:
                 "latencySeconds": 0.0,
             }
 
-        self.transactions["name_key"] = (
-            self.transactions["business_name"].astype(str).str.strip().str.lower()
-        )
-        self.proofs["name_key"] = (
-            self.proofs["business_name"].astype(str).str.strip().str.lower()
-        )
-
-        self.transactions["date_key"] = self.transactions["date"].apply(
-            Validator._date_key
+        self.transactions["name_key"] = tx_name_keys.to_numpy()
+        self.proofs["name_key"] = pr_name_keys.to_numpy()
+
+        self.transactions["date_key"] = tx_dates
+        self.proofs["date_key"] = pr_dates
+
+        # Totals are compared in integer cents; float copies feed the scorers
+        self.transactions[CENTS_COLUMN] = frame_cents(self.transactions)
+        self.proofs[CENTS_COLUMN] = frame_cents(self.proofs)
+        tx_totals = from_cents(self.transactions[CENTS_COLUMN])
+        pr_totals = from_cents(self.proofs[CENTS_COLUMN])
+
+        self.tx_duplicate_of, self.pr_duplicate_of = self._find_duplicates(dedup)
+        tx_collapsed = self.tx_duplicate_of >= 0
+        pr_collapsed = self.pr_duplicate_of >= 0
+
+        kept_pairs: list[tuple[int, int]] = []
+        kept_groups: list[SplitMatch] = []
+        pair_details: dict[tuple[int, int], tuple[int, str]] = {}
+        tx_rematch = np.ones(len(self.transactions), dtype=bool)
+        pr_rematch = np.ones(len(self.proofs), dtype=bool)
+        if plan is not None:
+            tx_rematch, pr_rematch = plan.rematch_transactions, plan.rematch_proofs
+            for pair, details in zip(plan.kept_pairs, plan.kept_details):
+                tx_idx, pr_idx = pair
+                # A row that is now a duplicate frees its partner for re-matching
+                if tx_collapsed[tx_idx] or pr_collapsed[pr_idx]:
+                    tx_rematch[tx_idx] = pr_rematch[pr_idx] = True
+                    continue
+                kept_pairs.append(pair)
+                pair_details[pair] = details
+            for group in plan.kept_groups:
+                if (
+                    tx_collapsed[group.transaction_indices].any()
+                    or pr_collapsed[group.proof_indices].any()
+                ):
+                    tx_rematch[group.transaction_indices] = True
+                    pr_rematch[group.proof_indices] = True
+                    continue
+                kept_groups.append(group)
+        tx_candidates = tx_rematch & ~tx_collapsed
+        pr_candidates = pr_rematch & ~pr_collapsed
+
+        # Identical name, date and cents pair up before any fuzzy scoring
+        exact_pairs = exact_match_pairs(
+            self.transactions[tx_candidates],
+            self.proofs[pr_candidates],
+            self.transactions.loc[tx_candidates, CENTS_COLUMN],
+            self.proofs.loc[pr_candidates, CENTS_COLUMN],
         )
-        self.proofs["date_key"] = self.proofs["date"].apply(Validator._date_key)
-
-        tx_totals = pd.to_numeric(self.transactions["total"], errors="coerce")
-        pr_totals = pd.to_numeric(self.proofs["total"], errors="coerce")
+        for pair in exact_pairs:
+            pair_details[pair] = (100, "exact")
+        tx_candidates[[tx_idx for tx_idx, _ in exact_pairs]] = False
+        pr_candidates[[pr_idx for _, pr_idx in exact_pairs]] = False
 
         # Build all candidate (tx, proof) pairs that share a date and meet the name threshold
-        candidates: list[tuple[int, int, int, float]] = []
-        for tx_idx, tx_row in self.transactions.iterrows():
-            same_date_proofs = self.proofs[
-                self.proofs["date_key"] == tx_row["date_key"]
-            ]
-            if same_date_proofs.empty:
-                continue
+        candidate_stats: dict = {}
+        candidates = build_candidates(
+            self.transactions[tx_candidates],
+            self.proofs[pr_candidates],
+            tx_totals[tx_candidates],
+            pr_totals[pr_candidates],
+            threshold=threshold,
+            date_window_days=window,
+            use_name_index=self.use_name_index,
+            stats=candidate_stats,
+            aliases=self.merchant_aliases,
+            workers=self.matching_workers,
+            score_cache=self.score_cache,
+        )
 
-            for pr_idx, pr_row in same_date_proofs.iterrows():
-                score = Validator._name_similarity(
-                    tx_row["name_key"], pr_row["name_key"]
+        settled_pairs = kept_pairs + exact_pairs
+        greedy_pairs = settled_pairs + greedy_assignment(candidates)
+        if self.matching_strategy == "optimal":
+            matched_pairs = settled_pairs + optimal_assignment(candidates)
+        else:
+            matched_pairs = greedy_pairs
+
+        # Keep the score and strategy each new pair was accepted with
+        new_pairs = set(matched_pairs) - set(settled_pairs)
+        for tx_idx, pr_idx, score, _ in candidates:
+            if (tx_idx, pr_idx) in new_pairs:
+                aliased = self.proofs.at[pr_idx, "name_key"] in (
+                    self.merchant_aliases.get(
+                        self.transactions.at[tx_idx, "name_key"], ()
+                    )
                 )
-                if score < 80:
-                    continue
-
-                total_delta = (
-                    abs(float(tx_totals.loc[tx_idx]) - float(pr_totals.loc[pr_idx]))
-                    if pd.notna(tx_totals.loc[tx_idx])
-                    and pd.notna(pr_totals.loc[pr_idx])
-                    else float("inf")
+                pair_details[tx_idx, pr_idx] = (
+                    score,
+                    "alias" if aliased else self.matching_strategy,
                 )
-                candidates.append((tx_idx, pr_idx, score, total_delta))
 
-        # Sort: best similarity first, then smallest total delta to break ties
-        candidates.sort(key=lambda item: (-item[2], item[3]))
-
-        used_tx_indices: set[int] = set()
-        used_proof_indices: set[int] = set()
-        matched_pairs: list[tuple[int, int]] = []
+        # Split payments replace any one-to-one pairs their rows were in
+        main_pairs = matched_pairs
+        self.split_groups = kept_groups + self._match_split_payments(
+            main_pairs, candidates
+        )
+        grouped_tx = {
+            tx_idx
+            for group in self.split_groups
+            for tx_idx in group.transaction_indices
+        }
+        grouped_pr = {
+            pr_idx for group in self.split_groups for pr_idx in group.proof_indices
+        }
+        matched_pairs = [
+            (tx_idx, pr_idx)
+            for tx_idx, pr_idx in main_pairs
+            if tx_idx not in grouped_tx and pr_idx not in grouped_pr
+        ]
 
-        # Greedy one-to-one assignment: once an index is used, skip it
-        for tx_idx, pr_idx, _, _ in candidates:
-            if tx_idx in used_tx_indices or pr_idx in used_proof_indices:
-                continue
+        self.matched_pairs = matched_pairs
+        used_tx_indices = (
+            {tx_idx for tx_idx, _ in matched_pairs}
+            | grouped_tx
+            | set(np.flatnonzero(tx_collapsed).tolist())
+        )
+        used_proof_indices = (
+            {pr_idx for _, pr_idx in matched_pairs}
+            | grouped_pr
+            | set(np.flatnonzero(pr_collapsed).tolist())
+        )
 
-            used_tx_indices.add(tx_idx)
-            used_proof_indices.add(pr_idx)
-            matched_pairs.append((tx_idx, pr_idx))
+        self.matching_summary = {
+            "strategy": self.matching_strategy,
+            "nameThreshold": threshold,
+            "exactPairs": len(exact_pairs),
+            "candidatePairs": len(candidates),
+            "scorerCalls": int(candidate_stats.get("scorerCalls", 0)),
+            "aliasHits": int(candidate_stats.get("aliasHits", 0)),
+            "scoreCacheHit": bool(candidate_stats.get("scoreCacheHits", 0)),
+            "matchedPairs": len(matched_pairs),
+            "greedyMatchedPairs": len(greedy_pairs),
+            "extraMatchesVsGreedy": len(main_pairs) - len(greedy_pairs),
+            "incremental": plan is not None,
+            "keptPairs": len(kept_pairs),
+            "keptSplitGroups": len(kept_groups),
+            "rematchedTransactions": int(tx_rematch.sum()),
+            "rematchedProofs": int(pr_rematch.sum()),
+            "splitGroups": len(self.split_groups),
+            "duplicateTransactions": int(tx_collapsed.sum()),
+            "duplicateProofs": int(pr_collapsed.sum()),
+        }
+        self.match_state = build_match_state(
+            fingerprint,
+            tx_row_keys,
+            pr_row_keys,
+            tx_dates,
+            pr_dates,
+            self.transactions.get("category"),
+            self.proofs.get("category"),
+            matched_pairs,
+            [pair_details[pair] for pair in matched_pairs],
+            session_aliases,
+            self.split_groups,
+        )
 
         end = time()
-        print(f"Time taken to match {round(end - start, 3)}s")
+        if self.verbose:
+            print(f"Time taken to match {round(end - start, 3)}s")
+        if self.verbose and self.matching_strategy == "optimal":
+            print(
+                "Optimal assignment found "
+                f"{self.matching_summary['extraMatchesVsGreedy']} extra matches vs greedy"
+            )
 
         if matched_pairs:
             tx_idx_vec = [tx_idx for tx_idx, _ in matched_pairs]
@@ -507,23 +904,9 @@ class Validator:
         unmatched_transactions = self.find_unmatched_transactions(used_tx_indices)
         unmatched_proofs = self.find_unmatched_proofs(used_proof_indices)
 
-        discrepancies = discrepancies.rename(
-            columns={
-                "business_name_transaction": "Transaction Business Name",
-                "total_transaction": "Transaction Total",
-                "date_transaction": "Transaction Date",
-                "business_name_proof": "Proof Business Name",
-                "total_proof": "Proof Total",
-                "date_proof": "Proof Date",
-                "delta": "Delta",
-                "category_transaction": "Transaction Category",
-                "category_proof": "Proof Category",
-            }
-        )
-
-        unmatched_cols = ["Business Name", "Total", "Date"]
+        unmatched_cols = ["business_name", "total", "date"]
         if "category" in unmatched_transactions.columns:
-            unmatched_cols.append("Category")
+            unmatched_cols.append("category")
         unmatched_transactions = unmatched_transactions.reset_index(drop=True)
         unmatched_proofs = unmatched_proofs.reset_index(drop=True)
         unmatched_transactions.columns = unmatched_cols
@@ -534,22 +917,261 @@ class Validator:
             discrepancies,
             unmatched_transactions,
             unmatched_proofs,
+            self._grouped_matches_frame(),
+            self._duplicates_frame(),
+            self._explain_matches(pair_details),
+        )
+
+    def _match_split_payments(
+        self,
+        matched_pairs: list[tuple[int, int]],
+        candidates: list[tuple[int, int, int, float]],
+    ) -> list[SplitMatch]:
+        """
+        Find split payments among rows the one-to-one pass did not settle.
+
+        Rows that are unmatched or paired with a different total are pooled;
+        pairs whose totals agree to the cent are left alone. The pool is
+        searched over the main pass's candidates, so only rows that pass
+        scored (the rematch region on incremental runs) are grouped and no
+        name is scored twice.
+
+        Args:
+            matched_pairs: ``(tx_idx, pr_idx)`` pairs from the one-to-one pass.
+            candidates: Candidate pairs the one-to-one pass was chosen from.
+
+        Returns:
+            ``SplitMatch`` groups, empty when ``matching.split_max_parts`` is
+            below 2.
+        """
+        if self.split_max_parts < 2:
+            return []
+
+        tx_cents = self.transactions[CENTS_COLUMN]
+        pr_cents = self.proofs[CENTS_COLUMN]
+        # Labels are positions here since validate() resets both indexes
+        tx_values = tx_cents.to_numpy(dtype=float, na_value=np.nan)
+        pr_values = pr_cents.to_numpy(dtype=float, na_value=np.nan)
+        exact_pairs = [
+            (tx_idx, pr_idx)
+            for tx_idx, pr_idx in matched_pairs
+            if tx_values[tx_idx] == pr_values[pr_idx]
+        ]
+        tx_pool = ~self.transactions.index.isin([tx_idx for tx_idx, _ in exact_pairs])
+        pr_pool = ~self.proofs.index.isin([pr_idx for _, pr_idx in exact_pairs])
+
+        split_candidates = [
+            candidate
+            for candidate in candidates
+            if tx_pool[candidate[0]] and pr_pool[candidate[1]]
+        ]
+        return find_split_payments(
+            split_candidates, tx_cents, pr_cents, self.split_max_parts
+        )
+
+    def _find_duplicates(self, dedup: bool) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Run the dedup stage over both frames.
+
+        Args:
+            dedup: Whether duplicates are collapsed at all.
+
+        Returns:
+            A tuple ``(tx_duplicate_of, pr_duplicate_of)`` as returned by
+            ``find_duplicates``; all ``-1`` when *dedup* is off.
+        """
+        if not dedup:
+            return (
+                np.full(len(self.transactions), -1, dtype=np.int64),
+                np.full(len(self.proofs), -1, dtype=np.int64),
+            )
+
+        sides = [
+            (frame["name_key"], frame[CENTS_COLUMN], frame["date_key"])
+            for frame in (self.transactions, self.proofs)
+        ]
+        return (
+            find_duplicates(*sides[0], *sides[1], self.dedup_window_days),
+            find_duplicates(*sides[1], *sides[0], self.dedup_window_days),
+        )
+
+    def _duplicates_frame(self) -> pd.DataFrame:
+        """
+        List the rows collapsed by the dedup stage.
+
+        Returns:
+            DataFrame with ``side`` (``"Transaction"`` or ``"Proof"``),
+            ``business_name``, ``total``, ``date``, ``category`` when both
+            inputs were categorized, ``duplicate_of`` (input row position of
+            the kept row) and ``duplicate_kind`` (``"Exact"`` or ``"Near"``).
+        """
+        with_category = (
+            "category" in self.transactions.columns
+            and "category" in self.proofs.columns
+        )
+        columns = ["business_name", "total", "date"]
+        if with_category:
+            columns.append("category")
+
+        parts = []
+        for side, frame, duplicate_of in (
+            ("Transaction", self.transactions, self.tx_duplicate_of),
+            ("Proof", self.proofs, self.pr_duplicate_of),
+        ):
+            rows = np.flatnonzero(duplicate_of >= 0)
+            kept = duplicate_of[rows]
+            date_keys = frame["date_key"].to_numpy()
+            part = frame.iloc[rows][columns].reset_index(drop=True)
+            part.insert(0, "side", side)
+            part["duplicate_of"] = kept
+            part["duplicate_kind"] = np.where(
+                date_keys[rows] == date_keys[kept], "Exact", "Near"
+            )
+            parts.append(part)
+
+        return pd.concat(parts, ignore_index=True)
+
+    def _explain_matches(
+        self, pair_details: dict[tuple[int, int], tuple[int, str]]
+    ) -> MatchExplanations:
+        """
+        Record score, delta, date distance and strategy for every accepted pair.
+
+        Entries follow the row order of ``validate_totals`` for one-to-one
+        pairs and of ``_grouped_matches_frame`` for split-payment parts.
+
+        Args:
+            pair_details: ``(score, strategy)`` per one-to-one pair.
+
+        Returns:
+            A ``MatchExplanations`` covering ``matched_pairs`` and
+            ``split_groups``.
+        """
+        # Labels are positions here since validate() resets both indexes
+        tx_cents = self.transactions[CENTS_COLUMN].to_numpy(
+            dtype=float, na_value=np.nan
+        )
+        pr_cents = self.proofs[CENTS_COLUMN].to_numpy(dtype=float, na_value=np.nan)
+        tx_days = _key_days(self.transactions["date_key"].tolist())
+        pr_days = _key_days(self.proofs["date_key"].tolist())
+
+        entries: list[tuple[int, int, int, str, str, int]] = []
+        next_row = {table: 0 for table in EXPLAINED_TABLES}
+
+        def add(tx_idx: int, pr_idx: int, score: int, strategy: str, table: str):
+            entries.append((tx_idx, pr_idx, score, strategy, table, next_row[table]))
+
+        for tx_idx, pr_idx in self.matched_pairs:
+            score, strategy = pair_details[tx_idx, pr_idx]
+            table = (
+                "validated_transactions"
+                if tx_cents[tx_idx] == pr_cents[pr_idx]
+                else "discrepancies"
+            )
+            add(tx_idx, pr_idx, score, strategy, table)
+            next_row[table] += 1
+
+        for group in self.split_groups:
+            if len(group.transaction_indices) == 1:
+                # The single transaction row comes first, then its proof parts
+                next_row["grouped_matches"] += 1
+                for pr_idx, score in zip(group.proof_indices, group.scores):
+                    add(
+                        group.transaction_indices[0],
+                        pr_idx,
+                        score,
+                        "split",
+                        "grouped_matches",
+                    )
+                    next_row["grouped_matches"] += 1
+            else:
+                for tx_idx, score in zip(group.transaction_indices, group.scores):
+                    add(
+                        tx_idx,
+                        group.proof_indices[0],
+                        score,
+                        "split",
+                        "grouped_matches",
+                    )
+                    next_row["grouped_matches"] += 1
+                next_row["grouped_matches"] += 1
+
+        if not entries:
+            return MatchExplanations()
+
+        tx_rows, pr_rows, scores, strategies, tables, rows = map(list, zip(*entries))
+        distances = np.abs(tx_days[tx_rows] - pr_days[pr_rows])
+        return MatchExplanations(
+            tx_rows,
+            pr_rows,
+            scores,
+            (tx_cents[tx_rows] - pr_cents[pr_rows]) / 100,
+            np.where(np.isnan(distances), UNKNOWN_DISTANCE, distances),
+            [PAIR_STRATEGIES.index(strategy) for strategy in strategies],
+            [EXPLAINED_TABLES.index(table) for table in tables],
+            rows,
+        )
+
+    def _grouped_matches_frame(self) -> pd.DataFrame:
+        """
+        Flatten ``split_groups`` into one display row per grouped input row.
+
+        Returns:
+            DataFrame with ``group`` (1-based), ``side`` (``"Transaction"`` or
+            ``"Proof"``), ``business_name``, ``total``, ``date`` and, when both
+            inputs were categorized, ``category``.
+        """
+        with_category = (
+            "category" in self.transactions.columns
+            and "category" in self.proofs.columns
         )
+        columns = ["group", "side", "business_name", "total", "date"]
+        if with_category:
+            columns.append("category")
+
+        rows = []
+        for number, group in enumerate(self.split_groups, start=1):
+            for side, frame, indices in (
+                ("Transaction", self.transactions, group.transaction_indices),
+                ("Proof", self.proofs, group.proof_indices),
+            ):
+                for idx in indices:
+                    row = frame.loc[idx]
+                    record = [
+                        number,
+                        side,
+                        row["business_name"],
+                        row["total"],
+                        row["date"],
+                    ]
+                    if with_category:
+                        record.append(row["category"])
+                    rows.append(record)
+
+        return pd.DataFrame(rows, columns=columns)
 
     def analyze_unmatched_results(
-        self, unmatched_transactions: pd.DataFrame, unmatched_proofs: pd.DataFrame
+        self,
+        unmatched_transactions: pd.DataFrame,
+        unmatched_proofs: pd.DataFrame,
+        name_similarity_threshold: float | None = None,
     ) -> pd.DataFrame:
         """
         Recommend likely pairings for unmatched rows based on date and total proximity.
 
-        Candidates are generated by a cross-join filtered to rows within 2 days and
-        within $0.05 of each other. Results are de-duplicated and sorted by
-        (date distance, total delta, name similarity descending).
+        Candidates are generated by a banded join that only builds pairs within
+        2 days and within $0.05 (compared as integer cents) of each other, so
+        memory scales with the surviving pairs rather than rows × rows. Results
+        are de-duplicated and sorted by (date distance, total delta, name
+        similarity descending).
 
         Args:
             unmatched_transactions: Unmatched transaction rows with ``Business Name``,
                 ``Total``, and ``Date`` columns.
             unmatched_proofs: Unmatched proof rows with the same schema.
+            name_similarity_threshold: Minimum name similarity (0–1) of a
+                recommended pair. Defaults to
+                ``matching.recommendation_similarity`` from config.
 
         Returns:
             A DataFrame of recommended pairings with ``Transaction *``, ``Proof *``,
@@ -558,118 +1180,102 @@ class Validator:
         if unmatched_transactions.empty or unmatched_proofs.empty:
             return pd.DataFrame([])
 
-        name_similarity_threshold = 0.65
-
-        tx = unmatched_transactions.copy()
-        pr = unmatched_proofs.copy()
+        if name_similarity_threshold is None:
+            name_similarity_threshold = self.recommendation_similarity
 
-        tx["__match_date"] = tx["Date"].apply(Validator._normalize_date_value)
-        pr["__match_date"] = pr["Date"].apply(Validator._normalize_date_value)
+        tx = unmatched_transactions.reset_index(drop=True)
+        pr = unmatched_proofs.reset_index(drop=True)
 
-        tx["__match_total"] = pd.to_numeric(tx["Total"], errors="coerce").round(2)
-        pr["__match_total"] = pd.to_numeric(pr["Total"], errors="coerce").round(2)
+        tx_dates = parse_dates(tx["Date"])
+        pr_dates = parse_dates(pr["Date"])
+        tx_totals = pd.to_numeric(tx["Total"], errors="coerce").round(2)
+        pr_totals = pd.to_numeric(pr["Total"], errors="coerce").round(2)
 
-        tx = tx.dropna(subset=["__match_date", "__match_total"])
-        pr = pr.dropna(subset=["__match_date", "__match_total"])
+        tx_rows = np.flatnonzero((tx_dates.notna() & tx_totals.notna()).to_numpy())
+        pr_rows = np.flatnonzero((pr_dates.notna() & pr_totals.notna()).to_numpy())
 
-        if tx.empty or pr.empty:
+        if len(tx_rows) == 0 or len(pr_rows) == 0:
             return pd.DataFrame([])
 
-        candidate_pairs = tx.merge(
-            pr,
-            how="cross",
-            suffixes=("_tx", "_pr"),
+        tx_days = tx_dates.to_numpy()[tx_rows].astype("datetime64[D]").astype(np.int64)
+        pr_days = pr_dates.to_numpy()[pr_rows].astype("datetime64[D]").astype(np.int64)
+        tx_cents = to_cents(tx_totals).to_numpy(dtype=np.int64, na_value=0)[tx_rows]
+        pr_cents = to_cents(pr_totals).to_numpy(dtype=np.int64, na_value=0)[pr_rows]
+
+        # Only pairs within 2 days and 5 cents are ever materialised
+        left, right = band_join(
+            tx_days,
+            tx_cents,
+            pr_days,
+            pr_cents,
+            max_day_distance=2,
+            max_cent_distance=5,
         )
+        if len(left) == 0:
+            return pd.DataFrame([])
 
-        if not candidate_pairs.empty:
-            candidate_pairs = candidate_pairs[
-                (
-                    candidate_pairs["__match_date_tx"]
-                    - candidate_pairs["__match_date_pr"]
-                ).abs()
-                <= pd.Timedelta(days=2)
-            ]
-            candidate_pairs = candidate_pairs[
-                (
-                    candidate_pairs["__match_total_tx"]
-                    - candidate_pairs["__match_total_pr"]
-                ).abs()
-                <= 0.05
-            ]
-
-            if not candidate_pairs.empty:
-                candidate_pairs["__date_distance"] = (
-                    (
-                        candidate_pairs["__match_date_tx"]
-                        - candidate_pairs["__match_date_pr"]
-                    )
-                    .abs()
-                    .dt.days
-                )
-                candidate_pairs["__total_delta"] = (
-                    candidate_pairs["__match_total_tx"]
-                    - candidate_pairs["__match_total_pr"]
-                ).abs()
-                candidate_pairs["__name_similarity"] = (
-                    candidate_pairs.apply(
-                        lambda row: Validator._name_similarity(
-                            row["Business Name_tx"], row["Business Name_pr"]
-                        ),
-                        axis=1,
-                    )
-                    / 100.0
-                )
-
-                candidate_pairs = candidate_pairs[
-                    candidate_pairs["__name_similarity"] >= name_similarity_threshold
+        tx_pos = tx_rows[left]
+        pr_pos = pr_rows[right]
+        date_distance = np.abs(tx_days[left] - pr_days[right])
+        total_delta = np.abs(tx_cents[left] - pr_cents[right])
+
+        tx_names = tx["Business Name"].to_numpy()
+        pr_names = pr["Business Name"].to_numpy()
+        name_similarity = (
+            np.array(
+                [
+                    Validator._name_similarity(tx_name, pr_name)
+                    for tx_name, pr_name in zip(tx_names[tx_pos], pr_names[pr_pos])
                 ]
+            )
+            / 100.0
+        )
+
+        keep = name_similarity >= name_similarity_threshold
+        if not keep.any():
+            return pd.DataFrame([])
 
-                if candidate_pairs.empty:
-                    return pd.DataFrame([])
+        tx_pos, pr_pos = tx_pos[keep], pr_pos[keep]
+        date_distance, total_delta = date_distance[keep], total_delta[keep]
+        name_similarity = name_similarity[keep]
 
-                candidate_pairs = candidate_pairs.sort_values(
-                    by=["__date_distance", "__total_delta", "__name_similarity"],
-                    ascending=[True, True, False],
-                )
+        # Closest date, then closest total, then most similar name
+        order = np.lexsort(
+            (pr_pos, tx_pos, -name_similarity, total_delta, date_distance)
+        )
 
-                used_tx: set[str] = set()
-                used_pr: set[str] = set()
-                selected_rows: list[pd.Series] = []
-                for _, row in candidate_pairs.iterrows():
-                    tx_key = (
-                        str(row["Business Name_tx"]),
-                        float(row["__match_total_tx"]),
-                        str(row["Date_tx"]),
-                    )
-                    pr_key = (
-                        str(row["Business Name_pr"]),
-                        float(row["__match_total_pr"]),
-                        str(row["Date_pr"]),
-                    )
-                    if tx_key in used_tx or pr_key in used_pr:
-                        continue
-                    used_tx.add(tx_key)
-                    used_pr.add(pr_key)
-                    selected_rows.append(row)
-
-                candidate_pairs = pd.DataFrame(selected_rows)
-
-        recommendations = pd.DataFrame([])
-        if not candidate_pairs.empty:
-            recommendations = pd.DataFrame(
-                {
-                    "Transaction Business Name": candidate_pairs["Business Name_tx"],
-                    "Transaction Total": candidate_pairs["Total_tx"],
-                    "Transaction Date": candidate_pairs["Date_tx"],
-                    "Proof Business Name": candidate_pairs["Business Name_pr"],
-                    "Proof Total": candidate_pairs["Total_pr"],
-                    "Proof Date": candidate_pairs["Date_pr"],
-                    "Reason": "Similar dates and amount",
-                }
-            )
+        tx_keys = list(
+            zip(tx["Business Name"].astype(str), tx_totals, tx["Date"].astype(str))
+        )
+        pr_keys = list(
+            zip(pr["Business Name"].astype(str), pr_totals, pr["Date"].astype(str))
+        )
 
-        if recommendations.empty:
-            return pd.DataFrame([])
+        used_tx: set[tuple] = set()
+        used_pr: set[tuple] = set()
+        selected_tx: list[int] = []
+        selected_pr: list[int] = []
+        for tx_row, pr_row in zip(tx_pos[order].tolist(), pr_pos[order].tolist()):
+            tx_key = tx_keys[tx_row]
+            pr_key = pr_keys[pr_row]
+            if tx_key in used_tx or pr_key in used_pr:
+                continue
+            used_tx.add(tx_key)
+            used_pr.add(pr_key)
+            selected_tx.append(tx_row)
+            selected_pr.append(pr_row)
+
+        recommendations = pd.DataFrame(
+            {
+                "Transaction Business Name": tx_names[selected_tx],
+                "Transaction Total": tx["Total"].to_numpy()[selected_tx],
+                "Transaction Date": tx["Date"].to_numpy()[selected_tx],
+                "Proof Business Name": pr_names[selected_pr],
+                "Proof Total": pr["Total"].to_numpy()[selected_pr],
+                "Proof Date": pr["Date"].to_numpy()[selected_pr],
+                "Reason": "Similar dates and amount",
+            }
+        )
 
         recommendations = recommendations.drop_duplicates(
             subset=[
@@ -684,12 +1290,16 @@ class Validator:
 
         return recommendations.reset_index(drop=True)
 
-    def analyze_results(self, results: Results) -> tuple[str, pd.DataFrame]:
+    def analyze_results(
+        self, results: Results, name_similarity_threshold: float | None = None
+    ) -> tuple[str, pd.DataFrame]:
         """
         Produce a human-readable analysis summary and pairing recommendations.
 
         Args:
             results: The ``Results`` object returned by ``validate()``.
+            name_similarity_threshold: Minimum name similarity (0–1) of a
+                recommendation; see ``analyze_unmatched_results``.
 
         Returns:
             A tuple ``(analysis, recommendations)`` where *analysis* is a plain-text
@@ -714,7 +1324,7 @@ class Validator:
         else:
             analysis = "I finished the validation process and provided some recommendations for you."
             recommendations = self.analyze_unmatched_results(
-                unmatched_transactions, unmatched_proofs
+                unmatched_transactions, unmatched_proofs, name_similarity_threshold
             )
 
         return analysis, recommendations
@@ -118,7 +118,7 @@ class Interface:
             )
 
         progress(4 * step_increment, desc="Initializing Validator")
-        validator = Validator(transactions_data, proofs_data)
+        validator = Validator(transactions_data, proofs_data, database=self.database)
 
         progress(5 * step_increment, desc="Running Validation")
         validation_results = validator.validate()
@@ -520,6 +520,7 @@ class Interface:
                                 accepted_recommendations_df,
                                 unmatched_transactions_df,
                                 unmatched_proofs_df,
+                                database=self.database,
                             )
                         )
 
@@ -62,3 +62,31 @@ Example output:
  ('7-Eleven Japan', 1200.00, '03-05-2023', 'JPY'),
  ('Paris Café', 9.80, '04-18-2023', 'EUR')]
 """
+
+MULTI_RECEIPT_PROMPT = """
+You are given {count} receipt images. Each image follows a label "Image N:",
+numbered from 1.
+
+For every image, extract the following for each transaction on it:
+- Business name (string)
+- Final charged total amount only (numeric, without any currency symbol or code)
+- Transaction date (in mm-dd-yyyy format)
+- Currency (as an uppercase 3-letter ISO 4217 currency code, e.g., USD, EUR, GBP, JPY)
+
+Rules for amount extraction:
+- Use the final paid amount (often labeled as TOTAL, AMOUNT PAID, GRAND TOTAL).
+- Do not use subtotal, tax, tip, discount, balance due, or line-item totals.
+- Keep cents precision exactly as shown on the receipt.
+
+Recognize and handle currency in either:
+- Symbol form: $, €, £, ¥, ₩, ₹, ₱, etc.
+- Code form: USD, EUR, GBP, JPY, KRW, INR, PHP, etc.
+
+If no currency symbol or code is present, assume the currency is USD.
+
+Read each image on its own; never mix values between images.
+
+Return only JSON with exactly one item per image, in this shape:
+{{"items": [{{"image": 1, "transactions": [["Starbucks", 5.00, "01-15-2023", "USD"]]}},
+           {{"image": 2, "transactions": [["Pret A Manger", 7.50, "02-12-2023", "GBP"]]}}]}}
+"""
@@ -2,7 +2,7 @@ import requests
 import asyncio
 import pandas as pd
 from src.utils.utils import load_exchange_rate_key
-from datetime import datetime
+from src.utils.dates import normalize_date
 
 
 access_key = load_exchange_rate_key()
@@ -20,7 +20,8 @@ def _normalize_date(date_str: str) -> str:
     """
     Normalise a date string of various formats to ``YYYY-MM-DD`` for exchange rate API calls.
 
-    Tries ``%m-%d-%Y`` first, then falls back through a list of other common formats.
+    Uses the shared, memoised parser in ``src.utils.dates``, which tries
+    ``%m-%d-%Y`` first and then the other known formats.
 
     Args:
         date_str: Input date string in any of the supported formats.
@@ -31,17 +32,9 @@ def _normalize_date(date_str: str) -> str:
     Raises:
         ValueError: If the date string does not match any recognised format.
     """
-    try:
-        parsed_date = datetime.strptime(date_str, "%m-%d-%Y")
-    except ValueError:
-        for fmt in ("%d-%m-%Y", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d"):
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                break
-            except ValueError:
-                continue
-        else:
-            raise ValueError(f"Unrecognized date format: {date_str}")
+    parsed_date = normalize_date(date_str)
+    if pd.isna(parsed_date):
+        raise ValueError(f"Unrecognized date format: {date_str}")
 
     return parsed_date.strftime("%Y-%m-%d")
 
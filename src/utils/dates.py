@@ -0,0 +1,200 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Formats tried before falling back to free-form parsing. The extraction prompts
+# ask the LLM for mm-dd-yyyy, so that and ISO dates cover almost every row.
+KNOWN_DATE_FORMATS = (
+    "%m-%d-%Y",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+)
+
+DATE_TOKEN_PATTERN = r"(\d{4}[-/]\d{1,2}[-/]\d{1,2}|\d{1,2}[-/]\d{1,2}[-/]\d{2,4})"
+
+DATE_CACHE_SIZE = 4096
+
+
+class _DateCache:
+    """
+    Thread-safe bounded LRU mapping raw date strings to parsed ``Timestamp`` values.
+
+    Statements repeat the same few dozen date strings thousands of times, so
+    parsed values (including ``NaT`` failures) are memoised by raw string.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, pd.Timestamp] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: list[str]) -> tuple[dict[str, pd.Timestamp], list[str]]:
+        """
+        Look up several raw strings at once.
+
+        Args:
+            keys: Unique raw date strings.
+
+        Returns:
+            A tuple ``(found, missing)`` of cached values and uncached keys.
+        """
+        found: dict[str, pd.Timestamp] = {}
+        missing: list[str] = []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                else:
+                    missing.append(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, values: dict[str, pd.Timestamp]) -> None:
+        """
+        Insert parsed values, evicting the least recently used entries when full.
+
+        Args:
+            values: Mapping of raw date string to parsed ``Timestamp`` or ``NaT``.
+        """
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_date_cache = _DateCache(DATE_CACHE_SIZE)
+
+
+def _parse_free_form(values: pd.Series) -> pd.Series:
+    """
+    Parse values element-wise with pandas' free-form date parser.
+
+    Args:
+        values: String Series that did not match any known format.
+
+    Returns:
+        Series of ``Timestamp`` or ``NaT`` aligned to *values*.
+    """
+    parsed = [pd.to_datetime(value, errors="coerce") for value in values]
+    # Drop any offset so timezone-stamped strings land on their local calendar day
+    parsed = [
+        value.tz_localize(None) if pd.notna(value) and value.tzinfo else value
+        for value in parsed
+    ]
+    return pd.Series(parsed, index=values.index, dtype="datetime64[ns]")
+
+
+def _parse_uncached(raw: pd.Series) -> pd.Series:
+    """
+    Parse unique raw date strings, cheapest strategy first.
+
+    Each known format is applied to all still-unparsed values in one vectorised
+    ``pd.to_datetime`` call. Leftovers go through free-form parsing and finally
+    through regex extraction of a date-shaped token from noisy text.
+
+    Args:
+        raw: Series of unique, stripped date strings.
+
+    Returns:
+        Series of midnight-normalised ``Timestamp`` or ``NaT`` aligned to *raw*.
+    """
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+
+    for fmt in KNOWN_DATE_FORMATS:
+        pending = parsed.isna()
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(raw[pending], format=fmt, errors="coerce")
+
+    pending = parsed.isna()
+    if pending.any():
+        parsed[pending] = _parse_free_form(raw[pending])
+
+    # Fall back to extracting a recognisable date substring from noisy text
+    pending = parsed.isna()
+    if pending.any():
+        tokens = raw[pending].str.extract(DATE_TOKEN_PATTERN, expand=False).dropna()
+        if not tokens.empty:
+            parsed[tokens.index] = _parse_free_form(tokens)
+
+    return parsed.dt.normalize()
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Parse a Series of raw or noisy date values into midnight ``Timestamp`` values.
+
+    Parsing happens once per unique raw string; results are memoised in a
+    bounded LRU cache shared by every caller in the process.
+
+    Args:
+        values: Series of date values (strings, ``date``/``datetime`` objects, etc.).
+
+    Returns:
+        A ``datetime64`` Series aligned to *values*, with ``NaT`` where parsing failed.
+    """
+    if len(values) == 0:
+        return pd.Series([], index=values.index, dtype="datetime64[ns]")
+
+    raw = values.astype(str).str.strip()
+    unique_raw = list(dict.fromkeys(raw.tolist()))
+
+    found, missing = _date_cache.get_many(unique_raw)
+    if missing:
+        fresh = _parse_uncached(pd.Series(missing, dtype=object))
+        parsed_missing = dict(zip(missing, fresh.tolist()))
+        _date_cache.put_many(parsed_missing)
+        found.update(parsed_missing)
+
+    return pd.to_datetime(raw.map(found))
+
+
+def normalize_date(value: object) -> pd.Timestamp:
+    """
+    Parse a single raw or noisy date value into a midnight ``Timestamp`` or ``NaT``.
+
+    Args:
+        value: Any value that may represent a date.
+
+    Returns:
+        A ``pd.Timestamp`` normalised to midnight, or ``pd.NaT`` on failure.
+    """
+    return parse_dates(pd.Series([value], dtype=object)).iloc[0]
+
+
+def date_cache_info() -> dict[str, int]:
+    """Return size and hit/miss counters for the shared date cache."""
+    return _date_cache.info()
+
+
+def clear_date_cache() -> None:
+    """Empty the shared date cache."""
+    _date_cache.clear()
@@ -0,0 +1,216 @@
+import io
+import math
+import os
+
+from PIL import Image
+
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+JPEG_MAX_QUALITY = 90
+# Receipt text stays legible down to here; below it the image is resized
+JPEG_MIN_QUALITY = 40
+# Quality search stops once the bracket is this narrow
+JPEG_QUALITY_STEP = 5
+
+MAX_ENCODE_ATTEMPTS = 8
+
+# Resizes aim slightly under the budget so one pass is almost always enough
+_RESIZE_HEADROOM = 0.9
+
+# Quality probes aim for this share of the budget and accept from the next one
+_TARGET_FILL = 0.95
+_ACCEPT_FILL = 0.8
+
+# Typical size at JPEG_MIN_QUALITY relative to JPEG_MAX_QUALITY for photos
+_FLOOR_SIZE_RATIO = 0.2
+
+
+def encode_jpeg(img: Image.Image, quality: int) -> bytes:
+    """
+    Encode an image as JPEG.
+
+    Args:
+        img: Image in a JPEG-compatible mode.
+        quality: JPEG quality, ``1``-``95``.
+
+    Returns:
+        The encoded bytes.
+    """
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def fit_dimensions(
+    size: tuple[int, int], encoded_bytes: int, max_bytes: int
+) -> tuple[int, int]:
+    """
+    Estimate the dimensions at which an encode of *encoded_bytes* fits.
+
+    JPEG output grows roughly linearly with pixel count at a fixed quality, so
+    both sides are scaled by ``sqrt(max_bytes / encoded_bytes)``.
+
+    Args:
+        size: Current ``(width, height)``.
+        encoded_bytes: Size of an encode at the current dimensions.
+        max_bytes: Byte budget.
+
+    Returns:
+        ``(width, height)`` no larger than *size*.
+    """
+    scale = min(1.0, math.sqrt(max_bytes * _RESIZE_HEADROOM / max(1, encoded_bytes)))
+    width, height = size
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def _search_quality(
+    img: Image.Image, max_bytes: int, top_bytes: float, attempts: int
+) -> tuple[bytes | None, int, int]:
+    """
+    Find a high JPEG quality that fits *max_bytes* by interpolated bisection.
+
+    Output size grows exponentially with quality, so each probe interpolates
+    ``log(size)`` between the bracket ends; the floor end starts as a guess.
+    The search stops at a result filling ``_ACCEPT_FILL`` of the budget, once
+    the bracket is ``JPEG_QUALITY_STEP`` wide, or after *attempts* encodes.
+
+    Args:
+        img: Image to encode.
+        max_bytes: Byte budget.
+        top_bytes: Size, measured or estimated, at ``JPEG_MAX_QUALITY``.
+        attempts: Encodes allowed; the floor is still tried if nothing fit.
+
+    Returns:
+        A tuple ``(best, encodes, floor_bytes)``. *best* is ``None`` when even
+        ``JPEG_MIN_QUALITY`` is too large, whose size is then *floor_bytes*.
+    """
+    target = math.log(max_bytes * _TARGET_FILL)
+    high, high_size = JPEG_MAX_QUALITY, math.log(max(1.0, top_bytes))
+    low = JPEG_MIN_QUALITY
+    low_size = high_size + math.log(_FLOOR_SIZE_RATIO)
+    low_measured = False
+    best = None
+    encodes = 0
+
+    while high - low > JPEG_QUALITY_STEP and encodes < attempts:
+        if low_size >= target:
+            quality = low
+        else:
+            share = (target - low_size) / max(high_size - low_size, 1e-9)
+            quality = low + round(share * (high - low))
+            quality = min(max(quality, low + int(low_measured)), high - 1)
+        encodes += 1
+        data = encode_jpeg(img, quality)
+        if len(data) > max_bytes:
+            if quality == JPEG_MIN_QUALITY:
+                return None, encodes, len(data)
+            high, high_size = quality, math.log(len(data))
+            continue
+        low, low_size, low_measured, best = quality, math.log(len(data)), True, data
+        if len(data) >= max_bytes * _ACCEPT_FILL:
+            break
+
+    if best is None:
+        encodes += 1
+        best = encode_jpeg(img, JPEG_MIN_QUALITY)
+        if len(best) > max_bytes:
+            return None, encodes, len(best)
+    return best, encodes, len(best)
+
+
+def _shrink(
+    img: Image.Image, floor_bytes: float, max_bytes: int
+) -> tuple[Image.Image, float]:
+    """
+    Resize *img* to where a ``JPEG_MIN_QUALITY`` encode should fit.
+
+    Args:
+        img: Image to shrink.
+        floor_bytes: Size, measured or estimated, at ``JPEG_MIN_QUALITY``.
+        max_bytes: Byte budget.
+
+    Returns:
+        A tuple ``(image, pixel_ratio)``; *image* is *img* itself when it
+        already fits.
+    """
+    size = fit_dimensions(img.size, floor_bytes, max_bytes)
+    if size == img.size:
+        return img, 1.0
+    pixels = img.size[0] * img.size[1]
+    img = img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+    return img, img.size[0] * img.size[1] / pixels
+
+
+def compress_image(
+    image_path: str | Image.Image,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_attempts: int = MAX_ENCODE_ATTEMPTS,
+) -> tuple[io.BytesIO, int]:
+    """
+    Re-encode an image as a JPEG of at most *max_bytes*.
+
+    JPEG sources at least four times over budget are decoded at 1/2, 1/4 or
+    1/8 scale with ``Image.draft``, sized from the file's bytes per pixel. The
+    image is then encoded at ``JPEG_MAX_QUALITY`` and returned if it fits.
+    Otherwise quality is searched down to ``JPEG_MIN_QUALITY``; if even that is
+    too large the image is resized in one step from its pixel count and
+    searched again. Once *max_attempts* is nearly spent, the image is resized
+    straight to the estimated fitting dimensions and encoded one last time at
+    ``JPEG_MIN_QUALITY``.
+
+    Args:
+        image_path: Path to the source image file, or an already loaded image
+            (which skips the draft decode).
+        max_bytes: Largest acceptable output size.
+        max_attempts: Most encodes in total, across every resize; at least two.
+
+    Returns:
+        A tuple ``(buffer, encodes)``: the JPEG at position 0 and the number of
+        encodes it took.
+
+    Raises:
+        ValueError: If the image cannot shrink further and still exceeds
+            *max_bytes*.
+    """
+    img = Image.open(image_path) if isinstance(image_path, str) else image_path
+    if isinstance(image_path, str) and img.format == "JPEG":
+        file_bytes = os.path.getsize(image_path)
+        if file_bytes > max_bytes:
+            # draft only picks DCT scales that keep at least the requested size
+            img.draft("RGB", fit_dimensions(img.size, file_bytes, max_bytes))
+
+    # Convert palette/alpha modes to RGB for JPEG compatibility
+    if img.mode not in ("RGB", "L", "CMYK"):
+        img = img.convert("RGB")
+
+    max_attempts = max(2, max_attempts)
+    encodes = 1
+    data = encode_jpeg(img, JPEG_MAX_QUALITY)
+    if len(data) <= max_bytes:
+        return io.BytesIO(data), encodes
+
+    top_bytes = float(len(data))
+    floor_bytes = top_bytes * _FLOOR_SIZE_RATIO
+    # The last encode is kept for the floor-quality fallback below
+    while max_attempts - encodes >= 2:
+        best, used, floor_bytes = _search_quality(
+            img, max_bytes, top_bytes, max_attempts - encodes - 2
+        )
+        encodes += used
+        if best is not None:
+            return io.BytesIO(best), encodes
+
+        img, ratio = _shrink(img, floor_bytes, max_bytes)
+        if ratio == 1.0:
+            raise ValueError(f"Cannot compress {image_path} to {max_bytes} bytes.")
+        # Sizes scale with pixel count, so they are estimated, not encoded
+        top_bytes *= ratio
+        floor_bytes *= ratio
+
+    img, _ = _shrink(img, floor_bytes, max_bytes)
+    encodes += 1
+    data = encode_jpeg(img, JPEG_MIN_QUALITY)
+    if len(data) > max_bytes:
+        raise ValueError(f"Cannot compress {image_path} to {max_bytes} bytes.")
+    return io.BytesIO(data), encodes
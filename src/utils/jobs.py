@@ -0,0 +1,300 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import monotonic, time
+from typing import Any, Callable
+
+JOB_STATES = ("queued", "running", "done", "failed")
+FINISHED_STATES = ("done", "failed")
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the queue already holds its maximum number of pending jobs."""
+
+
+class SessionBusy(RuntimeError):
+    """Raised when a session already has a queued or running job."""
+
+
+@dataclass
+class Job:
+    """
+    One background pipeline run and everything reported about it.
+
+    Attributes:
+        job_id: Unique job identifier.
+        session_id: Session the job belongs to.
+        status: One of ``JOB_STATES``.
+        stage: Name of the stage currently running, if any.
+        steps: Total number of stages the pipeline reports, when known.
+        stage_seconds: Wall time of every finished stage, in order.
+        events: ``(event, payload)`` pairs in the order they were reported.
+        result: Pipeline return value once ``status`` is ``"done"``.
+        error: Error message once ``status`` is ``"failed"``.
+        error_status: HTTP-style status for the failure (``500`` unless the
+            pipeline raised an exception with a ``status`` attribute).
+        created_at: Submit time as a Unix timestamp.
+        started_at: Start time as a Unix timestamp.
+        finished_at: Finish time as a Unix timestamp.
+    """
+
+    job_id: str
+    session_id: str
+    status: str = "queued"
+    stage: str | None = None
+    steps: int | None = None
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    events: list[tuple[str, dict]] = field(default_factory=list)
+    result: Any = None
+    error: str | None = None
+    error_status: int = 500
+    created_at: float = field(default_factory=time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    _stage_started: float | None = field(default=None, repr=False)
+    _changed: threading.Condition = field(
+        default_factory=threading.Condition, repr=False
+    )
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has completed or failed."""
+        return self.status in FINISHED_STATES
+
+    def _close_stage(self):
+        """Record the running stage's wall time; call with ``_changed`` held."""
+        if self.stage is not None and self._stage_started is not None:
+            self.stage_seconds[self.stage] = round(monotonic() - self._stage_started, 3)
+        self._stage_started = None
+
+    def _emit(self, event: str, payload: dict):
+        """Append an event and wake waiters; call with ``_changed`` held."""
+        self.events.append((event, {"jobId": self.job_id, **payload}))
+        self._changed.notify_all()
+
+    def report(self, stage: str, **details: Any):
+        """
+        Mark the start of a pipeline stage, closing the previous one.
+
+        Args:
+            stage: Stage name.
+            **details: Extra JSON-ready fields for the ``stage`` event.
+        """
+        with self._changed:
+            self._close_stage()
+            self.stage = stage
+            self._stage_started = monotonic()
+            self._emit(
+                "stage",
+                {
+                    "stage": stage,
+                    "step": len(self.stage_seconds) + 1,
+                    "steps": self.steps,
+                    "stageSeconds": dict(self.stage_seconds),
+                    **details,
+                },
+            )
+
+    def _start(self):
+        with self._changed:
+            self.status = "running"
+            self.started_at = time()
+            self._emit("running", {"status": self.status})
+
+    def _finish(self, result: Any = None, error: BaseException | None = None):
+        with self._changed:
+            self._close_stage()
+            self.stage = None
+            self.finished_at = time()
+            if error is None:
+                self.status = "done"
+                self.result = result
+                self._emit("done", {"stageSeconds": dict(self.stage_seconds)})
+            else:
+                self.status = "failed"
+                self.error = str(error)
+                self.error_status = int(getattr(error, "status", 500))
+                self._emit(
+                    "error",
+                    {"error": self.error, "stageSeconds": dict(self.stage_seconds)},
+                )
+
+    def wait(self, seen: int, timeout: float) -> list[tuple[str, dict]]:
+        """
+        Block until there are events past *seen* or *timeout* elapses.
+
+        Args:
+            seen: Number of events the caller has already consumed.
+            timeout: Seconds to wait for a new event.
+
+        Returns:
+            The events after *seen*; empty when the wait timed out.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: len(self.events) > seen or self.finished, timeout
+            )
+            return list(self.events[seen:])
+
+    def wait_finished(self, timeout: float | None = None) -> bool:
+        """
+        Block until the job completes or fails.
+
+        Args:
+            timeout: Seconds to wait; ``None`` waits indefinitely.
+
+        Returns:
+            Whether the job finished within *timeout*.
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: self.finished, timeout)
+
+    def snapshot(self) -> dict:
+        """
+        Return the job's status as a JSON-ready dict.
+
+        Returns:
+            Dict with ``jobId``, ``sessionId``, ``status``, ``stage``,
+            ``step``, ``steps``, ``stageSeconds``, timestamps and ``error``.
+        """
+        with self._changed:
+            running = 1 if self.stage is not None else 0
+            return {
+                "jobId": self.job_id,
+                "sessionId": self.session_id,
+                "status": self.status,
+                "stage": self.stage,
+                "step": len(self.stage_seconds) + running,
+                "steps": self.steps,
+                "stageSeconds": dict(self.stage_seconds),
+                "createdAt": self.created_at,
+                "startedAt": self.started_at,
+                "finishedAt": self.finished_at,
+                "error": self.error,
+            }
+
+
+class JobQueue:
+    """
+    In-process job runner with a bounded worker pool.
+
+    At most ``workers`` jobs run at once and at most ``max_pending`` more wait
+    in the queue; further submits are refused rather than queued without
+    bound. A session can only have one active job, so two runs never write the
+    same session state concurrently. Finished jobs are kept for
+    ``retention_seconds`` so their results can be fetched.
+    """
+
+    def __init__(
+        self, workers: int = 2, max_pending: int = 16, retention_seconds: int = 3600
+    ):
+        """
+        Initialize the queue and its worker threads.
+
+        Args:
+            workers: Jobs that run concurrently.
+            max_pending: Jobs allowed to wait for a worker.
+            retention_seconds: How long finished jobs stay fetchable.
+        """
+        self.workers = max(1, int(workers))
+        self.max_pending = max(0, int(max_pending))
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="validation-job"
+        )
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        """Forget finished jobs past retention; call with ``_lock`` held."""
+        cutoff = time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and (job.finished_at or 0) < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(
+        self,
+        session_id: str,
+        pipeline: Callable[[Job], Any],
+        cleanup: Callable[[], None] | None = None,
+        steps: int | None = None,
+    ) -> Job:
+        """
+        Queue a pipeline run.
+
+        Args:
+            session_id: Session the run belongs to.
+            pipeline: Callable receiving the ``Job``; it reports stages through
+                ``Job.report`` and returns the job result.
+            cleanup: Optional callable run after the pipeline, even on failure.
+            steps: Number of stages *pipeline* reports, for progress.
+
+        Returns:
+            The queued ``Job``.
+
+        Raises:
+            SessionBusy: If *session_id* already has an active job.
+            JobQueueFull: If ``workers + max_pending`` jobs are active.
+        """
+        with self._lock:
+            self._prune()
+            active = [job for job in self._jobs.values() if not job.finished]
+            if any(job.session_id == session_id for job in active):
+                raise SessionBusy(
+                    f"Session {session_id} already has a validation job running."
+                )
+            if len(active) >= self.workers + self.max_pending:
+                raise JobQueueFull("Too many validation jobs queued; retry shortly.")
+
+            job = Job(job_id=uuid.uuid4().hex, session_id=session_id, steps=steps)
+            with job._changed:
+                job._emit("queued", {"status": job.status})
+            self._jobs[job.job_id] = job
+            self._executor.submit(self._run, job, pipeline, cleanup)
+        return job
+
+    @staticmethod
+    def _run(
+        job: Job,
+        pipeline: Callable[[Job], Any],
+        cleanup: Callable[[], None] | None,
+    ):
+        """Run one job on a worker thread and record its outcome."""
+        job._start()
+        try:
+            result = pipeline(job)
+        except Exception as exc:
+            job._finish(error=exc)
+        else:
+            job._finish(result=result)
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Identifier returned by ``submit``.
+
+        Returns:
+            The ``Job``, or ``None`` when unknown or expired.
+        """
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting work and release the worker threads.
+
+        Args:
+            wait: Whether to wait for running jobs to finish.
+        """
+        self._executor.shutdown(wait=wait)
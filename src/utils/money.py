@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+
+# Integer minor units for ``total``, derived by ``frame_cents`` when rows are
+# matched or saved, so matching and aggregation never compare or sum binary floats.
+CENTS_COLUMN = "total_cents"
+
+
+def to_cents(values: pd.Series) -> pd.Series:
+    """
+    Convert monetary amounts to integer cents.
+
+    Amounts are rounded half-to-even at the cent, so float noise such as
+    ``0.1 + 0.2`` lands on the same value as ``0.3``.
+
+    Args:
+        values: Series of amounts (numbers or numeric strings).
+
+    Returns:
+        Nullable ``Int64`` Series aligned to *values*; unparseable and
+        non-finite amounts become ``<NA>``.
+    """
+    amounts = pd.to_numeric(values, errors="coerce").astype(float).to_numpy()
+    amounts[~np.isfinite(amounts)] = np.nan
+    return pd.Series(np.rint(amounts * 100), index=values.index).astype("Int64")
+
+
+def from_cents(cents: pd.Series) -> pd.Series:
+    """
+    Convert integer cents back to float amounts for display.
+
+    Args:
+        cents: Series of integer cents, possibly nullable.
+
+    Returns:
+        Float Series aligned to *cents*, ``nan`` where cents are missing.
+    """
+    return cents.astype("Float64").astype(float) / 100
+
+
+def frame_cents(frame: pd.DataFrame, suffix: str = "") -> pd.Series:
+    """
+    Return a frame's amounts in cents, derived from ``total``.
+
+    ``total`` always wins, so rows edited after ingestion never keep stale
+    cents. A stored ``total_cents`` only fills rows whose total is missing or
+    unparseable; non-integral or non-finite stored cents count as missing.
+
+    Args:
+        frame: Rows with a ``total`` column and optionally ``total_cents``.
+        suffix: Column suffix, e.g. ``"_proof"`` for ``total_proof`` and
+            ``total_cents_proof`` in a merged frame.
+
+    Returns:
+        Nullable ``Int64`` Series aligned to *frame*.
+    """
+    cents = to_cents(frame[f"total{suffix}"])
+    column = f"{CENTS_COLUMN}{suffix}"
+    missing = cents.isna()
+    if column not in frame.columns or not missing.any():
+        return cents
+
+    stored = pd.to_numeric(frame.loc[missing, column], errors="coerce").astype(float)
+    whole = np.isfinite(stored) & (stored == np.rint(stored))
+    cents[missing] = stored.where(whole).astype("Int64")
+    return cents
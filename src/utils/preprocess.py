@@ -0,0 +1,224 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+
+# Gemini bills images in 768px tiles of 258 tokens; small images are one tile
+GEMINI_TILE_PIXELS = 768
+GEMINI_TILE_TOKENS = 258
+_SMALL_IMAGE_PIXELS = 384
+
+# A contour must cover this share of the photo to count as the document
+_MIN_DOCUMENT_AREA = 0.2
+# Larger angles are page orientation, not skew, and are left alone
+_MAX_SKEW_DEGREES = 15.0
+_MIN_SKEW_DEGREES = 0.5
+
+
+@dataclass(frozen=True)
+class PreprocessSettings:
+    """
+    Image preprocessing applied before receipts are uploaded.
+
+    Attributes:
+        enabled: Whether to preprocess at all.
+        grayscale: Drop colour channels.
+        deskew: Rotate text lines level.
+        crop: Crop to the largest document-like contour.
+        max_side: Longest side after downscaling, in pixels.
+    """
+
+    enabled: bool = False
+    grayscale: bool = True
+    deskew: bool = True
+    crop: bool = True
+    max_side: int = 1536
+
+    @classmethod
+    def from_config(cls, config: object) -> "PreprocessSettings":
+        """
+        Read the ``preprocess`` block of the app config.
+
+        Args:
+            config: Parsed HOCON config.
+
+        Returns:
+            Settings with defaults for missing keys.
+        """
+
+        def flag(key: str, default: bool) -> bool:
+            return str(config.get(f"preprocess.{key}", default)).lower() == "true"
+
+        return cls(
+            enabled=flag("enabled", cls.enabled),
+            grayscale=flag("grayscale", cls.grayscale),
+            deskew=flag("deskew", cls.deskew),
+            crop=flag("crop", cls.crop),
+            max_side=int(config.get("preprocess.max_side", cls.max_side)),
+        )
+
+    def cache_tag(self) -> str:
+        """Identify the settings' output for extraction cache keys."""
+        if not self.enabled:
+            return ""
+        return (
+            f"preprocess:g{int(self.grayscale)}d{int(self.deskew)}"
+            f"c{int(self.crop)}m{self.max_side}"
+        )
+
+
+def estimate_image_tokens(size: tuple[int, int]) -> int:
+    """
+    Estimate the Gemini input tokens of an image from its dimensions.
+
+    Args:
+        size: ``(width, height)`` in pixels.
+
+    Returns:
+        ``GEMINI_TILE_TOKENS`` per 768px tile, or one tile for small images.
+    """
+    width, height = size
+    if width <= _SMALL_IMAGE_PIXELS and height <= _SMALL_IMAGE_PIXELS:
+        return GEMINI_TILE_TOKENS
+    tiles = math.ceil(width / GEMINI_TILE_PIXELS) * math.ceil(
+        height / GEMINI_TILE_PIXELS
+    )
+    return tiles * GEMINI_TILE_TOKENS
+
+
+def _fold_angle(rect: tuple) -> tuple[tuple[float, float], float]:
+    """
+    Fold a ``cv2.minAreaRect`` angle into ``(-45, 45]`` degrees.
+
+    Args:
+        rect: ``((cx, cy), (width, height), angle)`` with angle in ``(0, 90]``.
+
+    Returns:
+        A tuple ``((width, height), angle)`` describing the same rectangle.
+    """
+    (width, height), angle = rect[1], rect[2]
+    if angle > 45:
+        return (height, width), angle - 90
+    return (width, height), angle
+
+
+def _document_rect(gray: np.ndarray) -> tuple | None:
+    """
+    Find the rotated rectangle of the largest bright, document-like contour.
+
+    Args:
+        gray: 8-bit grayscale image.
+
+    Returns:
+        A ``cv2.minAreaRect`` result, or ``None`` when nothing covers
+        ``_MIN_DOCUMENT_AREA`` of the image.
+    """
+    import cv2
+
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, mask = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Close the gaps text lines leave in the paper
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((15, 15), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+    largest = max(contours, key=cv2.contourArea)
+    if cv2.contourArea(largest) < _MIN_DOCUMENT_AREA * gray.size:
+        return None
+    return cv2.minAreaRect(largest)
+
+
+def _ink_angle(gray: np.ndarray) -> float:
+    """
+    Measure the skew of dark text pixels, for photos without a paper edge.
+
+    Args:
+        gray: 8-bit grayscale image.
+
+    Returns:
+        Skew in degrees, folded into ``(-45, 45]``.
+    """
+    import cv2
+
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    points = cv2.findNonZero(ink)
+    if points is None or len(points) < 10:
+        return 0.0
+    return _fold_angle(cv2.minAreaRect(points))[1]
+
+
+def _level(angle: float) -> float:
+    """Return *angle* if it is worth correcting as skew, else ``0.0``."""
+    return angle if _MIN_SKEW_DEGREES <= abs(angle) <= _MAX_SKEW_DEGREES else 0.0
+
+
+def preprocess_image(image_path: str, settings: PreprocessSettings) -> Image.Image:
+    """
+    Crop, deskew, grayscale and downscale a receipt photo for upload.
+
+    When the receipt's paper edge is found, its rotated rectangle gives both
+    the skew and the crop; otherwise the skew is measured from the text. JPEGs
+    are decoded with ``Image.draft`` close to the final resolution, so the
+    full-size photo is never materialised.
+
+    Args:
+        image_path: Path to the source image.
+        settings: Steps to apply; ``settings.enabled`` is not checked here.
+
+    Returns:
+        The processed image, in mode ``L`` or ``RGB``.
+    """
+    # Lazy import keeps OpenCV off the import path when preprocessing is off
+    import cv2
+
+    mode = "L" if settings.grayscale else "RGB"
+    img = Image.open(image_path)
+    if img.format == "JPEG":
+        # Cropping drops pixels, so decode at twice the target to keep detail
+        img.draft(mode, (settings.max_side * 2, settings.max_side * 2))
+    pixels = np.asarray(img.convert(mode))
+    gray = pixels if mode == "L" else cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY)
+    height, width = gray.shape
+
+    document = _document_rect(gray) if settings.crop or settings.deskew else None
+    if document is not None:
+        center = document[0]
+        (box_width, box_height), angle = _fold_angle(document)
+    else:
+        center, (box_width, box_height) = (width / 2, height / 2), (width, height)
+        angle = _ink_angle(gray) if settings.deskew else 0.0
+    angle = _level(angle) if settings.deskew else 0.0
+
+    if angle:
+        rotation = cv2.getRotationMatrix2D(center, angle, 1.0)
+        pixels = cv2.warpAffine(
+            pixels,
+            rotation,
+            (width, height),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+
+    if settings.crop and document is not None:
+        # After the rotation the document is level; otherwise take its extent
+        corners = (
+            cv2.boxPoints((center, (box_width, box_height), 0))
+            if angle
+            else cv2.boxPoints(document)
+        )
+        left, top = np.maximum(corners.min(axis=0), 0).astype(int)
+        right, bottom = np.ceil(corners.max(axis=0)).astype(int)
+        pixels = pixels[top:bottom, left:right]
+
+    height, width = pixels.shape[:2]
+    scale = settings.max_side / max(height, width)
+    if scale < 1:
+        pixels = cv2.resize(
+            pixels,
+            (max(1, round(width * scale)), max(1, round(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    return Image.fromarray(np.ascontiguousarray(pixels), mode)
@@ -122,3 +122,23 @@ def create_session_id() -> str:
         A new UUID4 string in hyphenated format (e.g. ``"xxxxxxxx-xxxx-..."``).
     """
     return str(uuid.uuid4())
+
+
+def strip_code_fence(text: str) -> str:
+    """
+    Remove a markdown code fence wrapper (``` ... ```) if present.
+
+    Args:
+        text: Raw string that may be wrapped in a triple-backtick fence.
+
+    Returns:
+        The inner content with fence markers and language hint stripped,
+        or the original string if no fence was detected.
+    """
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        lines = stripped.splitlines()
+        # A valid fence has at least an opening line, content, and closing line
+        if len(lines) >= 3:
+            return "\n".join(lines[1:-1]).strip()
+    return stripped
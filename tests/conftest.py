@@ -3,8 +3,11 @@ import random
 
 import pandas as pd
 import pytest
+from pyhocon import ConfigFactory
 
 
+INPUT_COLUMNS = ["business_name", "total", "date", "currency"]
+
 BUSINESSES = [
     ("Starbucks", "Food"),
     ("Chipotle", "Food"),
@@ -31,6 +34,20 @@ BUSINESSES = [
 ]
 
 
+def input_frame(rows: list) -> pd.DataFrame:
+    """Build validator input from ``[name, total, date]`` rows, currency optional."""
+    width = len(rows[0]) if len(rows) else 3
+    return pd.DataFrame(rows, columns=INPUT_COLUMNS[:width])
+
+
+@pytest.fixture
+def config():
+    """App config with LLM categorization switched off."""
+    parsed = ConfigFactory.parse_file("config/config.conf")
+    parsed.put("categorize.enabled", False)
+    return parsed
+
+
 def generate_mock_validated_transactions(count: int = 30) -> list[dict]:
     """Generate deterministic validated rows used across unit tests."""
     random.seed(42)
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticSpec, synthesize_pairs
+
+
+def test_synthetic_pairs_follow_the_spec():
+    spec = SyntheticSpec(size=200, name_noise=0.0, date_lag=3, unmatched_ratio=0.25)
+    transactions, proofs = synthesize_pairs(spec)
+
+    assert len(transactions) == len(proofs) == 200
+    assert transactions.equals(synthesize_pairs(spec)[0])
+
+    paired = transactions.iloc[:150].merge(
+        proofs, on=["business_name", "total"], suffixes=("_tx", "_pr")
+    )
+    lag = (
+        pd.to_datetime(paired["date_tx"]) - pd.to_datetime(paired["date_pr"])
+    ).dt.days
+    assert paired["business_name"].nunique() > 1
+    assert len(paired) >= 150
+    assert lag.between(0, 3).sum() >= 150
@@ -0,0 +1,53 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.data.database import DataBase
+from src.utils.dates import clear_date_cache, date_cache_info, parse_dates
+
+
+def test_parse_dates_handles_known_free_form_and_noisy_values():
+    values = pd.Series(
+        [
+            "03-08-2026",
+            "2026-03-08",
+            "03/08/2026",
+            "March 8, 2026",
+            "Date: 2026-03-08",
+            "2026-03-08 14:35:00",
+            datetime.date(2026, 3, 8),
+        ]
+    )
+
+    parsed = parse_dates(values)
+
+    assert (parsed == pd.Timestamp("2026-03-08")).all()
+
+
+def test_parse_dates_returns_nat_for_unparseable_values():
+    parsed = parse_dates(pd.Series(["not a date", None, "2024-02-20"]))
+
+    assert parsed.isna().tolist() == [True, True, False]
+
+
+def test_parse_dates_parses_each_unique_string_once():
+    clear_date_cache()
+    values = pd.Series(["01-15-2023", "01-16-2023"] * 500)
+
+    parse_dates(values)
+    parse_dates(values)
+
+    info = date_cache_info()
+    assert info["misses"] == 2
+    assert info["hits"] == 2
+    assert info["size"] == 2
+
+
+def test_database_date_normalization_uses_shared_parser():
+    dates = DataBase._normalize_date_series(pd.Series(["01-15-2023", "2023/01/16"]))
+
+    assert dates.tolist() == [datetime.date(2023, 1, 15), datetime.date(2023, 1, 16)]
+
+    with pytest.raises(ValueError):
+        DataBase._normalize_date_series(pd.Series(["not a date"]))
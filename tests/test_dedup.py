@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+
+from src.intelligence.dedup import find_duplicates
+from src.intelligence.validator import Validator
+from tests.conftest import input_frame
+
+
+@pytest.fixture
+def config(config):
+    config.put("dedup.enabled", True)
+    return config
+
+
+def _keys(rows):
+    names, cents, dates = zip(*rows) if rows else ([], [], [])
+    return (
+        pd.Series(names, dtype=object),
+        pd.Series(cents, dtype="Int64"),
+        pd.Series(dates, dtype=object),
+    )
+
+
+def test_exact_and_near_duplicates_collapse_into_the_earliest_row():
+    rows = [
+        ["starbucks", 525, "2024-03-03"],
+        ["starbucks", 525, "2024-03-01"],
+        ["starbucks", 525, "2024-03-01"],
+        ["starbucks", 525, "2024-03-09"],
+        ["starbucks", 650, "2024-03-01"],
+        ["cafe", 100, "unknown"],
+        ["cafe", 100, "unknown"],
+        ["cafe", None, "2024-03-01"],
+        ["cafe", None, "2024-03-01"],
+    ]
+
+    duplicate_of = find_duplicates(*_keys(rows), *_keys([]), date_window_days=2)
+
+    assert duplicate_of.tolist() == [1, -1, 1, -1, -1, -1, 5, -1, -1]
+    exact_only = find_duplicates(*_keys(rows), *_keys([]), date_window_days=0)
+    assert exact_only.tolist() == [-1, -1, 1, -1, -1, -1, 5, -1, -1]
+
+
+def test_rows_with_their_own_counterpart_are_kept():
+    rows = [["starbucks", 525, "2024-03-01"]] * 3
+    receipts = [["starbucks", 525, "2024-03-01"]] * 2
+
+    duplicate_of = find_duplicates(*_keys(rows), *_keys(receipts))
+
+    assert duplicate_of.tolist() == [-1, -1, 0]
+
+
+def test_validate_reports_collapsed_rows_instead_of_unmatched(config):
+    transactions = input_frame(
+        [
+            # Pending and posted lines of the same purchase
+            ["Blue Bottle", 6.50, "2024-03-01"],
+            ["Blue Bottle", 6.50, "2024-03-02"],
+            ["Chevron", 40.00, "2024-03-01"],
+        ]
+    )
+    # The same receipt uploaded twice
+    proofs = input_frame(
+        [
+            ["Blue Bottle", 6.50, "2024-03-01"],
+            ["Chevron", 40.00, "2024-03-01"],
+            ["Chevron", 40.00, "2024-03-01"],
+        ]
+    )
+
+    validator = Validator(transactions, proofs, parsed_config=config)
+    results = validator.validate()
+
+    assert len(results.validated_transactions) == 2
+    assert results.unmatched_transactions.empty
+    assert results.unmatched_proofs.empty
+    duplicates = results.duplicates
+    assert duplicates["Side"].tolist() == ["Transaction", "Proof"]
+    assert duplicates["Duplicate Of"].tolist() == [0, 1]
+    assert duplicates["Duplicate Kind"].tolist() == ["Near", "Exact"]
+    assert validator.matching_summary["duplicateTransactions"] == 1
+    assert validator.matching_summary["duplicateProofs"] == 1
+
+    kept = Validator(transactions, proofs, parsed_config=config).validate(dedup=False)
+    assert kept.duplicates.empty
+    assert len(kept.unmatched_transactions) == 1
+    assert len(kept.unmatched_proofs) == 1
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+
+from src.intelligence.explanations import MatchExplanations
+from src.intelligence.validator import Validator
+from tests.conftest import input_frame
+
+
+TRANSACTIONS = input_frame(
+    [
+        ["Taco Bell", 15.00, "2024-03-01"],
+        ["Chevron", 40.00, "2024-03-01"],
+        ["Tartine Bakery", 30.00, "2024-03-02"],
+        ["Tartine Bakery", 12.15, "2024-03-02"],
+        ["Safeway", 22.10, "2024-03-03"],
+    ]
+)
+PROOFS = input_frame(
+    [
+        ["Taco Bell #123", 15.00, "2024-03-02"],
+        ["Chevron", 38.50, "2024-03-01"],
+        ["Tartine Bakery", 42.15, "2024-03-02"],
+    ]
+)
+
+
+def test_every_accepted_pair_is_explained_by_result_row(config):
+    results = Validator(TRANSACTIONS, PROOFS, parsed_config=config).validate(
+        date_window_days=1
+    )
+    explanations = results.explanations
+
+    assert len(explanations) == 4
+    validated = explanations.explain("validated_transactions", 0)
+    assert validated["transactionRow"] == 0 and validated["proofRow"] == 0
+    assert validated["delta"] == 0.0
+    assert validated["dateDistanceDays"] == 1
+    assert validated["strategy"] == "greedy"
+    assert 0 < validated["score"] <= 100
+
+    discrepancy = explanations.explain("discrepancies", 0)
+    assert discrepancy["delta"] == 1.5
+    assert explanations.explain_pair(1, 1) == discrepancy
+
+    # Grouped rows are the two swipes followed by their single receipt
+    assert explanations.explain("grouped_matches", 0)["strategy"] == "split"
+    assert explanations.explain("grouped_matches", 1)["transactionRow"] == 3
+    assert explanations.explain("grouped_matches", 2) is None
+    assert explanations.explain("unmatched_transactions", 0) is None
+
+
+def test_explanations_round_trip_through_json(config):
+    explanations = (
+        Validator(TRANSACTIONS, PROOFS, parsed_config=config)
+        .validate(date_window_days=1)
+        .explanations
+    )
+    restored = MatchExplanations.from_dict(
+        json.loads(json.dumps(explanations.to_dict()))
+    )
+
+    assert restored.to_dict() == explanations.to_dict()
+    assert restored.scores.dtype == np.int16
+    assert restored.explain("discrepancies", 0) == explanations.explain(
+        "discrepancies", 0
+    )
+    assert len(MatchExplanations.from_dict(None)) == 0
+
+
+def test_kept_pairs_keep_their_scores_in_an_incremental_run(config):
+    first_run = Validator(TRANSACTIONS, PROOFS, parsed_config=config)
+    first_results = first_run.validate(date_window_days=1)
+
+    incremental = Validator(TRANSACTIONS, PROOFS, parsed_config=config)
+    results = incremental.validate(
+        date_window_days=1, previous_run=first_run.match_state
+    )
+
+    assert incremental.matching_summary["keptPairs"] > 0
+    assert results.explanations.to_dict() == first_results.explanations.to_dict()
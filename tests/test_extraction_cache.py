@@ -0,0 +1,171 @@
+import importlib
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from PIL import Image
+from pyhocon import ConfigFactory
+
+from src.data.extraction_cache import ExtractionCache, extraction_key
+
+
+def _write(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_key_depends_on_bytes_prompt_and_model(tmp_path):
+    receipt = _write(tmp_path / "receipt.jpg", b"receipt bytes")
+    copy = _write(tmp_path / "renamed.jpg", b"receipt bytes")
+    other = _write(tmp_path / "other.jpg", b"other bytes")
+
+    key = extraction_key(receipt, "prompt", "model")
+    assert extraction_key(copy, "prompt", "model") == key
+    assert extraction_key(other, "prompt", "model") != key
+    assert extraction_key(receipt, "prompt v2", "model") != key
+    assert extraction_key(receipt, "prompt", "other-model") != key
+
+
+def test_cache_persists_and_counts(tmp_path):
+    path = str(tmp_path / "cache" / "extractions.db")
+    cache = ExtractionCache(path)
+    assert cache.get("a") is None
+    cache.put("a", "[('Starbucks', 5.25, '03-01-2024', 'USD')]")
+
+    reopened = ExtractionCache(path)
+    assert reopened.get("a") == "[('Starbucks', 5.25, '03-01-2024', 'USD')]"
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert (reopened.hits, reopened.misses) == (1, 0)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "extractions.db"), max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    cache.put("c", "z" * 10)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("d", "w" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c") and cache.get("d")
+    assert cache.size_bytes == 30
+    assert len(cache) == 3
+
+    cache.put("huge", "h" * 31)
+    assert cache.get("huge") is None
+    assert len(cache) == 3
+
+
+def test_recent_responses_lists_most_recently_used_first(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "extractions.db"))
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+    cache.get("a")
+
+    assert cache.recent_responses(2) == ["A", "C"]
+
+
+def test_key_variant_separates_preprocessed_uploads(tmp_path):
+    receipt = _write(tmp_path / "receipt.jpg", b"receipt bytes")
+
+    plain = extraction_key(receipt, "prompt", "model")
+    assert extraction_key(receipt, "prompt", "model", "") == plain
+    assert extraction_key(receipt, "prompt", "model", "preprocess:g1") != plain
+
+
+@pytest.fixture
+def data_reader_module(monkeypatch):
+    # The FX agent reads its API key at import time
+    monkeypatch.setattr("src.utils.utils.load_exchange_rate_key", lambda: "test-key")
+    return importlib.import_module("src.data.data_reader")
+
+
+class _FakeModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(
+            text="[('Starbucks', 5.25, '03-01-2024', 'USD')]",
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=300, candidates_token_count=20
+            ),
+        )
+
+
+@pytest.fixture
+def proofs_config(tmp_path):
+    proofs = tmp_path / "proofs"
+    proofs.mkdir()
+    for number in range(3):
+        Image.new("RGB", (64, 48), (number * 40, 200, 200)).save(
+            proofs / f"receipt_{number}.jpg"
+        )
+    config = ConfigFactory.parse_file("config/config.conf")
+    config.put("data_path.proofs", str(proofs))
+    config.put("extraction_cache.path", str(tmp_path / "cache" / "extractions.db"))
+    return config
+
+
+def _read_proofs(data_reader_module, config):
+    reader = data_reader_module.DataReader(parsed_config=config)
+    reader.primary_client = SimpleNamespace(models=_FakeModels())
+    frame = reader.load_data(data_reader_module.DataType.PROOFS)
+    return reader, frame
+
+
+def test_warm_run_makes_no_llm_calls(data_reader_module, proofs_config):
+    cold, cold_frame = _read_proofs(data_reader_module, proofs_config)
+    warm, warm_frame = _read_proofs(data_reader_module, proofs_config)
+
+    assert cold.primary_client.models.calls == 3
+    assert warm.primary_client.models.calls == 0
+    summary = warm.get_ingestion_cost_summary()
+    assert (summary["llmCalls"], summary["cacheHits"]) == (0, 3)
+    pd.testing.assert_frame_equal(cold_frame, warm_frame)
+
+
+def test_packed_answers_do_not_share_single_image_entries(
+    data_reader_module, proofs_config
+):
+    _read_proofs(data_reader_module, proofs_config)
+
+    proofs_config.put("multi_image.enabled", True)
+    packed, _ = _read_proofs(data_reader_module, proofs_config)
+
+    assert packed.get_ingestion_cost_summary()["cacheHits"] == 0
+    assert packed.primary_client.models.calls > 0
+
+
+def test_ocr_merchants_come_from_the_database_without_a_cache(
+    data_reader_module, proofs_config, tmp_path
+):
+    from src.data.database import DataBase
+
+    database = DataBase(engine_name=str(tmp_path / "merchants"))
+    database.save_session_inputs(
+        "earlier",
+        pd.DataFrame([], columns=["business_name", "total", "date", "currency"]),
+        pd.DataFrame(
+            {
+                "business_name": ["Blue Bottle Coffee"],
+                "total": [4.5],
+                "date": ["2024-03-01"],
+                "currency": ["USD"],
+            }
+        ),
+    )
+    database.save_merchant_aliases([("sq *bluebottle", "taco bell")])
+    proofs_config.put("extraction_cache.enabled", False)
+    reader = data_reader_module.DataReader(
+        parsed_config=proofs_config, database=database
+    )
+
+    known = reader._known_merchants()
+    reader._store_extraction(None, "[('Chevron #123', 40.0, '03-02-2024', 'USD')]")
+
+    canonical = data_reader_module.canonicalize_merchant_name
+    assert known == {canonical("Blue Bottle Coffee"), canonical("taco bell")}
+    assert canonical("Chevron #123") in reader._known_merchants()
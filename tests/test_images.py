@@ -0,0 +1,80 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.utils.images import JPEG_MAX_QUALITY, compress_image, encode_jpeg
+
+
+def _noise(size=(800, 600), seed=0):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    return Image.fromarray(pixels)
+
+
+def test_small_image_is_encoded_once(tmp_path):
+    path = tmp_path / "small.png"
+    Image.new("RGBA", (200, 100), (255, 255, 255, 128)).save(path)
+
+    buffer, encodes = compress_image(str(path))
+
+    assert encodes == 1
+    output = Image.open(buffer)
+    assert output.format == "JPEG"
+    assert output.size == (200, 100)
+
+
+def test_quality_search_fits_budget_within_cap(tmp_path):
+    path = tmp_path / "photo.png"
+    _noise().save(path)
+    top = len(encode_jpeg(_noise(), JPEG_MAX_QUALITY))
+    budget = int(top * 0.6)
+
+    buffer, encodes = compress_image(str(path), budget, max_attempts=4)
+
+    assert len(buffer.getvalue()) <= budget
+    assert encodes <= 4
+    assert Image.open(buffer).size == (800, 600)
+
+
+def test_oversized_image_is_resized_in_one_pass(tmp_path):
+    path = tmp_path / "photo.png"
+    _noise().save(path)
+
+    buffer, encodes = compress_image(str(path), 40_000)
+
+    assert len(buffer.getvalue()) <= 40_000
+    width, height = Image.open(buffer).size
+    assert width < 800 and height < 600
+    assert encodes <= 8
+
+
+@pytest.mark.parametrize("max_attempts", [2, 3, 4])
+def test_encode_cap_holds_across_resizes(tmp_path, max_attempts):
+    path = tmp_path / "photo.png"
+    _noise((1200, 900)).save(path)
+
+    buffer, encodes = compress_image(str(path), 15_000, max_attempts=max_attempts)
+
+    assert len(buffer.getvalue()) <= 15_000
+    assert encodes <= max_attempts
+
+
+def test_large_jpeg_is_drafted_at_reduced_scale(tmp_path):
+    path = tmp_path / "photo.jpg"
+    _noise((1600, 1200)).save(path, quality=95)
+    budget = path.stat().st_size // 10
+
+    buffer, _ = compress_image(str(path), budget)
+
+    assert len(buffer.getvalue()) <= budget
+    assert Image.open(io.BytesIO(buffer.getvalue())).size[0] <= 800
+
+
+def test_impossible_budget_raises(tmp_path):
+    path = tmp_path / "photo.png"
+    _noise((50, 50)).save(path)
+
+    with pytest.raises(ValueError):
+        compress_image(str(path), 10)
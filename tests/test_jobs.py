@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from src.intelligence.llm_base import LLMBase
+from src.utils.jobs import JobQueue, JobQueueFull, SessionBusy
+
+
+class _BadRequest(ValueError):
+    status = 400
+
+
+@pytest.fixture
+def queue():
+    jobs = JobQueue(workers=1, max_pending=1)
+    yield jobs
+    jobs.shutdown()
+
+
+def test_job_reports_stages_and_result(queue):
+    cleaned = []
+
+    def pipeline(job):
+        job.report("ingest", rows=3)
+        job.report("validate")
+        return {"ok": True}
+
+    job = queue.submit(
+        "session-1", pipeline, cleanup=lambda: cleaned.append(True), steps=2
+    )
+    assert job.wait_finished(timeout=5)
+
+    assert job.status == "done"
+    assert job.result == {"ok": True}
+    assert cleaned == [True]
+    assert queue.get(job.job_id) is job
+
+    names = [event for event, _ in job.events]
+    assert names == ["queued", "running", "stage", "stage", "done"]
+    first_stage = job.events[2][1]
+    assert first_stage == {
+        "jobId": job.job_id,
+        "stage": "ingest",
+        "step": 1,
+        "steps": 2,
+        "stageSeconds": {},
+        "rows": 3,
+    }
+    snapshot = job.snapshot()
+    assert snapshot["status"] == "done"
+    assert set(snapshot["stageSeconds"]) == {"ingest", "validate"}
+    assert snapshot["finishedAt"] >= snapshot["startedAt"] >= snapshot["createdAt"]
+
+
+def test_failed_job_keeps_error_status(queue):
+    def pipeline(job):
+        job.report("ingest")
+        raise _BadRequest("No saved inputs")
+
+    job = queue.submit("session-1", pipeline)
+    assert job.wait_finished(timeout=5)
+
+    assert job.status == "failed"
+    assert job.error == "No saved inputs"
+    assert job.error_status == 400
+    event, payload = job.events[-1]
+    assert event == "error"
+    assert "ingest" in payload["stageSeconds"]
+
+
+def test_session_busy_and_queue_full(queue):
+    release = threading.Event()
+
+    def blocked(job):
+        release.wait(5)
+
+    running = queue.submit("session-1", blocked)
+    with pytest.raises(SessionBusy):
+        queue.submit("session-1", blocked)
+
+    pending = queue.submit("session-2", blocked)
+    with pytest.raises(JobQueueFull):
+        queue.submit("session-3", blocked)
+
+    release.set()
+    assert running.wait_finished(timeout=5)
+    assert pending.wait_finished(timeout=5)
+    # Finished jobs free their session and their queue slot
+    assert queue.submit("session-1", lambda job: None).wait_finished(timeout=5)
+
+
+def test_wait_returns_new_events_only(queue):
+    release = threading.Event()
+
+    def pipeline(job):
+        release.wait(5)
+        job.report("validate")
+
+    job = queue.submit("session-1", pipeline)
+    seen = len(job.wait(0, timeout=5))
+    release.set()
+    assert job.wait_finished(timeout=5)
+
+    remaining = job.wait(seen, timeout=0)
+    assert remaining[-1][0] == "done"
+    assert job.wait(len(job.events), timeout=0) == []
+
+
+def test_request_slots_cap_concurrency():
+    LLMBase.limit_concurrent_requests(2)
+    try:
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def request():
+            with LLMBase.request_slot():
+                with lock:
+                    in_flight.append(1)
+                    peak.append(len(in_flight))
+                time.sleep(0.02)
+                with lock:
+                    in_flight.pop()
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) == 2
+    finally:
+        LLMBase.limit_concurrent_requests(None)
+
+    with LLMBase.request_slot():
+        assert LLMBase._request_slots is None
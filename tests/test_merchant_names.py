@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+
+from src.intelligence.candidates import build_candidates
+from src.intelligence.merchant_names import (
+    MerchantNameIndex,
+    canonical_cache_info,
+    canonicalize_merchant_name,
+    canonicalize_names,
+)
+from src.intelligence.validator import Validator
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("SQ *BLUE BOTTLE 1234 SAN FRANCISCO", "blue bottle"),
+        ("TST* Tartine Bakery", "tartine bakery"),
+        ("PAYPAL *NETFLIX", "netflix"),
+        ("AMZN Mktp US*2K3L45", "amzn mktp us"),
+        ("Starbucks #0457 Seattle WA", "starbucks"),
+        ("POS PURCHASE CHEVRON 00123 OAKLAND CA", "chevron"),
+        ("Whole Foods Market NEW YORK NY", "whole foods market"),
+        ("Trader Joe's", "trader joes"),
+        ("Taco Bell", "taco bell"),
+        ("#1234", "1234"),
+        ("Café Münster", "cafe munster"),
+        ("Cafe 1905", "cafe 1905"),
+        ("STARBUCKS 0457 SEATTLE WA", "starbucks"),
+        ("Walgreens Store 123", "walgreens"),
+        ("Apple Store", "apple store"),
+        ("東京 ラーメン", "東京 ラーメン"),
+    ],
+)
+def test_canonicalize_merchant_name(raw, expected):
+    assert canonicalize_merchant_name(raw) == expected
+
+
+def test_canonical_names_are_computed_once_per_unique_raw_name():
+    canonicalize_merchant_name.cache_clear()
+    names = pd.Series(["SQ *BLUE BOTTLE 1234", "Taco Bell"] * 50)
+
+    canonical = canonicalize_names(names)
+
+    assert canonical.tolist() == ["blue bottle", "taco bell"] * 50
+    assert canonical_cache_info()["misses"] == 2
+
+
+def test_name_index_only_returns_names_sharing_a_token_or_trigram():
+    index = MerchantNameIndex(["blue bottle", "taco bell", "chevron", "ab"])
+
+    shared = {index.names[i] for i in index.candidates("blue bottle coffee")}
+
+    assert shared == {"blue bottle", "ab"}
+    assert index.candidates("ab") is None
+
+
+def test_name_index_preserves_candidates_and_cuts_scorer_calls():
+    names = [f"merchant {word}" for word in ("alpha", "bravo", "delta", "kilo")]
+    names += ["blue bottle", "taco bell", "chevron", "walgreens", "safeway"]
+    transactions = pd.DataFrame(
+        {"name_key": names * 3, "date_key": ["2024-01-01"] * (len(names) * 3)}
+    )
+    proofs = transactions.copy()
+    totals = pd.Series(1.0, index=transactions.index)
+
+    exhaustive_stats, indexed_stats = {}, {}
+    exhaustive = build_candidates(
+        transactions,
+        proofs,
+        totals,
+        totals,
+        use_name_index=False,
+        stats=exhaustive_stats,
+    )
+    indexed = build_candidates(
+        transactions, proofs, totals, totals, stats=indexed_stats
+    )
+
+    assert indexed == exhaustive
+    assert indexed_stats["scorerCalls"] < exhaustive_stats["scorerCalls"]
+
+
+def test_validate_matches_processor_prefixed_statement_names():
+    transactions = pd.DataFrame(
+        {
+            "business_name": ["SQ *BLUE BOTTLE 1234 SAN FRANCISCO", "TST* TARTINE 88"],
+            "total": [6.50, 18.25],
+            "date": ["2024-03-01", "2024-03-01"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["Blue Bottle Coffee", "Tartine Bakery"],
+            "total": [6.50, 18.25],
+            "date": ["2024-03-01", "2024-03-01"],
+        }
+    )
+
+    validator = Validator(transactions, proofs)
+    results = validator.validate()
+
+    assert len(results.validated_transactions) == 2
+    assert validator.matching_summary["scorerCalls"] > 0
@@ -0,0 +1,129 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.data.database import DataBase
+from src.intelligence.helper_agent import HelperAgent
+from src.intelligence.validator import Validator
+from src.utils.money import frame_cents, to_cents
+
+
+def test_to_cents_absorbs_float_noise_and_keeps_missing_values():
+    cents = to_cents(pd.Series([0.1 + 0.2, "19.99", "n/a", None, float("inf")]))
+
+    assert cents.dtype == "Int64"
+    assert cents.tolist()[:2] == [30, 1999]
+    assert cents.isna().tolist() == [False, False, True, True, True]
+
+
+def test_frame_cents_fills_gaps_from_totals():
+    frame = pd.DataFrame({"total": [1.5, 2.25], "total_cents": [150, None]})
+
+    assert frame_cents(frame).tolist() == [150, 225]
+
+
+def test_frame_cents_prefers_edited_totals_over_stored_cents():
+    frame = pd.DataFrame(
+        {"total": [9.99, None, "n/a", None], "total_cents": [150, 225, 10.5, None]}
+    )
+
+    cents = frame_cents(frame)
+
+    assert cents.tolist()[:2] == [999, 225]
+    assert cents.isna().tolist() == [False, False, True, True]
+
+
+def test_float_noise_totals_are_validated_not_discrepancies():
+    transactions = pd.DataFrame(
+        {"business_name": ["Cafe"], "total": [0.1 + 0.2], "date": ["2024-01-02"]}
+    )
+    proofs = pd.DataFrame(
+        {"business_name": ["Cafe"], "total": [0.3], "date": ["2024-01-02"]}
+    )
+
+    results = Validator(transactions, proofs).validate()
+
+    assert len(results.validated_transactions) == 1
+    assert results.discrepancies.empty
+    assert "total_cents" not in results.validated_transactions.columns
+
+
+def test_helper_agent_sums_whole_cents():
+    rows = [
+        {
+            "Transaction Business Name": "cafe",
+            "Transaction Total": 0.1,
+            "Transaction Date": "2024-01-02",
+            "Transaction Category": "Food",
+        }
+    ] * 3
+
+    frame = HelperAgent._to_frame(rows)
+
+    assert frame["Transaction Total Cents"].tolist() == [10, 10, 10]
+    assert HelperAgent._aggregate_spend(frame, "sum", False) == 0.3
+
+
+def test_existing_database_gains_backfilled_cents_column(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            """
+            CREATE TABLE sessions (
+                id INTEGER PRIMARY KEY, session_id VARCHAR(64) NOT NULL UNIQUE,
+                user_id VARCHAR, created_at DATETIME NOT NULL
+            );
+            CREATE TABLE transactions (
+                id INTEGER PRIMARY KEY, session_ref_id INTEGER NOT NULL,
+                business_name VARCHAR NOT NULL, total FLOAT NOT NULL,
+                currency VARCHAR NOT NULL, date DATE NOT NULL
+            );
+            INSERT INTO sessions VALUES (1, 'legacy', NULL, '2024-01-01 00:00:00');
+            INSERT INTO transactions VALUES (1, 1, 'cafe', 12.34, 'USD', '2024-01-02');
+            """
+        )
+
+    database = DataBase(engine_name=str(db_path))
+    transactions, _ = database.load_session_history("legacy")
+
+    assert transactions["total_cents"].tolist() == [1234]
+
+    database.save_session_inputs(
+        "fresh",
+        pd.DataFrame(
+            {
+                "business_name": ["cafe"],
+                "total": [0.1 + 0.2],
+                "date": ["2024-01-02"],
+                "currency": ["usd"],
+            }
+        ),
+        pd.DataFrame([]),
+    )
+    _, proofs = database.load_session_history("fresh")
+    transactions, _ = database.load_session_history("fresh")
+
+    assert proofs.empty
+    assert transactions["total_cents"].tolist() == [30]
+
+
+def test_saving_rows_without_a_total_raises(tmp_path):
+    database = DataBase(engine_name=str(tmp_path / "totals"))
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["cafe", "deli"],
+            "total": [None, None],
+            "date": ["2024-01-02", "2024-01-03"],
+            "currency": ["USD", "USD"],
+            "total_cents": [450, None],
+        }
+    )
+
+    with pytest.raises(ValueError, match="1 row"):
+        database.save_session_inputs("gaps", pd.DataFrame([]), proofs)
+
+    database.save_session_inputs("gaps", pd.DataFrame([]), proofs.iloc[:1])
+    _, stored = database.load_session_history("gaps")
+
+    assert stored[["total", "total_cents"]].values.tolist() == [[4.5, 450]]
@@ -0,0 +1,86 @@
+import ast
+import json
+
+from src.data.packing import estimate_text_tokens, pack_by_tokens, parse_packed_response
+
+
+def _answer(*items):
+    return json.dumps({"items": list(items)})
+
+
+def test_pack_by_tokens_respects_budget_and_count():
+    assert pack_by_tokens([258] * 5, 600, 8) == [[0, 1], [2, 3], [4]]
+    assert pack_by_tokens([10] * 5, 1000, 2) == [[0, 1], [2, 3], [4]]
+
+
+def test_pack_by_tokens_places_oversized_items_alone():
+    assert pack_by_tokens([100, 5000, 100, 100], 1000, 8) == [[0], [1], [2, 3]]
+    assert pack_by_tokens([], 1000, 8) == []
+
+
+def test_estimate_text_tokens_rounds_up():
+    assert estimate_text_tokens("") == 0
+    assert estimate_text_tokens("abcde") == 2
+
+
+def test_parse_maps_answers_back_by_image_number():
+    text = _answer(
+        {"image": 2, "transactions": [["Pret A Manger", 7.5, "02-12-2023", "GBP"]]},
+        {"image": 1, "transactions": [["Starbucks", 5, "01-15-2023", "USD"]]},
+    )
+
+    first, second = parse_packed_response(text, 2)
+
+    assert ast.literal_eval(first) == [("Starbucks", 5.0, "01-15-2023", "USD")]
+    assert ast.literal_eval(second) == [("Pret A Manger", 7.5, "02-12-2023", "GBP")]
+
+
+def test_parse_keeps_several_transactions_per_image():
+    text = _answer(
+        {
+            "image": 1,
+            "transactions": [
+                ["Cafe", 3.25, "01-01-2024", "USD"],
+                ["Cafe", 4.0, "01-02-2024", "USD"],
+            ],
+        }
+    )
+
+    assert len(ast.literal_eval(parse_packed_response(text, 1)[0])) == 2
+
+
+def test_parse_strips_code_fence():
+    text = (
+        "```json\n"
+        + _answer({"image": 1, "transactions": [["Cafe", 3.25, "01-01-2024", "USD"]]})
+        + "\n```"
+    )
+
+    assert parse_packed_response(text, 1)[0] is not None
+
+
+def test_parse_flags_missing_malformed_and_repeated_images():
+    text = _answer(
+        {"image": 1, "transactions": [["Cafe", "3.25", "01-01-2024", "USD"]]},
+        {"image": 2, "transactions": []},
+        {"image": 3, "transactions": [["Deli", 9.0, "01-01-2024", "USD"]]},
+        {"image": 3, "transactions": [["Deli", 9.0, "01-01-2024", "USD"]]},
+        {"image": 5, "transactions": [["Deli", 1.0, "01-01-2024", "USD"]]},
+        {"image": 6, "transactions": [["Bar", 2.0, "01-01-2024", "USD"]]},
+    )
+
+    assert parse_packed_response(text, 6) == [
+        None,
+        None,
+        None,
+        None,
+        "[('Deli', 1.0, '01-01-2024', 'USD')]",
+        "[('Bar', 2.0, '01-01-2024', 'USD')]",
+    ]
+
+
+def test_parse_invalid_json_retries_every_image():
+    assert (
+        parse_packed_response("[('Cafe', 3.25, '01-01-2024', 'USD')]", 3) == [None] * 3
+    )
+    assert parse_packed_response('{"items": {"image": 1}}', 2) == [None, None]
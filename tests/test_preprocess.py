@@ -0,0 +1,77 @@
+import numpy as np
+from PIL import Image, ImageDraw
+from pyhocon import ConfigFactory
+
+from src.utils.images import compress_image
+from src.utils.preprocess import (
+    GEMINI_TILE_TOKENS,
+    PreprocessSettings,
+    estimate_image_tokens,
+    preprocess_image,
+)
+
+
+def _receipt_photo(path, angle):
+    """A 1000x1400 receipt with ruled text, rotated on a dark table."""
+    receipt = Image.new("RGB", (500, 1000), (245, 243, 238))
+    draw = ImageDraw.Draw(receipt)
+    for top in range(60, 940, 40):
+        draw.rectangle((40, top, 460, top + 14), fill=(20, 20, 20))
+    rotated = receipt.rotate(angle, expand=True, fillcolor=(70, 60, 50))
+    photo = Image.new("RGB", (1000, 1400), (70, 60, 50))
+    photo.paste(rotated, (200, 150))
+    photo.save(path, quality=92)
+    return str(path)
+
+
+def _line_sharpness(img):
+    """Variance of the row ink profile; level text lines give sharp peaks."""
+    ink = np.asarray(img.convert("L")) < 100
+    width = ink.shape[1]
+    return ink[:, width // 5 : width - width // 5].mean(axis=1).var()
+
+
+def test_settings_from_config_and_cache_tag():
+    config = ConfigFactory.parse_string(
+        'preprocess = { "enabled" = true, "deskew" = false, "max_side" = 1024 }'
+    )
+    settings = PreprocessSettings.from_config(config)
+
+    assert settings == PreprocessSettings(enabled=True, deskew=False, max_side=1024)
+    assert settings.cache_tag() != PreprocessSettings(enabled=True).cache_tag()
+    assert PreprocessSettings().cache_tag() == ""
+
+
+def test_token_estimate_counts_tiles():
+    assert estimate_image_tokens((300, 200)) == GEMINI_TILE_TOKENS
+    assert estimate_image_tokens((768, 768)) == GEMINI_TILE_TOKENS
+    assert estimate_image_tokens((4000, 3000)) == 6 * 4 * GEMINI_TILE_TOKENS
+
+
+def test_preprocess_crops_deskews_and_downscales(tmp_path):
+    path = _receipt_photo(tmp_path / "receipt.jpg", angle=6)
+    settings = PreprocessSettings(enabled=True, max_side=800)
+
+    img = preprocess_image(path, settings)
+
+    assert img.mode == "L"
+    assert max(img.size) == 800
+    # Cropped to the receipt's 1:2 shape rather than the 5:7 photo
+    assert img.size[1] / img.size[0] > 1.8
+
+    skewed = preprocess_image(
+        path, PreprocessSettings(enabled=True, deskew=False, max_side=800)
+    )
+    assert _line_sharpness(img) > 2 * _line_sharpness(skewed)
+
+
+def test_preprocess_keeps_colour_when_asked(tmp_path):
+    path = _receipt_photo(tmp_path / "receipt.jpg", angle=0)
+    settings = PreprocessSettings(enabled=True, grayscale=False, crop=False)
+
+    img = preprocess_image(path, settings)
+
+    assert img.mode == "RGB"
+    assert img.size == (1000, 1400)
+    buffer, _ = compress_image(img)
+    assert Image.open(buffer).size == (1000, 1400)
@@ -0,0 +1,224 @@
+import ast
+
+from pyhocon import ConfigFactory
+
+import src.data.receipt_ocr as receipt_ocr
+from src.data.receipt_ocr import (
+    GUESS_CONFIDENCE,
+    OcrLine,
+    ReceiptFields,
+    ReceiptOcr,
+    parse_receipt,
+)
+
+
+def _lines(*texts, confidence=0.97):
+    return [OcrLine(text, confidence) for text in texts]
+
+
+CLEAN_RECEIPT = _lines(
+    "Blue Bottle Coffee",
+    "123 Market St",
+    "San Francisco CA",
+    "03/14/2024 08:12",
+    "Latte 5.50",
+    "Croissant 4.25",
+    "Subtotal 9.75",
+    "Tax 0.85",
+    "TOTAL $10.60",
+    "VISA 10.60",
+)
+KNOWN = frozenset({"blue bottle coffee", "green grocer", "cafe de flore"})
+
+
+def test_parse_clean_receipt_is_confident():
+    fields = parse_receipt(CLEAN_RECEIPT, KNOWN)
+
+    assert fields.business_name == "Blue Bottle Coffee"
+    assert fields.total == 10.60
+    assert fields.date == "03-14-2024"
+    assert fields.currency == "USD"
+    assert fields.confidence >= 0.85
+    assert fields.guesses == ()
+    assert ReceiptOcr().accepts(fields)
+
+
+def test_response_matches_llm_format():
+    fields = parse_receipt(CLEAN_RECEIPT)
+
+    assert ast.literal_eval(fields.to_response()) == [
+        ("Blue Bottle Coffee", 10.60, "03-14-2024", "USD")
+    ]
+
+
+def test_total_skips_subtotal_tax_tip_and_change():
+    fields = parse_receipt(
+        _lines(
+            "Corner Deli",
+            "2024-01-05",
+            "Sub-total 20.00",
+            "Tax 1.60",
+            "Tip 4.00",
+            "Grand Total 25.60",
+            "Cash 30.00",
+            "Change 4.40",
+            "Total items 3",
+        )
+    )
+
+    assert fields.total == 25.60
+    assert fields.date == "01-05-2024"
+
+
+def test_grand_total_wins_over_plain_total():
+    fields = parse_receipt(
+        _lines("Corner Deli", "01/05/2024", "Total 18.00", "Grand Total 21.00")
+    )
+
+    assert fields.total == 21.00
+
+
+def test_day_first_and_month_name_dates():
+    assert parse_receipt(_lines("Cafe Roma", "25/12/23", "Total 9.00")).date == (
+        "12-25-2023"
+    )
+    assert parse_receipt(_lines("Cafe Roma", "Dec 5, 2023", "Total 9.00")).date == (
+        "12-05-2023"
+    )
+
+
+def test_currency_from_symbol_and_code():
+    assert parse_receipt(_lines("Cafe Roma", "05/12/2023", "TOTAL €9,00")).currency == (
+        "EUR"
+    )
+    fields = parse_receipt(_lines("Maple Diner", "05/12/2023", "Total CAD $9.00"))
+    assert fields.currency == "CAD"
+    assert fields.confidence < 0.85
+
+
+def test_merchant_skips_address_and_receipt_headers():
+    fields = parse_receipt(
+        _lines("RECEIPT", "415-555-0100", "Green Grocer", "06/01/2024", "Total 3.00")
+    )
+
+    assert fields.business_name == "Green Grocer"
+
+
+def test_missing_field_escalates():
+    assert parse_receipt(_lines("Green Grocer", "Total 3.00")).confidence == 0.0
+    assert parse_receipt(_lines("Green Grocer", "06/01/2024")).confidence == 0.0
+
+
+def test_conflicting_totals_lower_confidence():
+    fields = parse_receipt(
+        _lines("Green Grocer", "06/01/2024", "Total 3.00", "Total 13.00")
+    )
+
+    assert fields.total == 13.00
+    assert fields.confidence < 0.85
+
+
+def test_total_below_subtotal_lowers_confidence():
+    fields = parse_receipt(
+        _lines("Green Grocer", "06/01/2024", "Subtotal 30.00", "Total 3.00")
+    )
+
+    assert fields.confidence < 0.85
+
+
+def test_unknown_merchant_is_a_guess():
+    fields = parse_receipt(CLEAN_RECEIPT)
+
+    assert fields.guesses == ("business_name",)
+    assert fields.confidence <= GUESS_CONFIDENCE
+    assert not ReceiptOcr(min_confidence=0.3).accepts(fields)
+
+
+def test_address_and_courtesy_lines_are_not_accepted_as_merchant():
+    for header in ("123 Main Street", "Thank you for visiting"):
+        fields = parse_receipt(
+            _lines(header, "06/14/2024", "TOTAL $3.00", confidence=0.96), KNOWN
+        )
+
+        assert fields.business_name != header
+        assert not ReceiptOcr().accepts(fields)
+
+
+def test_defaulted_currency_and_ambiguous_date_escalate():
+    fields = parse_receipt(
+        _lines("Cafe de Flore", "01/03/2024", "TOTAL 4,50", confidence=0.96), KNOWN
+    )
+
+    assert set(fields.guesses) == {"currency", "date"}
+    assert not ReceiptOcr().accepts(fields)
+
+
+def test_explicit_usd_corroborates_month_first_date():
+    fields = parse_receipt(
+        _lines("Green Grocer", "06/01/2024", "TOTAL $3.00", confidence=0.96), KNOWN
+    )
+
+    assert fields.date == "06-01-2024"
+    assert ReceiptOcr().accepts(fields)
+
+
+def test_explicit_euro_leaves_day_month_order_ambiguous():
+    fields = parse_receipt(
+        _lines("Cafe de Flore", "01/03/2024", "TOTAL €4,50", confidence=0.96), KNOWN
+    )
+
+    assert fields.guesses == ("date",)
+
+
+def test_low_ocr_confidence_escalates():
+    fields = parse_receipt(
+        _lines("Green Grocer", "06/01/2024", "Total $3.00", confidence=0.6), KNOWN
+    )
+
+    assert not ReceiptOcr(min_confidence=0.85).accepts(fields)
+
+
+def test_from_config():
+    assert ReceiptOcr.from_config(ConfigFactory.parse_string("")) is None
+
+    config = ConfigFactory.parse_string(
+        'ocr = { "enabled" = true, "min_confidence" = 0.9, "max_side" = 1024 }'
+    )
+    ocr = ReceiptOcr.from_config(config)
+
+    assert ocr.min_confidence == 0.9
+    assert ocr.settings.max_side == 1024
+
+
+def test_extract_parses_ocr_lines(monkeypatch, tmp_path):
+    monkeypatch.setattr(receipt_ocr, "preprocess_image", lambda path, settings: path)
+    monkeypatch.setattr(
+        receipt_ocr, "ocr_lines", lambda img, languages: list(CLEAN_RECEIPT)
+    )
+
+    fields = ReceiptOcr().extract(str(tmp_path / "receipt.jpg"), KNOWN)
+
+    assert isinstance(fields, ReceiptFields)
+    assert fields.total == 10.60
+    assert fields.guesses == ()
+    assert fields.seconds > 0
+
+
+def test_extract_disables_itself_without_tesseract(monkeypatch, tmp_path):
+    calls = []
+
+    class TesseractNotFoundError(EnvironmentError):
+        pass
+
+    def missing_tesseract(img, languages):
+        calls.append(img)
+        raise TesseractNotFoundError()
+
+    monkeypatch.setattr(receipt_ocr, "preprocess_image", lambda path, settings: path)
+    monkeypatch.setattr(receipt_ocr, "ocr_lines", missing_tesseract)
+    ocr = ReceiptOcr()
+
+    assert ocr.extract(str(tmp_path / "a.jpg")) is None
+    assert ocr.extract(str(tmp_path / "b.jpg")) is None
+    assert not ocr.available
+    assert len(calls) == 1
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from src.intelligence.helper_agent import HelperAgent
+from src.intelligence.results import ResultTable, Results
+from src.intelligence.validator import Validator
+
+
+def _validate():
+    transactions = pd.DataFrame(
+        {
+            "business_name": ["Taco Bell", "Chevron", "Safeway"],
+            "total": [15.00, 40.00, 22.10],
+            "date": ["2024-03-01", "2024-03-01", "2024-03-02"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["Taco Bell", "Chevron"],
+            "total": [15.00, 38.50],
+            "date": ["2024-03-01", "2024-03-01"],
+        }
+    )
+    return Validator(transactions, proofs).validate()
+
+
+def test_results_store_snake_case_columns_and_show_display_names():
+    results = _validate()
+
+    validated = results.table("validated_transactions")
+    assert validated.fields[:3] == [
+        "transaction_business_name",
+        "transaction_total",
+        "transaction_date",
+    ]
+    assert validated.fields[-1] == "result"
+    assert "delta" in results.table("discrepancies").fields
+    assert results.validated_transactions["Transaction Business Name"].tolist() == [
+        "Taco Bell"
+    ]
+    assert results.discrepancies["Delta"].tolist() == [1.5]
+    assert results.unmatched_transactions["Business Name"].tolist() == ["Safeway"]
+
+
+def test_views_are_built_once_and_only_on_request():
+    results = _validate()
+    table = results.table("discrepancies")
+
+    assert table._frame is None and table._records is None
+    records = results.records("discrepancies")
+
+    assert table._frame is None
+    assert records == results.records("discrepancies")
+    assert records[0]["Proof Total"] == 38.5
+    frame = results.discrepancies
+    assert table._frame is not None and frame is not table._frame
+
+
+def test_callers_cannot_corrupt_the_cached_views():
+    results = _validate()
+    frame = results.discrepancies
+    records = results.records("discrepancies")
+
+    frame.loc[0, "Proof Total"] = 0.0
+    frame["Extra"] = 1
+    records[0]["Proof Total"] = 0.0
+    records.clear()
+
+    assert results.discrepancies["Proof Total"].tolist() == [38.5]
+    assert "Extra" not in results.discrepancies.columns
+    assert results.records("discrepancies")[0]["Proof Total"] == 38.5
+
+
+def test_records_use_none_for_missing_values_and_csv_uses_display_names():
+    table = ResultTable(
+        {
+            "business_name": np.array(["cafe", None], dtype=object),
+            "total": np.array([4.5, np.nan]),
+            "date": np.array(["2024-01-02", "2024-01-03"], dtype="datetime64[ns]"),
+        }
+    )
+
+    assert table.to_records() == [
+        {"Business Name": "cafe", "Total": 4.5, "Date": pd.Timestamp("2024-01-02")},
+        {"Business Name": None, "Total": None, "Date": pd.Timestamp("2024-01-03")},
+    ]
+    assert table.to_csv().splitlines()[0] == "Business Name,Total,Date"
+    assert len(table.take(np.array([False, True]))) == 1
+
+
+def test_assigning_a_frame_converts_it_to_a_table():
+    results = Results(unmatched_proofs=pd.DataFrame({"Business Name": ["cafe"]}))
+
+    assert results.table("unmatched_proofs").fields == ["business_name"]
+    assert results.table("validated_transactions").empty
+
+
+def test_helper_agent_reads_columnar_rows_without_records():
+    frame = HelperAgent._to_frame(_validate().table("validated_transactions"))
+
+    assert frame["Transaction Business Name"].tolist() == ["Taco Bell"]
+    assert frame["Transaction Total Cents"].tolist() == [1500]
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from src.intelligence.score_cache import ScoreCache, SparseScores
+from src.intelligence.validator import Validator
+from tests.conftest import input_frame
+
+
+TRANSACTIONS = input_frame(
+    [
+        ["Starbucks", 5.25, "2024-03-01"],
+        ["Starbucks Reserve Roastery", 9.75, "2024-03-01"],
+        ["Chevron", 40.00, "2024-03-02"],
+    ]
+)
+PROOFS = input_frame(
+    [
+        ["Starbucks", 5.25, "2024-03-01"],
+        ["Starbucks Reserv Roastry", 9.75, "2024-03-01"],
+        ["Chevron", 40.00, "2024-03-02"],
+    ]
+)
+
+
+def _matched(config, threshold, cache=None):
+    validator = Validator(TRANSACTIONS, PROOFS, parsed_config=config, score_cache=cache)
+    results = validator.validate(name_threshold=threshold)
+    return validator, len(results.validated_transactions)
+
+
+def test_threshold_comes_from_config_and_can_be_overridden(config):
+    config.put("matching.name_threshold", 100)
+    validator, strict = _matched(config, None)
+    assert validator.matching_summary["nameThreshold"] == 100
+
+    _, relaxed = _matched(config, 80)
+    assert relaxed > strict
+
+
+def test_new_threshold_refilters_cached_scores_without_rescoring(config):
+    cache = ScoreCache(floor=70)
+    first, first_matched = _matched(config, 90, cache)
+    assert first.matching_summary["scorerCalls"] > 0
+    assert first.matching_summary["scoreCacheHit"] is False
+
+    second, second_matched = _matched(config, 80, cache)
+    assert second.matching_summary["scoreCacheHit"] is True
+    assert second.matching_summary["scorerCalls"] == 0
+
+    # Results equal those of an uncached run at the same threshold
+    _, uncached_90 = _matched(config, 90)
+    _, uncached_80 = _matched(config, 80)
+    assert (first_matched, second_matched) == (uncached_90, uncached_80)
+
+    # Below the cached floor the input is scored again
+    third, _ = _matched(config, 60, cache)
+    assert third.matching_summary["scoreCacheHit"] is False
+    assert cache.hits == 1
+
+
+def test_cache_evicts_least_recently_used_entries():
+    def entry(pairs):
+        positions = np.arange(pairs, dtype=np.int32)
+        return SparseScores(positions, positions, np.full(pairs, 90, np.uint8), 70)
+
+    cache = ScoreCache(max_bytes=entry(10).nbytes * 2)
+    cache.put("a", entry(10))
+    cache.put("b", entry(10))
+    assert cache.get("a", 80) is not None
+    cache.put("c", entry(10))
+
+    assert cache.get("b", 80) is None
+    assert cache.get("a", 80) is not None
+    assert len(cache) == 2
+
+
+def test_recommendation_similarity_can_be_set_per_call(config):
+    unmatched_transactions = pd.DataFrame(
+        {"Business Name": ["Blue Bottle"], "Total": [6.5], "Date": ["2024-03-01"]}
+    )
+    unmatched_proofs = pd.DataFrame(
+        {"Business Name": ["Blue Botl Cofee"], "Total": [6.5], "Date": ["2024-03-01"]}
+    )
+    validator = Validator(TRANSACTIONS, PROOFS, parsed_config=config)
+
+    loose = validator.analyze_unmatched_results(
+        unmatched_transactions, unmatched_proofs, 0.5
+    )
+    strict = validator.analyze_unmatched_results(
+        unmatched_transactions, unmatched_proofs, 1.0
+    )
+
+    assert len(loose) == 1 and strict.empty
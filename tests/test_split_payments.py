@@ -0,0 +1,141 @@
+import pandas as pd
+
+import src.intelligence.validator as validator_module
+from src.intelligence.split_payments import _subset_summing_to
+from src.intelligence.validator import Validator
+from tests.conftest import input_frame
+
+
+def test_subset_search_returns_the_earliest_exact_subset():
+    amounts = [500, 1250, 700, 550, 1800]
+
+    assert _subset_summing_to(amounts, 1750, 2) == (0, 1)
+    assert _subset_summing_to(amounts, 1750, 3) == (0, 2, 3)
+    assert _subset_summing_to(amounts, 99, 2) is None
+
+
+def test_two_swipes_are_grouped_with_one_receipt(config):
+    transactions = input_frame(
+        [
+            ["Tartine Bakery", 30.00, "2024-03-01"],
+            ["Tartine Bakery", 12.15, "2024-03-01"],
+            ["Chevron", 40.00, "2024-03-01"],
+        ]
+    )
+    proofs = input_frame(
+        [
+            ["Tartine Bakery", 42.15, "2024-03-01"],
+            ["Chevron", 40.00, "2024-03-01"],
+        ]
+    )
+
+    validator = Validator(transactions, proofs, parsed_config=config)
+    results = validator.validate()
+
+    assert len(results.validated_transactions) == 1
+    assert results.unmatched_transactions.empty
+    assert results.unmatched_proofs.empty
+    assert validator.matching_summary["splitGroups"] == 1
+    grouped = results.grouped_matches
+    assert grouped["Side"].value_counts().to_dict() == {"Transaction": 2, "Proof": 1}
+    assert set(grouped["Group"]) == {1}
+
+
+def test_hotel_folio_is_grouped_with_statement_lines_within_the_window(config):
+    transactions = input_frame(
+        [
+            ["Marriott Marquis", 189.00, "2024-05-02"],
+            ["Marriott Marquis", 189.00, "2024-05-03"],
+            ["Marriott Marquis", 42.50, "2024-05-04"],
+        ]
+    )
+    proofs = input_frame([["Marriott Marquis", 420.50, "2024-05-04"]])
+
+    results = Validator(transactions, proofs, parsed_config=config).validate(
+        date_window_days=2
+    )
+
+    assert results.unmatched_transactions.empty
+    assert results.unmatched_proofs.empty
+    assert len(results.grouped_matches) == 4
+
+
+def test_groups_respect_merchant_and_size_cap(config):
+    transactions = input_frame(
+        [["Tartine Bakery", 10.00, "2024-03-01"]] * 4
+        + [["Chevron", 5.00, "2024-03-01"], ["Chevron", 5.00, "2024-03-01"]]
+    )
+    proofs = input_frame(
+        [["Tartine Bakery", 40.00, "2024-03-01"], ["Safeway", 10.00, "2024-03-01"]]
+    )
+
+    config.put("matching.split_max_parts", 3)
+    results = Validator(transactions, proofs, parsed_config=config).validate()
+
+    assert results.grouped_matches.empty
+    assert len(results.discrepancies) == 1
+    assert len(results.unmatched_transactions) == 5
+
+    config.put("matching.split_max_parts", 4)
+    results = Validator(transactions, proofs, parsed_config=config).validate()
+
+    assert len(results.grouped_matches) == 5
+    assert results.discrepancies.empty
+    assert len(results.unmatched_transactions) == 2
+    assert len(results.unmatched_proofs) == 1
+
+
+def test_split_pass_reuses_main_pass_candidates(config, monkeypatch):
+    calls = []
+    build = validator_module.build_candidates
+
+    def counting_build(*args, **kwargs):
+        calls.append(1)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(validator_module, "build_candidates", counting_build)
+    transactions = input_frame(
+        [
+            ["Tartine Bakery", 30.00, "2024-03-01"],
+            ["Tartine Bakery", 12.15, "2024-03-01"],
+        ]
+    )
+    proofs = input_frame([["Tartine Bakery", 42.15, "2024-03-01"]])
+
+    validator = Validator(transactions, proofs, parsed_config=config)
+    validator.validate()
+
+    assert validator.matching_summary["splitGroups"] == 1
+    assert len(calls) == 1
+
+
+def test_incremental_run_keeps_split_payments_outside_the_rematch_region(config):
+    transactions = input_frame(
+        [
+            ["Tartine Bakery", 30.00, "2024-03-01"],
+            ["Tartine Bakery", 12.15, "2024-03-01"],
+            ["Chevron", 40.00, "2024-03-20"],
+        ]
+    )
+    proofs = input_frame(
+        [
+            ["Tartine Bakery", 42.15, "2024-03-01"],
+            ["Chevron", 40.00, "2024-03-20"],
+        ]
+    )
+    first_run = Validator(transactions, proofs, parsed_config=config)
+    first_run.validate()
+
+    added = pd.concat(
+        [transactions, input_frame([["Safeway", 8.00, "2024-03-20"]])],
+        ignore_index=True,
+    )
+    second_run = Validator(added, proofs, parsed_config=config)
+    results = second_run.validate(previous_run=first_run.match_state)
+
+    summary = second_run.matching_summary
+    assert summary["incremental"]
+    assert summary["keptSplitGroups"] == 1
+    assert summary["splitGroups"] == 1
+    assert len(results.grouped_matches) == 3
+    assert len(results.unmatched_transactions) == 1
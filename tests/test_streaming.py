@@ -0,0 +1,214 @@
+import random
+
+import pandas as pd
+import pytest
+
+from src.intelligence.streaming import StreamingValidator
+from src.intelligence.validator import Validator
+from tests.conftest import BUSINESSES, input_frame
+
+
+def _date_ordered_frame(rows: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    frame = pd.DataFrame(
+        {
+            "business_name": [rng.choice(BUSINESSES)[0] for _ in range(rows)],
+            "total": [
+                10.0 if rng.random() < 0.5 else round(rng.uniform(1, 60), 2)
+                for _ in range(rows)
+            ],
+            "date": [
+                (pd.Timestamp("2024-01-01") + pd.Timedelta(days=rng.randrange(60)))
+                .date()
+                .isoformat()
+                for _ in range(rows)
+            ],
+            "currency": "USD",
+        }
+    )
+    return frame.sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def _batches(frame: pd.DataFrame, size: int):
+    for start in range(0, len(frame), size):
+        yield frame.iloc[start : start + size]
+
+
+def _rows(frames):
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return []
+    return sorted(map(tuple, pd.concat(frames).astype(str).values.tolist()))
+
+
+def test_stream_partitions_add_up_to_batch_results(config):
+    transactions = _date_ordered_frame(400, seed=1)
+    proofs = _date_ordered_frame(380, seed=2)
+
+    streaming = StreamingValidator(parsed_config=config)
+    partitions = list(
+        streaming.validate_stream(_batches(transactions, 37), _batches(proofs, 23))
+    )
+    full = Validator(transactions, proofs, parsed_config=config).validate()
+
+    assert len(partitions) > 1
+    for attribute in (
+        "validated_transactions",
+        "discrepancies",
+        "unmatched_transactions",
+        "unmatched_proofs",
+    ):
+        assert _rows([getattr(part, attribute) for part in partitions]) == _rows(
+            [getattr(full, attribute)]
+        )
+    assert streaming.matching_summary["peakOpenProofs"] < len(proofs) / 4
+
+
+def test_stream_accepts_record_batches_and_reports_each_row_once(config):
+    transactions = _date_ordered_frame(120, seed=3)
+    proofs = _date_ordered_frame(110, seed=4)
+
+    streaming = StreamingValidator(parsed_config=config)
+    partitions = list(
+        streaming.validate_stream(
+            (batch.to_dict(orient="records") for batch in _batches(transactions, 10)),
+            (batch.to_dict(orient="records") for batch in _batches(proofs, 10)),
+            date_window_days=2,
+        )
+    )
+
+    matched = sum(len(part.validated_transactions) for part in partitions) + sum(
+        len(part.discrepancies) for part in partitions
+    )
+    unmatched_tx = sum(len(part.unmatched_transactions) for part in partitions)
+    unmatched_pr = sum(len(part.unmatched_proofs) for part in partitions)
+
+    assert matched == streaming.matching_summary["matchedPairs"]
+    assert matched + unmatched_tx == len(transactions)
+    assert matched + unmatched_pr == len(proofs)
+
+
+def test_stream_rejects_out_of_order_batches(config):
+    transactions = _date_ordered_frame(40, seed=5)
+    proofs = _date_ordered_frame(40, seed=6)
+
+    streaming = StreamingValidator(parsed_config=config)
+    reversed_batches = list(_batches(transactions, 10))[::-1]
+
+    with pytest.raises(ValueError, match="ordered by date"):
+        list(streaming.validate_stream(reversed_batches, _batches(proofs, 10)))
+
+
+def test_stream_keeps_repeated_proofs_whose_transactions_arrive_later(config):
+    config.put("dedup.enabled", True)
+    transactions = [
+        input_frame([("Blue Bottle", 5.5, "2024-03-01", "USD")]),
+        input_frame([("Blue Bottle", 5.5, "2024-03-02", "USD")]),
+        input_frame([("Green Grocer", 9.0, "2024-03-09", "USD")]),
+    ]
+    proofs = [
+        input_frame(
+            [
+                ("Blue Bottle", 5.5, "2024-03-01", "USD"),
+                ("Blue Bottle", 5.5, "2024-03-02", "USD"),
+            ]
+        ),
+        input_frame([("Green Grocer", 9.0, "2024-03-09", "USD")]),
+    ]
+
+    streaming = StreamingValidator(parsed_config=config)
+    partitions = list(
+        streaming.validate_stream(transactions, proofs, date_window_days=0)
+    )
+
+    assert len(partitions) > 1
+    assert streaming.matching_summary["matchedPairs"] == 3
+    assert sum(len(part.duplicates) for part in partitions) == 0
+    assert sum(len(part.unmatched_transactions) for part in partitions) == 0
+
+
+def test_stream_duplicates_point_at_stream_positions(config):
+    config.put("dedup.enabled", True)
+    transactions = [
+        input_frame([("Green Grocer", 9.0, "2024-02-20", "USD")]),
+        input_frame([("Maple Diner", 12.0, "2024-03-01", "USD")]),
+        input_frame([("Blue Bottle", 5.5, "2024-03-05", "USD")]),
+        input_frame([("Corner Deli", 3.0, "2024-03-12", "USD")]),
+    ]
+    proofs = [
+        input_frame([("Green Grocer", 9.0, "2024-02-20", "USD")]),
+        input_frame([("Maple Diner", 12.0, "2024-03-01", "USD")]),
+        input_frame(
+            [
+                ("Blue Bottle", 5.5, "2024-03-05", "USD"),
+                ("Blue Bottle", 5.5, "2024-03-05", "USD"),
+            ]
+        ),
+        input_frame([("Corner Deli", 3.0, "2024-03-12", "USD")]),
+    ]
+
+    streaming = StreamingValidator(parsed_config=config)
+    partitions = list(
+        streaming.validate_stream(transactions, proofs, date_window_days=0)
+    )
+    duplicates = pd.concat(part.duplicates for part in partitions)
+
+    assert duplicates["Side"].tolist() == ["Proof"]
+    assert duplicates["Duplicate Of"].tolist() == [2]
+
+
+class _AliasDatabase:
+    def __init__(self, aliases):
+        self.aliases = aliases
+        self.loads = 0
+
+    def load_merchant_aliases(self):
+        self.loads += 1
+        return self.aliases
+
+
+def test_stream_loads_aliases_once_for_every_partition(config):
+    transactions = [
+        input_frame([("Chevron", 40.0, "2024-03-01", "USD")]),
+        input_frame([("Acme Fuel Co", 30.0, "2024-03-05", "USD")]),
+        input_frame([("Chevron", 20.0, "2024-03-09", "USD")]),
+    ]
+    proofs = [
+        input_frame([("Chevron", 40.0, "2024-03-01", "USD")]),
+        input_frame([("Zeta Gas Station", 30.0, "2024-03-05", "USD")]),
+        input_frame([("Chevron", 20.0, "2024-03-09", "USD")]),
+    ]
+    database = _AliasDatabase({"acme fuel co": {"zeta gas station"}})
+
+    streaming = StreamingValidator(parsed_config=config, database=database)
+    partitions = list(
+        streaming.validate_stream(transactions, proofs, date_window_days=0)
+    )
+
+    assert len(partitions) > 1
+    assert database.loads == 1
+    assert streaming.matching_summary["matchedPairs"] == 3
+
+
+def test_stream_holds_undated_rows_for_the_last_partition(config):
+    transactions = [
+        input_frame(
+            [("Chevron", 40.0, "2024-03-01", "USD"), ("Safeway", 8.0, "", "USD")]
+        ),
+        input_frame([("Chevron", 20.0, "2024-03-09", "USD")]),
+    ]
+    proofs = [
+        input_frame([("Chevron", 40.0, "2024-03-01", "USD")]),
+        input_frame([("Chevron", 20.0, "2024-03-09", "USD")]),
+    ]
+
+    streaming = StreamingValidator(parsed_config=config)
+    partitions = list(
+        streaming.validate_stream(transactions, proofs, date_window_days=0)
+    )
+
+    assert len(partitions) > 1
+    assert partitions[-1].unmatched_transactions["Business Name"].tolist() == [
+        "Safeway"
+    ]
+    assert streaming.matching_summary["peakUndatedRows"] == 1
@@ -1,6 +1,10 @@
+import random
+
 import pandas as pd
 import pytest
+from fuzzywuzzy import fuzz
 
+from src.intelligence.results import RESULT_TABLES
 from src.intelligence.validator import Results, Validator
 import os
 
@@ -319,3 +323,595 @@ def test_recommend_when_unmatched_dates_within_two_days_and_totals_within_cent()
     assert len(recommendations) == 1
     assert recommendations["Transaction Total"].iloc[0] == 10.00
     assert recommendations["Proof Total"].iloc[0] == 10.01
+
+
+def _reference_candidates(transactions, proofs, tx_totals, pr_totals):
+    # Row-by-row candidate scan the batched engine must reproduce exactly
+    candidates = []
+    for tx_idx, tx_row in transactions.iterrows():
+        same_date_proofs = proofs[proofs["date_key"] == tx_row["date_key"]]
+        for pr_idx, pr_row in same_date_proofs.iterrows():
+            score = fuzz.partial_ratio(tx_row["name_key"], pr_row["name_key"])
+            if score < 80:
+                continue
+            total_delta = (
+                abs(float(tx_totals.loc[tx_idx]) - float(pr_totals.loc[pr_idx]))
+                if pd.notna(tx_totals.loc[tx_idx]) and pd.notna(pr_totals.loc[pr_idx])
+                else float("inf")
+            )
+            candidates.append((tx_idx, pr_idx, score, total_delta))
+    return candidates
+
+
+def test_build_candidates_matches_row_by_row_scan():
+    from src.intelligence.candidates import build_candidates
+    from tests.conftest import BUSINESSES
+
+    rng = random.Random(7)
+    suffixes = ["", " #1234", " store", " inc", " costa mesa", "s", " mktp"]
+
+    def noisy(name):
+        name = name.lower() + rng.choice(suffixes)
+        if rng.random() < 0.3 and len(name) > 4:
+            cut = rng.randrange(len(name))
+            name = name[:cut] + name[cut + 1 :]
+        return name
+
+    def frame(n, index_offset):
+        rows = []
+        for _ in range(n):
+            biz, _ = rng.choice(BUSINESSES)
+            rows.append(
+                {
+                    "name_key": noisy(biz),
+                    "date_key": f"2024-01-0{rng.randint(1, 4)}",
+                    "total": rng.choice([round(rng.uniform(1, 50), 2), None]),
+                }
+            )
+        frame = pd.DataFrame(rows)
+        frame.index = frame.index + index_offset
+        return frame
+
+    transactions = frame(120, 0)
+    proofs = frame(110, 500)
+    tx_totals = pd.to_numeric(transactions["total"], errors="coerce")
+    pr_totals = pd.to_numeric(proofs["total"], errors="coerce")
+
+    expected = _reference_candidates(transactions, proofs, tx_totals, pr_totals)
+    actual = build_candidates(transactions, proofs, tx_totals, pr_totals)
+
+    assert len(expected) > 0
+    assert actual == expected
+
+
+def _ambiguous_greedy_inputs():
+    # "Shell" grabs the exact-total "Shell Gas" proof first under greedy and
+    # leaves "Shell Gas Station" with nothing to pair against.
+    transactions = pd.DataFrame(
+        {
+            "business_name": ["Shell", "Shell Gas Station"],
+            "total": [20.00, 35.00],
+            "date": ["2024-03-01", "2024-03-01"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["Shell Gas", "Shell Oil"],
+            "total": [20.00, 21.00],
+            "date": ["2024-03-01", "2024-03-01"],
+        }
+    )
+    return transactions, proofs
+
+
+def test_optimal_strategy_recovers_matches_blocked_by_greedy():
+    from pyhocon import ConfigFactory
+
+    transactions, proofs = _ambiguous_greedy_inputs()
+
+    greedy = Validator(transactions.copy(), proofs.copy())
+    greedy_results = greedy.validate()
+
+    config = ConfigFactory.parse_file("config/config.conf")
+    config.put("matching.strategy", "optimal")
+    optimal = Validator(transactions.copy(), proofs.copy(), parsed_config=config)
+    optimal_results = optimal.validate()
+
+    assert len(greedy_results.unmatched_transactions) == 1
+    assert len(optimal_results.unmatched_transactions) == 0
+    assert len(optimal_results.unmatched_proofs) == 0
+    assert optimal.matching_summary["extraMatchesVsGreedy"] == 1
+    assert greedy.matching_summary["extraMatchesVsGreedy"] == 0
+
+
+def test_optimal_assignment_prefers_lower_cost_within_a_block():
+    from src.intelligence.assignment import optimal_assignment
+
+    candidates = [
+        (0, 10, 100, 0.0),
+        (0, 11, 100, 5.0),
+        (1, 10, 90, 5.0),
+        (1, 11, 90, 0.0),
+        (2, 12, 85, 1.0),
+    ]
+
+    assert optimal_assignment(candidates) == [(0, 10), (1, 11), (2, 12)]
+
+
+def test_optimal_assignment_matches_a_dense_solve():
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+
+    from src.intelligence.assignment import optimal_assignment, pair_cost
+
+    rng = np.random.default_rng(7)
+    for _ in range(25):
+        pairs = {
+            (int(tx), int(pr))
+            for tx, pr in rng.integers(0, [12, 9], size=(int(rng.integers(1, 40)), 2))
+        }
+        candidates = [
+            (tx, 100 + pr, int(rng.integers(60, 101)), float(rng.integers(0, 20)))
+            for tx, pr in sorted(pairs)
+        ]
+        costs = {
+            (tx, pr): pair_cost(score, delta) for tx, pr, score, delta in candidates
+        }
+
+        dense = np.full((12, 109), 1e6)
+        for (tx, pr), cost in costs.items():
+            dense[tx, pr] = cost - 100.0
+        rows, cols = linear_sum_assignment(dense)
+        expected = [(r, c) for r, c in zip(rows, cols) if dense[r, c] < 0]
+
+        matched = optimal_assignment(candidates)
+        assert len({tx for tx, _ in matched}) == len({pr for _, pr in matched})
+        assert len(matched) == len(expected)
+        assert sum(costs[pair] for pair in matched) == pytest.approx(
+            sum(costs[pair] for pair in expected)
+        )
+
+
+def test_unknown_matching_strategy_is_rejected():
+    from pyhocon import ConfigFactory
+
+    config = ConfigFactory.parse_file("config/config.conf")
+    config.put("matching.strategy", "random")
+
+    with pytest.raises(ValueError):
+        Validator(pd.DataFrame([]), pd.DataFrame([]), parsed_config=config)
+
+
+def test_date_window_matches_posting_lag_and_prefers_closest_date():
+    transactions = pd.DataFrame(
+        {
+            "business_name": ["Coffee Shop", "Book Store"],
+            "total": [4.50, 19.20],
+            "date": ["2024-03-02", "2024-03-01"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["Coffee Shop", "Coffee Shop", "Book Store"],
+            "total": [4.50, 4.50, 19.20],
+            "date": ["2024-03-04", "2024-03-02", "2024-03-04"],
+        }
+    )
+
+    exact = Validator(transactions.copy(), proofs.copy()).validate()
+    windowed = Validator(transactions.copy(), proofs.copy()).validate(
+        date_window_days=3
+    )
+
+    assert len(exact.validated_transactions) == 1
+    assert len(exact.unmatched_transactions) == 1
+    assert len(windowed.validated_transactions) == 2
+    assert len(windowed.unmatched_transactions) == 0
+    assert windowed.unmatched_proofs["Date"].tolist() == ["2024-03-04"]
+    coffee = windowed.validated_transactions[
+        windowed.validated_transactions["Transaction Business Name"] == "Coffee Shop"
+    ]
+    assert coffee["Proof Date"].iloc[0] == "2024-03-02"
+
+
+def test_recommendations_treat_five_cent_band_symmetrically():
+    validator = Validator(pd.DataFrame([]), pd.DataFrame([]))
+    unmatched_transactions = pd.DataFrame(
+        [
+            {"Business Name": "Merchant A", "Total": 10.00, "Date": "2024-02-20"},
+            {"Business Name": "Merchant C", "Total": 10.06, "Date": "2024-02-20"},
+        ]
+    )
+    unmatched_proofs = pd.DataFrame(
+        [
+            {"Business Name": "Merchant B", "Total": 10.05, "Date": "2024-02-20"},
+            {"Business Name": "Merchant D", "Total": 9.95, "Date": "2024-02-21"},
+        ]
+    )
+
+    recommendations = validator.analyze_unmatched_results(
+        unmatched_transactions,
+        unmatched_proofs,
+    )
+
+    pairs = set(
+        zip(recommendations["Transaction Total"], recommendations["Proof Total"])
+    )
+    assert pairs == {(10.00, 9.95), (10.06, 10.05)}
+
+
+def test_recommendations_memory_scales_with_surviving_pairs():
+    import tracemalloc
+
+    rng = random.Random(11)
+    size = 4000
+
+    def unmatched(seed_offset):
+        return pd.DataFrame(
+            {
+                "Business Name": [f"Merchant {rng.randrange(50)}" for _ in range(size)],
+                "Total": [round(rng.uniform(1, 5000), 2) for _ in range(size)],
+                "Date": [
+                    (
+                        pd.Timestamp("2023-01-01")
+                        + pd.Timedelta(days=rng.randrange(365) + seed_offset)
+                    ).strftime("%Y-%m-%d")
+                    for _ in range(size)
+                ],
+            }
+        )
+
+    unmatched_transactions = unmatched(0)
+    unmatched_proofs = unmatched(1)
+    validator = Validator(pd.DataFrame([]), pd.DataFrame([]))
+
+    tracemalloc.start()
+    try:
+        validator.analyze_unmatched_results(unmatched_transactions, unmatched_proofs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A cross join here would materialise 16M rows (well over 1 GB)
+    assert peak < 32 * 1024 * 1024
+
+
+def test_accepted_recommendations_are_learned_as_merchant_aliases(tmp_path):
+    from src.data.database import DataBase
+
+    database = DataBase(engine_name=str(tmp_path / "aliases"), local_db=True)
+    transactions = pd.DataFrame(
+        {
+            "business_name": ["AMZN Mktp US*2K3L45"],
+            "total": [42.10],
+            "date": ["2024-05-02"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {"business_name": ["Amazon"], "total": [42.10], "date": ["2024-05-02"]}
+    )
+
+    first_run = Validator(transactions, proofs, database=database)
+    results = first_run.validate()
+    _, recommendations = first_run.analyze_results(results)
+    assert results.validated_transactions.empty
+    assert len(recommendations) == 1
+
+    Validator.update_unmatched_dataframes(
+        recommendations,
+        results.unmatched_transactions,
+        results.unmatched_proofs,
+        database=database,
+    )
+    assert database.load_merchant_aliases() == {"amzn mktp us": {"amazon"}}
+
+    second_run = Validator(transactions, proofs, database=database)
+    results = second_run.validate()
+
+    assert len(results.validated_transactions) == 1
+    assert second_run.matching_summary["aliasHits"] == 1
+    assert second_run.matching_summary["scorerCalls"] == 0
+
+
+class _CountingCategorizer:
+    rows_seen: list[int] = []
+
+    def __init__(self, config):
+        pass
+
+    def categorize_dataframe(self, frame):
+        from src.intelligence.categorize import CategorizeResult
+
+        _CountingCategorizer.rows_seen.append(len(frame))
+        out = frame.copy().reset_index(drop=True)
+        out["category"] = "Other"
+        return CategorizeResult(out, {"model": "counting", "rowsProcessed": len(out)})
+
+
+def _result_rows(results):
+    return {
+        name: sorted(map(tuple, getattr(results, name).astype(str).values.tolist()))
+        for name in RESULT_TABLES
+    }
+
+
+@pytest.mark.parametrize("window", [0, 2])
+def test_incremental_validation_rematches_only_changed_blocks(
+    monkeypatch, sample_transactions_df, sample_proofs_df, window
+):
+    monkeypatch.setattr(
+        "src.intelligence.validator.TransactionCategorizer", _CountingCategorizer
+    )
+    transactions = sample_transactions_df.copy()
+    proofs = sample_proofs_df.iloc[:-3].copy()
+
+    first_run = Validator(transactions, proofs)
+    first_run.validate(date_window_days=window)
+
+    # The user adds one receipt for an unmatched transaction, plus a new row
+    added_proofs = pd.concat([proofs, sample_proofs_df.iloc[[-1]]], ignore_index=True)
+    added_transactions = pd.concat(
+        [
+            transactions,
+            pd.DataFrame(
+                [
+                    {
+                        "business_name": "Blue Bottle",
+                        "total": 6.5,
+                        "date": "2020-01-01",
+                        "currency": "USD",
+                    }
+                ]
+            ),
+        ],
+        ignore_index=True,
+    )
+
+    _CountingCategorizer.rows_seen = []
+    incremental = Validator(added_transactions, added_proofs)
+    incremental_results = incremental.validate(
+        date_window_days=window, previous_run=first_run.match_state
+    )
+    assert sorted(_CountingCategorizer.rows_seen) == [1, 1]
+
+    full = Validator(added_transactions, added_proofs)
+    full_results = full.validate(date_window_days=window)
+
+    summary = incremental.matching_summary
+    assert summary["incremental"] is True
+    assert summary["keptPairs"] > 0
+    assert summary["rematchedProofs"] < len(added_proofs)
+    assert summary["matchedPairs"] == full.matching_summary["matchedPairs"]
+    assert _result_rows(incremental_results) == _result_rows(full_results)
+
+
+def test_incremental_validation_falls_back_when_settings_change(
+    monkeypatch, sample_transactions_df, sample_proofs_df
+):
+    monkeypatch.setattr(
+        "src.intelligence.validator.TransactionCategorizer", _CountingCategorizer
+    )
+    first_run = Validator(sample_transactions_df, sample_proofs_df)
+    first_run.validate()
+
+    second_run = Validator(sample_transactions_df, sample_proofs_df)
+    second_run.validate(date_window_days=3, previous_run=first_run.match_state)
+
+    assert second_run.matching_summary["incremental"] is False
+    assert second_run.matching_summary["rematchedTransactions"] == len(
+        sample_transactions_df
+    )
+
+
+def test_aliases_outside_the_session_keep_incremental_state(tmp_path):
+    from src.data.database import DataBase
+
+    database = DataBase(engine_name=str(tmp_path / "aliases"), local_db=True)
+    transactions = pd.DataFrame(
+        {
+            "business_name": ["AMZN Mktp US*2K3L45", "Blue Bottle"],
+            "total": [42.10, 6.50],
+            "date": ["2024-05-02", "2024-05-10"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["Amazon", "Blue Bottle"],
+            "total": [42.10, 6.50],
+            "date": ["2024-05-02", "2024-05-10"],
+        }
+    )
+    first_run = Validator(transactions, proofs, database=database)
+    first_run.validate(categorize=False)
+
+    # Another session teaches an alias this session has no rows for
+    database.save_merchant_aliases([("uber", "lyft")])
+    second_run = Validator(transactions, proofs, database=database)
+    second_run.validate(categorize=False, previous_run=first_run.match_state)
+
+    assert second_run.matching_summary["incremental"] is True
+    assert second_run.matching_summary["rematchedTransactions"] == 0
+
+    database.save_merchant_aliases([("amzn mktp us", "amazon")])
+    third_run = Validator(transactions, proofs, database=database)
+    results = third_run.validate(categorize=False, previous_run=second_run.match_state)
+
+    summary = third_run.matching_summary
+    assert summary["incremental"] is True
+    assert summary["keptPairs"] == 1
+    assert summary["rematchedTransactions"] == 1
+    assert summary["aliasHits"] == 1
+    assert len(results.validated_transactions) == 2
+
+
+def test_incremental_rematches_unmatched_rows_a_freed_partner_can_reach():
+    transactions = pd.DataFrame(
+        {"business_name": ["Cafe"], "total": [5.00], "date": ["2024-03-11"]}
+    )
+    proofs = pd.DataFrame(
+        {
+            "business_name": ["Cafe", "Cafe"],
+            "total": [5.00, 5.10],
+            "date": ["2024-03-10", "2024-03-12"],
+        }
+    )
+    first_run = Validator(transactions, proofs)
+    first_run.validate(date_window_days=1, categorize=False)
+    assert first_run.matching_summary["matchedPairs"] == 1
+
+    # The new row takes the proof the old one matched, freeing it for the
+    # proof two days from the change
+    added = pd.concat(
+        [
+            transactions,
+            pd.DataFrame(
+                [{"business_name": "Cafe", "total": 5.00, "date": "2024-03-10"}]
+            ),
+        ],
+        ignore_index=True,
+    )
+    incremental = Validator(added, proofs)
+    incremental_results = incremental.validate(
+        date_window_days=1, categorize=False, previous_run=first_run.match_state
+    )
+    full = Validator(added, proofs)
+    full_results = full.validate(date_window_days=1, categorize=False)
+
+    assert incremental.matching_summary["incremental"] is True
+    assert incremental.matching_summary["matchedPairs"] == 2
+    assert _result_rows(incremental_results) == _result_rows(full_results)
+
+
+def test_parallel_block_scoring_matches_in_process_scoring():
+    from src.intelligence.candidates import build_candidates
+    from tests.conftest import BUSINESSES
+
+    rng = random.Random(21)
+
+    def frame(n, index_offset):
+        frame = pd.DataFrame(
+            {
+                "name_key": [rng.choice(BUSINESSES)[0].lower() for _ in range(n)],
+                "date_key": [f"2024-03-{rng.randint(10, 20)}" for _ in range(n)],
+                "total": [round(rng.uniform(1, 50), 2) for _ in range(n)],
+            }
+        )
+        frame.index = frame.index + index_offset
+        return frame
+
+    transactions = frame(300, 0)
+    proofs = frame(280, 1000)
+    aliases = {"uber": {"lyft"}}
+
+    serial_stats, parallel_stats = {}, {}
+    serial = build_candidates(
+        transactions,
+        proofs,
+        transactions["total"],
+        proofs["total"],
+        date_window_days=1,
+        stats=serial_stats,
+        aliases=aliases,
+    )
+    parallel = build_candidates(
+        transactions,
+        proofs,
+        transactions["total"],
+        proofs["total"],
+        date_window_days=1,
+        stats=parallel_stats,
+        aliases=aliases,
+        workers=2,
+    )
+
+    assert parallel == serial
+    assert parallel_stats == serial_stats
+
+
+def test_parallel_scoring_shares_one_spawn_pool_across_job_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.intelligence import candidates
+
+    frame = pd.DataFrame(
+        {
+            "name_key": ["blue bottle", "chevron", "taco bell"] * 4,
+            "date_key": ["2024-03-01", "2024-03-02", "2024-03-03"] * 4,
+        }
+    )
+    totals = pd.Series(1.0, index=frame.index)
+
+    def score():
+        return candidates.build_candidates(frame, frame, totals, totals, workers=2)
+
+    with ThreadPoolExecutor(max_workers=1) as job_thread:
+        first = job_thread.submit(score).result()
+        pool = candidates._scoring_pool(2)
+        second = job_thread.submit(score).result()
+
+    assert first == second == candidates.build_candidates(frame, frame, totals, totals)
+    assert candidates._scoring_pool(2) is pool
+    assert pool._mp_context.get_start_method() == "spawn"
+
+
+def test_parallel_scoring_replaces_a_shut_down_pool():
+    from src.intelligence import candidates
+
+    frame = pd.DataFrame(
+        {
+            "name_key": ["blue bottle", "chevron", "taco bell"] * 4,
+            "date_key": ["2024-03-01", "2024-03-02", "2024-03-03"] * 4,
+        }
+    )
+    totals = pd.Series(1.0, index=frame.index)
+    expected = candidates.build_candidates(frame, frame, totals, totals)
+
+    pool = candidates._scoring_pool(2)
+    pool.shutdown()
+
+    assert candidates.build_candidates(frame, frame, totals, totals, workers=2) == (
+        expected
+    )
+    assert candidates._scoring_pool(2) is not pool
+
+
+def test_exact_match_pairs_join_identical_rows_by_occurrence():
+    from src.intelligence.candidates import exact_match_pairs
+
+    transactions = pd.DataFrame(
+        {
+            "name_key": ["starbucks", "starbucks", "chevron", ""],
+            "date_key": ["2024-03-01", "2024-03-01", "2024-03-01", "2024-03-01"],
+        }
+    )
+    proofs = pd.DataFrame(
+        {
+            "name_key": ["chevron", "starbucks", "", "starbucks"],
+            "date_key": ["2024-03-01", "2024-03-01", "2024-03-01", "2024-03-02"],
+        },
+        index=[10, 11, 12, 13],
+    )
+    tx_cents = pd.Series([525, 525, 4000, 100], dtype="Int64")
+    pr_cents = pd.Series([4000, 525, 100, 525], index=proofs.index, dtype="Int64")
+
+    pairs = exact_match_pairs(transactions, proofs, tx_cents, pr_cents)
+
+    assert pairs == [(0, 11), (2, 10)]
+
+
+def test_exact_pairs_skip_fuzzy_scoring(monkeypatch, mock_documents):
+    monkeypatch.setattr(
+        "src.intelligence.validator.TransactionCategorizer", _CountingCategorizer
+    )
+    transactions, proofs = mock_documents
+    validator = Validator(transactions, proofs)
+    results = validator.validate()
+
+    summary = validator.matching_summary
+    assert summary["exactPairs"] == len(transactions)
+    assert summary["candidatePairs"] == 0
+    assert summary["scorerCalls"] == 0
+    assert len(results.validated_transactions) == len(transactions)
+    assert results.explanations.explain("validated_transactions", 0)["strategy"] == (
+        "exact"
+    )
@@ -2,6 +2,8 @@ import io
 import json
 import os
 import tempfile
+import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
@@ -10,13 +12,82 @@ import pandas as pd
 from flask import Flask, Response, jsonify, render_template, request, send_file
 
 from src.data.database import DataBase
+from src.intelligence.explanations import MatchExplanations
 from src.intelligence.helper_agent import HelperAgent
+from src.intelligence.llm_base import LLMBase
+from src.intelligence.score_cache import (
+    DEFAULT_CACHE_MB,
+    DEFAULT_SCORE_FLOOR,
+    ScoreCache,
+)
 from src.intelligence.validator import Validator
+from src.utils.jobs import Job, JobQueue, JobQueueFull, SessionBusy
 from src.utils.utils import create_session_id
 
-
 app = Flask(__name__, template_folder="templates", static_folder="static")
 database = DataBase(engine_name="receipt_validator_db", local_db=True)
+# Candidate name scores shared by every run in this process, keyed by input hash
+score_cache: ScoreCache | None = None
+# Validation jobs; created with the config's limits on first use
+job_queue: JobQueue | None = None
+_job_queue_lock = threading.Lock()
+# Parsed match explanations of recently explained sessions, least recent first
+EXPLANATION_CACHE_SESSIONS = 64
+explanation_cache: "OrderedDict[str, MatchExplanations]" = OrderedDict()
+_explanation_cache_lock = threading.Lock()
+
+
+def _get_score_cache(config: Any) -> ScoreCache:
+    global score_cache
+    if score_cache is None:
+        score_cache = ScoreCache(
+            max_bytes=int(config.get("matching.score_cache_mb", DEFAULT_CACHE_MB))
+            * 1024
+            * 1024,
+            floor=int(config.get("matching.score_cache_floor", DEFAULT_SCORE_FLOOR)),
+        )
+    return score_cache
+
+
+def _cache_explanations(session_id: str, explanations: MatchExplanations | None):
+    """Remember a session's parsed explanations, or forget them when ``None``."""
+    with _explanation_cache_lock:
+        explanation_cache.pop(session_id, None)
+        if explanations is not None:
+            explanation_cache[session_id] = explanations
+            while len(explanation_cache) > EXPLANATION_CACHE_SESSIONS:
+                explanation_cache.popitem(last=False)
+
+
+def _session_explanations(session_id: str) -> MatchExplanations:
+    """Return a session's explanations, parsing its saved state only on a miss."""
+    with _explanation_cache_lock:
+        explanations = explanation_cache.get(session_id)
+        if explanations is not None:
+            explanation_cache.move_to_end(session_id)
+            return explanations
+
+    state = database.load_session_state(session_id) or {}
+    explanations = MatchExplanations.from_dict(state.get("matchExplanations"))
+    with _explanation_cache_lock:
+        # A run that finished meanwhile has cached newer explanations; keep them
+        explanations = explanation_cache.setdefault(session_id, explanations)
+        while len(explanation_cache) > EXPLANATION_CACHE_SESSIONS:
+            explanation_cache.popitem(last=False)
+    return explanations
+
+
+def _form_number(name: str, cast: type, low: float, high: float) -> Any:
+    raw = str(request.form.get(name, "")).strip()
+    if not raw:
+        return None
+    try:
+        value = cast(raw)
+    except ValueError:
+        value = None
+    if value is None or not low <= value <= high:
+        raise ValueError(f"{name} must be a number between {low} and {high}.")
+    return value
 
 
 def _pdf_escape(text: str) -> str:
@@ -341,6 +412,23 @@ def _records_to_input_frame(rows: Any) -> pd.DataFrame:
     return frame[["business_name", "total", "date", "currency"]]
 
 
+# Image byte and token counters of get_ingestion_cost_summary, summed as-is
+IMAGE_PAYLOAD_KEYS = (
+    "imagesSent",
+    "imageSourceBytes",
+    "imageUploadBytes",
+    "imageBytesSaved",
+    "estimatedImageSourceTokens",
+    "estimatedImageUploadTokens",
+    "estimatedImageTokensSaved",
+)
+
+# Extraction tier counters; the rates and latencies are recomputed from them
+TIER_COUNT_KEYS = ("ocrAttempts", "ocrAccepted", "llmImages")
+TIER_SECONDS_KEYS = ("ocrSeconds", "llmSeconds")
+PACKED_REQUEST_KEYS = ("packedRequests", "packedImages", "packedRetries")
+
+
 def _merge_ingestion_costs(costs: list[dict[str, Any]]) -> dict[str, Any]:
     if not costs:
         return {}
@@ -358,6 +446,8 @@ def _merge_ingestion_costs(costs: list[dict[str, Any]]) -> dict[str, Any]:
             sum(int(cost.get("standardCalls", 0) or 0) for cost in costs)
         ),
         "fxCalls": int(sum(int(cost.get("fxCalls", 0) or 0) for cost in costs)),
+        "cacheHits": int(sum(int(cost.get("cacheHits", 0) or 0) for cost in costs)),
+        "cacheMisses": int(sum(int(cost.get("cacheMisses", 0) or 0) for cost in costs)),
         "estimatedInputCostUsd": round(
             sum(float(cost.get("estimatedInputCostUsd", 0.0) or 0.0) for cost in costs),
             2,
@@ -372,7 +462,23 @@ def _merge_ingestion_costs(costs: list[dict[str, Any]]) -> dict[str, Any]:
             sum(float(cost.get("estimatedTotalCostUsd", 0.0) or 0.0) for cost in costs),
             2,
         ),
+        "preprocessed": any(bool(cost.get("preprocessed")) for cost in costs),
     }
+    for key in IMAGE_PAYLOAD_KEYS + TIER_COUNT_KEYS + PACKED_REQUEST_KEYS:
+        merged[key] = int(sum(int(cost.get(key, 0) or 0) for cost in costs))
+    for key in TIER_SECONDS_KEYS:
+        merged[key] = round(sum(float(cost.get(key, 0.0) or 0.0) for cost in costs), 3)
+    cache_lookups = merged["cacheHits"] + merged["cacheMisses"]
+    merged["cacheHitRate"] = round(merged["cacheHits"] / max(1, cache_lookups), 4)
+    merged["ocrHitRate"] = round(
+        merged["ocrAccepted"] / max(1, merged["ocrAttempts"]), 4
+    )
+    merged["ocrAvgLatencySeconds"] = round(
+        merged["ocrSeconds"] / max(1, merged["ocrAttempts"]), 3
+    )
+    merged["llmAvgLatencySeconds"] = round(
+        merged["llmSeconds"] / max(1, merged["llmCalls"]), 3
+    )
     return merged
 
 
@@ -431,7 +537,33 @@ def save_session_state(session_id: str):
                 _records_to_input_frame(proofs_rows),
             )
 
+        # The UI never sends these keys back, so carry them over from the last run
+        server_keys = [
+            key
+            for key in (
+                "matchState",
+                "groupedMatches",
+                "duplicates",
+                "matchExplanations",
+            )
+            if key not in state
+        ]
+        if server_keys:
+            try:
+                previous_state = database.load_session_state(session_id) or {}
+            except ValueError:
+                previous_state = {}
+            state = {
+                **state,
+                **{
+                    key: previous_state[key]
+                    for key in server_keys
+                    if key in previous_state
+                },
+            }
+
         database.save_session_state(session_id, state)
+        _cache_explanations(session_id, None)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
     except Exception as exc:
@@ -452,200 +584,412 @@ def get_session_state(session_id: str):
     return jsonify({"sessionId": session_id, "state": state})
 
 
-@app.post("/api/validate")
-def validate():
-    # Lazy import to avoid loading PDF/LLM parser stack during app startup.
-    from src.data.data_reader import DataReader, DataType
+@app.get("/api/session/<session_id>/explain")
+def explain_match(session_id: str):
+    table = request.args.get("table", "")
+    row = request.args.get("row", type=int)
+    if row is None:
+        return jsonify({"error": "Query parameter 'row' must be an integer."}), 400
+
+    try:
+        explanations = _session_explanations(session_id)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 404
+    except Exception as exc:
+        return jsonify({"error": f"Failed to load session state: {exc}"}), 500
+
+    explanation = explanations.explain(table, row)
+    if explanation is None:
+        return jsonify({"error": f"No match explanation for {table} row {row}."}), 404
+    return jsonify({"sessionId": session_id, "explanation": explanation})
+
+
+class _RequestError(ValueError):
+    """A validation request problem reported to the client with ``status``."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+# ingest, validate, analyze, persist
+VALIDATION_STEPS = 4
+
+
+def _get_job_queue() -> JobQueue:
+    global job_queue
+    with _job_queue_lock:
+        if job_queue is None:
+            config = LLMBase._load_llm_config_cached("config/config.conf")
+            LLMBase.limit_concurrent_requests(
+                int(config.get("jobs.llm_concurrency", 4))
+            )
+            job_queue = JobQueue(
+                workers=int(config.get("jobs.workers", 2)),
+                max_pending=int(config.get("jobs.max_pending", 16)),
+                retention_seconds=int(config.get("jobs.retention_seconds", 3600)),
+            )
+    return job_queue
+
 
+def _validation_request() -> dict[str, Any]:
+    """Read a validation request's form and save its uploads to temp files."""
     session_id = str(request.form.get("sessionId", "")).strip()
     transactions = request.files.getlist("transactions")
     proofs = request.files.getlist("proofs")
 
     if not session_id:
-        return (
-            jsonify(
-                {"error": "sessionId is required. Create or provide a session first."}
-            ),
-            400,
-        )
+        raise _RequestError("sessionId is required. Create or provide a session first.")
+
+    name_threshold = _form_number("nameThreshold", int, 0, 100)
+    recommendation_similarity = _form_number(
+        "recommendationSimilarity", float, 0.0, 1.0
+    )
 
     use_uploaded_files = bool(transactions or proofs)
     if use_uploaded_files and (not transactions or not proofs):
-        return (
-            jsonify(
-                {
-                    "error": (
-                        "Provide both transactions and proofs when uploading new files, "
-                        "or upload neither to use saved session inputs."
-                    )
-                }
-            ),
-            400,
+        raise _RequestError(
+            "Provide both transactions and proofs when uploading new files, "
+            "or upload neither to use saved session inputs."
         )
 
-    transaction_paths: list[str] = []
-    proof_paths: list[str] = []
-    if use_uploaded_files:
-        transaction_paths = _save_uploaded_files(transactions)
-        proof_paths = _save_uploaded_files(proofs)
+    dedup = request.form.get("dedup")
+    return {
+        "session_id": session_id,
+        "use_uploaded_files": use_uploaded_files,
+        "transaction_paths": (
+            _save_uploaded_files(transactions) if use_uploaded_files else []
+        ),
+        "proof_paths": _save_uploaded_files(proofs) if use_uploaded_files else [],
+        "incremental": str(request.form.get("incremental", "true")).lower() != "false",
+        "dedup": None if dedup is None else str(dedup).lower() == "true",
+        "name_threshold": name_threshold,
+        "recommendation_similarity": recommendation_similarity,
+    }
 
+
+def _submit_validation() -> Job:
+    """Parse the current request and queue its validation run."""
+    params = _validation_request()
+    temp_paths = params["transaction_paths"] + params["proof_paths"]
     try:
-        print(f"\n[Validation] Run started for session {session_id}\n")
-        ingestion_cost: dict[str, Any] = {}
-        categorize_cost: dict[str, Any] = {}
-        shared_config = DataReader._load_config_cached("config/config.conf")
-
-        if use_uploaded_files:
-            transactions_reader = DataReader(
-                transactions=transaction_paths,
-                proofs=proof_paths,
-                database=database,
-                parsed_config=shared_config,
-            )
-            proofs_reader = DataReader(
-                transactions=transaction_paths,
-                proofs=proof_paths,
-                database=database,
-                parsed_config=shared_config,
-            )
+        return _get_job_queue().submit(
+            params["session_id"],
+            lambda job: _run_validation(job, params),
+            cleanup=lambda: _cleanup_temp_files(temp_paths),
+            steps=VALIDATION_STEPS,
+        )
+    except Exception:
+        _cleanup_temp_files(temp_paths)
+        raise
 
-            print("\n[Validation] Reading Transactions and Proofs in parallel\n")
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                tx_future = executor.submit(
-                    transactions_reader.load_data, DataType.TRANSACTIONS
-                )
-                proof_future = executor.submit(proofs_reader.load_data, DataType.PROOFS)
-                transactions_df = tx_future.result()
-                proofs_df = proof_future.result()
-
-            txn_cost = transactions_reader.get_ingestion_cost_summary()
-            print(
-                "\n[Validation] Reading Txn Cost: "
-                f"${txn_cost['estimatedTotalCostUsd']:.2f} "
-                f"({txn_cost['inputTokens']} in / {txn_cost['outputTokens']} out)"
-            )
 
-            proofs_cost = proofs_reader.get_ingestion_cost_summary()
-            proof_cost = {
-                "inputTokens": int(proofs_cost["inputTokens"]),
-                "outputTokens": int(proofs_cost["outputTokens"]),
-                "estimatedTotalCostUsd": round(
-                    float(proofs_cost["estimatedTotalCostUsd"]), 2
-                ),
-            }
-            print(
-                "\n[Validation] Reading Proofs Cost: "
-                f"${proof_cost['estimatedTotalCostUsd']:.2f} "
-                f"({proof_cost['inputTokens']} in / {proof_cost['outputTokens']} out)"
-            )
+def _run_validation(job: Job, params: dict[str, Any]) -> dict[str, Any]:
+    """Ingest, validate, analyze and persist one session; returns the payload."""
+    # Lazy import to avoid loading PDF/LLM parser stack during app startup.
+    from src.data.data_reader import DataReader, DataType
 
-            ingestion_cost = _merge_ingestion_costs([txn_cost, proofs_cost])
+    session_id = params["session_id"]
+    use_uploaded_files = params["use_uploaded_files"]
+    transaction_paths = params["transaction_paths"]
+    proof_paths = params["proof_paths"]
 
-            log_entry = {
-                "ts": pd.Timestamp.utcnow().isoformat(),
-                "sessionId": session_id,
-                "ingestion": ingestion_cost,
-            }
-            log_dir = transactions_reader.validated_data_path
-            os.makedirs(log_dir, exist_ok=True)
-            with open(
-                os.path.join(log_dir, "ingestion_cost.log"), "a", encoding="utf-8"
-            ) as log_file:
-                log_file.write(json.dumps(log_entry) + "\n")
-
-            print(f"\nIngestion usage: {log_entry}\n")
-
-        else:
-            transactions_df, proofs_df = database.load_session_history(session_id)
-            if transactions_df.empty or proofs_df.empty:
-                return (
-                    jsonify(
-                        {
-                            "error": (
-                                "No saved inputs found for this session. "
-                                "Upload transactions and proofs first."
-                            )
-                        }
-                    ),
-                    400,
-                )
+    print(f"\n[Validation] Run started for session {session_id}\n")
+    job.report("ingest")
+    ingestion_cost: dict[str, Any] = {}
+    categorize_cost: dict[str, Any] = {}
+    shared_config = DataReader._load_config_cached("config/config.conf")
 
-        validator = Validator(
-            transactions_df,
-            proofs_df,
+    if use_uploaded_files:
+        transactions_reader = DataReader(
+            transactions=transaction_paths,
+            proofs=proof_paths,
+            database=database,
+            parsed_config=shared_config,
+        )
+        proofs_reader = DataReader(
+            transactions=transaction_paths,
+            proofs=proof_paths,
+            database=database,
             parsed_config=shared_config,
         )
-        results = validator.validate()
-        summary_text, recommendations_df = validator.analyze_results(results)
-        categorize_cost = validator.categorize_cost
-        enriched_transactions_df = validator.transactions
-        enriched_proofs_df = validator.proofs
 
+        print("\n[Validation] Reading Transactions and Proofs in parallel\n")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tx_future = executor.submit(
+                transactions_reader.load_data, DataType.TRANSACTIONS
+            )
+            proof_future = executor.submit(proofs_reader.load_data, DataType.PROOFS)
+            transactions_df = tx_future.result()
+            proofs_df = proof_future.result()
+
+        txn_cost = transactions_reader.get_ingestion_cost_summary()
         print(
-            "\n[Validation] Categorize Cost: "
-            f"${float(categorize_cost.get('estimatedTotalCostUsd', 0.0)):.6f} "
-            f"({int(categorize_cost.get('inputTokens', 0))} in / "
-            f"{int(categorize_cost.get('outputTokens', 0))} out), "
-            f"latency={float(categorize_cost.get('latencySeconds', 0.0)):.3f}s\n"
+            "\n[Validation] Reading Txn Cost: "
+            f"${txn_cost['estimatedTotalCostUsd']:.2f} "
+            f"({txn_cost['inputTokens']} in / {txn_cost['outputTokens']} out)"
         )
 
-        log_dir = str(shared_config.get("data_path.validated", "data/validated"))
+        proofs_cost = proofs_reader.get_ingestion_cost_summary()
+        proof_cost = {
+            "inputTokens": int(proofs_cost["inputTokens"]),
+            "outputTokens": int(proofs_cost["outputTokens"]),
+            "estimatedTotalCostUsd": round(
+                float(proofs_cost["estimatedTotalCostUsd"]), 2
+            ),
+        }
+        print(
+            "\n[Validation] Reading Proofs Cost: "
+            f"${proof_cost['estimatedTotalCostUsd']:.2f} "
+            f"({proof_cost['inputTokens']} in / {proof_cost['outputTokens']} out)"
+        )
+
+        ingestion_cost = _merge_ingestion_costs([txn_cost, proofs_cost])
+
+        log_entry = {
+            "ts": pd.Timestamp.utcnow().isoformat(),
+            "sessionId": session_id,
+            "ingestion": ingestion_cost,
+        }
+        log_dir = transactions_reader.validated_data_path
         os.makedirs(log_dir, exist_ok=True)
         with open(
-            os.path.join(log_dir, "categorize_cost.log"), "a", encoding="utf-8"
+            os.path.join(log_dir, "ingestion_cost.log"), "a", encoding="utf-8"
         ) as log_file:
-            log_file.write(
-                json.dumps(
-                    {
-                        "ts": pd.Timestamp.utcnow().isoformat(),
-                        "sessionId": session_id,
-                        "categorize": categorize_cost,
-                    }
-                )
-                + "\n"
+            log_file.write(json.dumps(log_entry) + "\n")
+
+        print(f"\nIngestion usage: {log_entry}\n")
+
+    else:
+        transactions_df, proofs_df = database.load_session_history(session_id)
+        if transactions_df.empty or proofs_df.empty:
+            raise _RequestError(
+                "No saved inputs found for this session. "
+                "Upload transactions and proofs first."
             )
 
-        if use_uploaded_files:
-            # Persist canonical extracted inputs in DB; categorization is preserved in session state.
-            database.save_session_inputs(session_id, transactions_df, proofs_df)
+    # Reuse the previous run's matches and categories for unchanged rows
+    job.report("validate", rows=len(transactions_df) + len(proofs_df))
+    try:
+        existing_state = database.load_session_state(session_id) or {}
+    except ValueError:
+        existing_state = {}
+    validator = Validator(
+        transactions_df,
+        proofs_df,
+        parsed_config=shared_config,
+        database=database,
+        score_cache=_get_score_cache(shared_config),
+    )
+    results = validator.validate(
+        previous_run=(
+            existing_state.get("matchState") if params["incremental"] else None
+        ),
+        name_threshold=params["name_threshold"],
+        dedup=params["dedup"],
+    )
+
+    job.report("analyze")
+    summary_text, recommendations_df = validator.analyze_results(
+        results, params["recommendation_similarity"]
+    )
+    categorize_cost = validator.categorize_cost
+    enriched_transactions_df = validator.transactions
+    enriched_proofs_df = validator.proofs
+
+    print(
+        "\n[Validation] Categorize Cost: "
+        f"${float(categorize_cost.get('estimatedTotalCostUsd', 0.0)):.6f} "
+        f"({int(categorize_cost.get('inputTokens', 0))} in / "
+        f"{int(categorize_cost.get('outputTokens', 0))} out), "
+        f"latency={float(categorize_cost.get('latencySeconds', 0.0)):.3f}s\n"
+    )
 
-        payload = {
-            "sessionId": session_id,
+    job.report("persist")
+    log_dir = str(shared_config.get("data_path.validated", "data/validated"))
+    os.makedirs(log_dir, exist_ok=True)
+    with open(
+        os.path.join(log_dir, "categorize_cost.log"), "a", encoding="utf-8"
+    ) as log_file:
+        log_file.write(
+            json.dumps(
+                {
+                    "ts": pd.Timestamp.utcnow().isoformat(),
+                    "sessionId": session_id,
+                    "categorize": categorize_cost,
+                }
+            )
+            + "\n"
+        )
+
+    if use_uploaded_files:
+        # Persist canonical extracted inputs in DB; categorization is preserved in session state.
+        database.save_session_inputs(session_id, transactions_df, proofs_df)
+
+    payload = {
+        "sessionId": session_id,
+        "summary": summary_text,
+        "ingestionCost": ingestion_cost,
+        "categorizeCost": categorize_cost,
+        "transactions": _format_input_rows(enriched_transactions_df),
+        "proofs": _format_input_rows(enriched_proofs_df),
+        "validatedTransactions": results.records("validated_transactions"),
+        "discrepancies": results.records("discrepancies"),
+        "unmatchedTransactions": results.records("unmatched_transactions"),
+        "unmatchedProofs": results.records("unmatched_proofs"),
+        "groupedMatches": results.records("grouped_matches"),
+        "duplicates": results.records("duplicates"),
+        "matchExplanations": results.explanations.to_dict(),
+        "recommendations": _frame_to_records(recommendations_df),
+        "matchingSummary": validator.matching_summary,
+    }
+
+    # Auto-save full session state after each successful validation run.
+    database.save_session_state(
+        session_id,
+        {
             "summary": summary_text,
-            "ingestionCost": ingestion_cost,
             "categorizeCost": categorize_cost,
-            "transactions": _format_input_rows(enriched_transactions_df),
-            "proofs": _format_input_rows(enriched_proofs_df),
-            "validatedTransactions": _frame_to_records(results.validated_transactions),
-            "discrepancies": _frame_to_records(results.discrepancies),
-            "unmatchedTransactions": _frame_to_records(results.unmatched_transactions),
-            "unmatchedProofs": _frame_to_records(results.unmatched_proofs),
-            "recommendations": _frame_to_records(recommendations_df),
-        }
+            "loadedTransactions": payload["transactions"],
+            "loadedProofs": payload["proofs"],
+            "validatedTransactions": payload["validatedTransactions"],
+            "discrepancies": payload["discrepancies"],
+            "unmatchedTransactions": payload["unmatchedTransactions"],
+            "unmatchedProofs": payload["unmatchedProofs"],
+            "groupedMatches": payload["groupedMatches"],
+            "duplicates": payload["duplicates"],
+            "matchExplanations": payload["matchExplanations"],
+            "recommendations": payload["recommendations"],
+            "chatHistory": existing_state.get("chatHistory", []),
+            "matchState": validator.match_state,
+        },
+    )
+    _cache_explanations(session_id, results.explanations)
 
-        # Auto-save full session state after each successful validation run.
-        existing_state = database.load_session_state(session_id) or {}
-        database.save_session_state(
-            session_id,
-            {
-                "summary": summary_text,
-                "categorizeCost": categorize_cost,
-                "loadedTransactions": payload["transactions"],
-                "loadedProofs": payload["proofs"],
-                "validatedTransactions": payload["validatedTransactions"],
-                "discrepancies": payload["discrepancies"],
-                "unmatchedTransactions": payload["unmatchedTransactions"],
-                "unmatchedProofs": payload["unmatchedProofs"],
-                "recommendations": payload["recommendations"],
-                "chatHistory": existing_state.get("chatHistory", []),
-            },
+    return payload
+
+
+def _job_error(job: Job) -> tuple[Response, int]:
+    if job.error_status == 500:
+        return (
+            jsonify({"jobId": job.job_id, "error": f"Validation failed: {job.error}"}),
+            500,
         )
+    return jsonify({"jobId": job.job_id, "error": job.error}), job.error_status
+
+
+def _job_links(job: Job) -> dict[str, str]:
+    return {
+        "statusUrl": f"/api/jobs/{job.job_id}",
+        "eventsUrl": f"/api/jobs/{job.job_id}/events",
+        "resultUrl": f"/api/jobs/{job.job_id}/result",
+    }
 
-        return jsonify(payload)
+
+@app.post("/api/validate")
+def validate():
+    # Runs on the shared job queue so direct calls respect the same limits
+    try:
+        job = _submit_validation()
+    except _RequestError as exc:
+        return jsonify({"error": str(exc)}), exc.status
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except SessionBusy as exc:
+        return jsonify({"error": str(exc)}), 409
+    except JobQueueFull as exc:
+        return jsonify({"error": str(exc)}), 429
+
+    job.wait_finished()
+    if job.status == "failed":
+        return _job_error(job)
+    return jsonify(job.result)
+
+
+@app.post("/api/jobs/validate")
+def submit_validation_job():
+    try:
+        job = _submit_validation()
+    except _RequestError as exc:
+        return jsonify({"error": str(exc)}), exc.status
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except SessionBusy as exc:
+        return jsonify({"error": str(exc)}), 409
+    except JobQueueFull as exc:
+        return jsonify({"error": str(exc)}), 429
+
+    return jsonify({**job.snapshot(), **_job_links(job)}), 202
+
+
+@app.get("/api/jobs/<job_id>")
+def get_job_status(job_id: str):
+    job = _get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown or expired job: {job_id}"}), 404
+    return jsonify({**job.snapshot(), **_job_links(job)})
+
+
+@app.get("/api/jobs/<job_id>/result")
+def get_job_result(job_id: str):
+    job = _get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown or expired job: {job_id}"}), 404
+    if not job.finished:
+        return jsonify({**job.snapshot(), **_job_links(job)}), 202
+    if job.status == "failed":
+        return _job_error(job)
+    return jsonify(job.result)
+
+
+@app.get("/api/jobs/<job_id>/events")
+def stream_job_events(job_id: str):
+    job = _get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown or expired job: {job_id}"}), 404
+
+    def generate() -> Any:
+        seen = 0
+        while True:
+            events = job.wait(seen, timeout=15)
+            if not events:
+                # Comment lines keep proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            seen += len(events)
+            for event, payload in events:
+                yield _sse(event, payload)
+            if events[-1][0] in ("done", "error"):
+                return
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.post("/api/aliases")
+def learn_aliases():
+    payload = request.get_json(silent=True) or {}
+    rows = payload.get("recommendations", [])
+
+    if not isinstance(rows, list) or not rows:
+        return jsonify({"error": "recommendations must be a non-empty list."}), 400
+
+    try:
+        pairs = Validator.alias_pairs(pd.DataFrame(rows))
+        learned = database.save_merchant_aliases(pairs)
+    except KeyError as exc:
+        return jsonify({"error": f"Missing recommendation column: {exc}"}), 400
     except Exception as exc:
-        return jsonify({"error": f"Validation failed: {exc}"}), 500
-    finally:
-        _cleanup_temp_files(transaction_paths + proof_paths)
+        return jsonify({"error": f"Failed to save aliases: {exc}"}), 500
+
+    return jsonify({"aliases": len(pairs), "learned": learned})
 
 
 @app.post("/api/export/validated")
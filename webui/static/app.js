@@ -3,6 +3,7 @@ const state = {
     discrepancies: [],
     unmatchedTransactions: [],
     unmatchedProofs: [],
+    groupedMatches: [],
     recommendations: [],
     loadedTransactions: [],
     loadedProofs: [],
@@ -282,6 +283,7 @@ function updateResultPanelsVisibility() {
         state.unmatchedTransactions.length > 0,
     );
     setPanelVisibility("unmatched-proofs-panel", state.unmatchedProofs.length > 0);
+    setPanelVisibility("grouped-matches-panel", state.groupedMatches.length > 0);
     setPanelVisibility("recommendations-panel", state.recommendations.length > 0);
 }
 
@@ -714,6 +716,17 @@ function removeMatchedRow(rows, target) {
     });
 }
 
+function learnMerchantAliases(rows) {
+    // Best effort: aliases only speed up later runs, so failures are not surfaced.
+    fetch("/api/aliases", {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ recommendations: rows }),
+    }).catch(() => {});
+}
+
 function acceptSelectedRecommendations() {
     const selected = Array.from(
         document.querySelectorAll("input[name='recommendation-select']:checked"),
@@ -752,6 +765,7 @@ function acceptSelectedRecommendations() {
     });
 
     state.recommendations = state.recommendations.filter((_, idx) => !selected.includes(idx));
+    learnMerchantAliases(selectedRows);
 
     updateMetrics({
         validatedTransactions: state.validatedTransactions,
@@ -856,6 +870,7 @@ function clearAll({ keepSessionIds = false } = {}) {
     state.discrepancies = [];
     state.unmatchedTransactions = [];
     state.unmatchedProofs = [];
+    state.groupedMatches = [];
     state.recommendations = [];
     state.loadedTransactions = [];
     state.loadedProofs = [];
@@ -872,6 +887,7 @@ function clearAll({ keepSessionIds = false } = {}) {
     dataSourcePanelState.proofsCollapsed = true;
     renderDataSourceTables();
     renderTable("validated-table", []);
+    renderTable("grouped-matches-table", []);
     renderDiscrepanciesTable();
     renderUnmatchedTransactionsTable();
     renderUnmatchedProofsTable();
@@ -1001,13 +1017,20 @@ async function runValidation() {
     startProgress();
 
     try {
-        const response = await fetch("/api/validate", {
+        const response = await fetch("/api/jobs/validate", {
             method: "POST",
             body: formData,
         });
 
-        const payload = await response.json();
+        const job = await response.json();
         if (!response.ok) {
+            throw new Error(job.error || "Validation failed.");
+        }
+
+        await followValidationJob(job);
+        const resultResponse = await fetch(job.resultUrl);
+        const payload = await resultResponse.json();
+        if (resultResponse.status !== 200) {
             throw new Error(payload.error || "Validation failed.");
         }
 
@@ -1015,6 +1038,7 @@ async function runValidation() {
         state.discrepancies = payload.discrepancies;
         state.unmatchedTransactions = payload.unmatchedTransactions;
         state.unmatchedProofs = payload.unmatchedProofs;
+        state.groupedMatches = payload.groupedMatches ?? [];
         state.recommendations = payload.recommendations;
         state.loadedTransactions = payload.transactions ?? state.loadedTransactions;
         state.loadedProofs = payload.proofs ?? state.loadedProofs;
@@ -1027,6 +1051,7 @@ async function runValidation() {
         dataSourcePanelState.proofsCollapsed = true;
         renderDataSourceTables();
         renderTable("validated-table", payload.validatedTransactions);
+        renderTable("grouped-matches-table", state.groupedMatches);
         renderDiscrepanciesTable();
         renderUnmatchedTransactionsTable();
         renderUnmatchedProofsTable();
@@ -1044,6 +1069,29 @@ async function runValidation() {
     }
 }
 
+function followValidationJob(job) {
+    // Resolves once the job finishes; the result is fetched separately
+    return new Promise((resolve) => {
+        const events = new EventSource(job.eventsUrl);
+        const finish = () => {
+            events.close();
+            resolve();
+        };
+        events.addEventListener("stage", (event) => {
+            const data = JSON.parse(event.data);
+            const step = data.steps ? ` (${data.step}/${data.steps})` : "";
+            setStatus(`Validating: ${data.stage}${step}...`);
+        });
+        events.addEventListener("done", finish);
+        events.addEventListener("error", (event) => {
+            // Server "error" events carry data; connection errors do not
+            if (event.data || events.readyState === EventSource.CLOSED) {
+                finish();
+            }
+        });
+    });
+}
+
 async function loadSessionInputs() {
     const sessionId = byId("load-session-id").value.trim();
     showError("");
@@ -1087,6 +1135,7 @@ async function loadSessionInputs() {
             state.discrepancies = statePayload.state.discrepancies ?? [];
             state.unmatchedTransactions = statePayload.state.unmatchedTransactions ?? [];
             state.unmatchedProofs = statePayload.state.unmatchedProofs ?? [];
+            state.groupedMatches = statePayload.state.groupedMatches ?? [];
             state.recommendations = statePayload.state.recommendations ?? [];
             state.chatHistory = statePayload.state.chatHistory ?? [];
 
@@ -1094,6 +1143,7 @@ async function loadSessionInputs() {
             dataSourcePanelState.proofsCollapsed = true;
             renderDataSourceTables();
             renderTable("validated-table", state.validatedTransactions);
+            renderTable("grouped-matches-table", state.groupedMatches);
             renderDiscrepanciesTable();
             renderUnmatchedTransactionsTable();
             renderUnmatchedProofsTable();